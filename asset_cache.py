@@ -0,0 +1,354 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'PPTGEN_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'pptgen'))
+DEFAULT_IMAGE_CACHE_MAX_BYTES = int(os.environ.get('PPTGEN_IMAGE_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+# URLs validated less than this many seconds ago are served without a conditional request
+DEFAULT_REVALIDATE_AFTER = 300
+DEFAULT_PREFETCH_WORKERS = 8
+# Element types of the element_models image dicts that carry a 'path'
+PATH_IMAGE_TYPES = ('img', 'img_without_placeholder', 'flaticon')
+
+def sha256_hex(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class DiskLRUCache:
+    """Size-bounded byte store on local disk.
+
+    Each entry is one file named by its key; recency is the file mtime, bumped
+    on every hit, and the least recently used files are removed once the total
+    size goes over max_bytes. Writes are atomic so several processes can share
+    a directory. The in-process index only counts this process's writes, so
+    the directory is rescanned before evicting, and at least every
+    RESCAN_SECONDS while writing, to see other processes' entries and hits.
+    """
+
+    RESCAN_SECONDS = 10
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None  # key -> (size, mtime), loaded on first use
+        self._total = 0
+        self._scanned_at = 0.0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _scan(self):
+        """Rebuild the index from the files on disk"""
+        self._index = {}
+        self._total = 0
+        self._scanned_at = time.time()
+        try:
+            shards = [entry.path for entry in os.scandir(self.directory) if entry.is_dir()]
+        except OSError:
+            return
+        for shard in shards:
+            try:
+                entries = list(os.scandir(shard))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                self._index[entry.name] = (st.st_size, st.st_mtime)
+                self._total += st.st_size
+
+    def _load_index(self):
+        if self._index is None:
+            self._scan()
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            if self._index is not None and key in self._index:
+                self._index[key] = (self._index[key][0], now)
+        return data
+
+    def put(self, key, data):
+        _write_atomic(self._path(key), data)
+        with self._lock:
+            self._load_index()
+            old_size = self._index.get(key, (0, 0))[0]
+            self._index[key] = (len(data), time.time())
+            self._total += len(data) - old_size
+            if self._total > self.max_bytes or time.time() - self._scanned_at > self.RESCAN_SECONDS:
+                self._evict()
+
+    def _evict(self):
+        # Other processes' writes and hits only show on disk
+        self._scan()
+        if self._total <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if self._total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            del self._index[key]
+            self._total -= size
+
+    def total_bytes(self):
+        with self._lock:
+            self._load_index()
+            return self._total
+
+class ImageCache:
+    """Content-addressed cache of verified image bytes for both generators.
+
+    A source (URL, data URI or file path) maps to a small ref recording the
+    sha256 of its content plus URL validators; the verified bytes live once in
+    a size-bounded blob store, so the same logo reached through different
+    sources is stored once.
+    """
+
+    def __init__(self, directory=None, max_bytes=None, revalidate_after=DEFAULT_REVALIDATE_AFTER, session=None):
+        directory = directory or os.path.join(DEFAULT_CACHE_DIR, 'images')
+        self.blobs = DiskLRUCache(os.path.join(directory, 'blobs'), max_bytes or DEFAULT_IMAGE_CACHE_MAX_BYTES)
+        self.refs_dir = os.path.join(directory, 'refs')
+        self.revalidate_after = revalidate_after
+        self._session = session
+        self._refs = {}  # source key -> ref dict, for sources seen by this process
+        self._ready = {}  # src -> (bytes, content hash) loaded by prefetch()
+        self._pool_size = 0  # connections per host of the adapter prefetch mounted on the session
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """HTTP session for URL sources, requests is only imported once a URL is fetched"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    def source_key(self, src):
+        """Cache key for a source, or None for a missing local file"""
+        if src.startswith('data:'):
+            return sha256_hex(src)
+        if src.startswith('http'):
+            return sha256_hex('url:' + src)
+        try:
+            st = os.stat(src)
+        except OSError:
+            return None
+        return sha256_hex(f"file:{os.path.abspath(src)}:{st.st_mtime_ns}:{st.st_size}")
+
+    def _load_ref(self, key):
+        with self._lock:
+            ref = self._refs.get(key)
+        if ref is not None:
+            return ref
+        try:
+            with open(os.path.join(self.refs_dir, key[:2], key + '.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store_ref(self, key, ref):
+        with self._lock:
+            self._refs[key] = ref
+        try:
+            _write_atomic(os.path.join(self.refs_dir, key[:2], key + '.json'), json.dumps(ref).encode('utf-8'))
+        except OSError as e:
+            print(f"Could not write image cache entry: {e}")
+
+    def _store(self, key, data, src, **validators):
+        """Verify data with PIL and record it under key, returns the content hash or None"""
+        from PIL import Image
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                img.verify()
+        except Exception as e:
+            print(f"Invalid image: {src[:100]}, error: {e}")
+            return None
+        content = sha256_hex(data)
+        try:
+            self.blobs.put(content, data)
+        except OSError as e:
+            print(f"Could not write image cache blob: {e}")
+        ref = {'content': content, 'validated_at': time.time()}
+        ref.update({k: v for k, v in validators.items() if v})
+        self._store_ref(key, ref)
+        return content
+
+    def get_image_bytes(self, src):
+        """Return verified image bytes for src, or None if it can't be loaded"""
+        data, _ = self.get_image(src)
+        return data
+
+    def get_image(self, src):
+        """Return (verified image bytes, sha256 of the bytes) for src, or (None, None)"""
+        if not src:
+            return None, None
+        ready = self._ready.get(src)
+        if ready is not None:
+            return ready
+        key = self.source_key(src)
+        if key is None:
+            print(f"Image file not found: {src}")
+            return None, None
+        ref = self._load_ref(key)
+        data = self.blobs.get(ref['content']) if ref else None
+        if data is not None and not src.startswith('http'):
+            return data, ref['content']
+        if src.startswith('http'):
+            return self._get_url(src, key, ref, data)
+        if src.startswith('data:'):
+            try:
+                _, payload = src.split(',', 1)
+                raw = base64.b64decode(payload)
+            except Exception as e:
+                print(f"Invalid data URI image: {e}")
+                return None, None
+        else:
+            try:
+                with open(src, 'rb') as f:
+                    raw = f.read()
+            except OSError as e:
+                print(f"Failed to add image: {src}, error: {e}")
+                return None, None
+        content = self._store(key, raw, src)
+        return (raw, content) if content else (None, None)
+
+    def _get_url(self, src, key, ref, data):
+        import requests
+        if data is not None and time.time() - ref.get('validated_at', 0) < self.revalidate_after:
+            return data, ref['content']
+        headers = {}
+        if data is not None:
+            if ref.get('etag'):
+                headers['If-None-Match'] = ref['etag']
+            if ref.get('last_modified'):
+                headers['If-Modified-Since'] = ref['last_modified']
+        try:
+            response = self.session.get(src, timeout=10, headers=headers)
+        except requests.RequestException as e:
+            if data is not None:
+                print(f"Could not revalidate image, using cached copy: {src}")
+                return data, ref['content']
+            print(f"Failed to download image: {src}, error: {e}")
+            return None, None
+        if response.status_code == 304 and data is not None:
+            ref = dict(ref, validated_at=time.time())
+            self._store_ref(key, ref)
+            return data, ref['content']
+        if response.status_code != 200:
+            print(f"Failed to download image: {src}, status: {response.status_code}")
+            return None, None
+        content = self._store(key, response.content, src,
+                              etag=response.headers.get('ETag'),
+                              last_modified=response.headers.get('Last-Modified'))
+        return (response.content, content) if content else (None, None)
+
+    def prefetch(self, sources, max_workers=DEFAULT_PREFETCH_WORKERS):
+        """Load all sources concurrently so later get_image calls only hand out ready bytes.
+
+        Remote fetches share the session's connection pool, sized to max_workers.
+        Returns the number of sources that loaded; a source that fails is
+        left to its element's render.
+        """
+        sources = [src for src in dict.fromkeys(sources) if src and src not in self._ready]
+        if not sources:
+            return 0
+        if any(src.startswith('http') for src in sources) and max_workers > self._pool_size:
+            # Mounted once and only replaced to grow, so pooled keep-alive connections carry over between calls
+            from requests.adapters import HTTPAdapter
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+            self._pool_size = max_workers
+        loaded = 0
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            for src, result in zip(sources, pool.map(self._prefetch_one, sources)):
+                if result is not None and result[0] is not None:
+                    self._ready[src] = result
+                    loaded += 1
+        return loaded
+
+    def _prefetch_one(self, src):
+        """get_image for prefetch, None on any error: the source is loaded again, and the error reported, when its element renders"""
+        try:
+            return self.get_image(src)
+        except Exception:
+            return None
+
+    def clear_prefetched(self):
+        self._ready.clear()
+
+def collect_image_sources(slides_data):
+    """Image sources referenced by a deck, in first-use order.
+
+    Covers mediaInfo.src (multi-slide extraction), src (single-slide
+    extraction) and the path of element_models image dicts (PPTImage,
+    PPTImageFree, Flaticon).
+    """
+    sources = {}
+    for slide_data in slides_data:
+        for element in slide_data.get('elements', []):
+            media_info = element.get('mediaInfo')
+            if media_info and media_info.get('src'):
+                sources[media_info['src']] = None
+            if element.get('type') == 'img' and element.get('src'):
+                sources[element['src']] = None
+            if element.get('type') in PATH_IMAGE_TYPES and element.get('path'):
+                sources[element['path']] = None
+    return list(sources)
+
+def set_picture_name(picture, src):
+    """Name a picture added from in-memory bytes after its source file, as add_picture does for a path.
+
+    The name ends up in the picture's descr (alt text); data URIs keep the
+    generic name python-pptx gives streams.
+    """
+    if src.startswith('data:'):
+        return
+    if src.startswith('http'):
+        from urllib.parse import urlsplit
+        name = os.path.basename(urlsplit(src).path)
+    else:
+        name = os.path.basename(src)
+    if name:
+        picture._element._nvXxPr.cNvPr.set('descr', name)
+
+_default_image_cache = None
+
+def get_image_cache():
+    """Process-wide ImageCache shared by both generators"""
+    global _default_image_cache
+    if _default_image_cache is None:
+        _default_image_cache = ImageCache()
+    return _default_image_cache
@@ -0,0 +1,293 @@
+"""Run many deck conversions on a pool of pre-warmed worker processes.
+
+The manifest is JSONL, one job per line:
+
+    {"input": "deck1.json", "output": "deck1.pptx", "generator": "multi", "options": {"image_density": 2}}
+
+generator is "multi" (default) or "single"; options are passed as keyword
+arguments to that generator's create_pptx_from_json. Workers are forked
+from a parent that already imported pptx, lxml and PIL and parsed the
+default template plus any template named in the job options, and are
+replaced after --max-jobs jobs or once their resident memory passes
+--max-rss-mb.
+
+Usage: python batch_runner.py manifest.jsonl [--workers 4] [--max-jobs 100] [--max-rss-mb 1024] [--report report.json]
+"""
+import argparse
+import collections
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+import time
+
+DEFAULT_MAX_JOBS_PER_WORKER = 100
+DEFAULT_MAX_RSS_MB = 1024
+GENERATORS = ('multi', 'single')
+# Generator output kept per job for the report
+LOG_TAIL_LINES = 20
+
+def warm_up(templates=()):
+    """Import the rendering stack and parse the default and given templates once"""
+    import lxml.etree  # noqa: F401
+    import PIL.Image  # noqa: F401
+    import multi_slide_generator  # noqa: F401
+    import single_slide_generator  # noqa: F401
+    import template_cache
+    cache = template_cache.get_template_cache()
+    cache.get()
+    for template in templates:
+        try:
+            cache.get(template)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not preload template {template}: {e}")
+
+def current_rss_bytes():
+    """Resident set size of this process, the peak RSS where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+def read_manifest(path):
+    """Jobs of a JSONL manifest as dicts with index, input, output, generator and options"""
+    jobs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as e:
+                print(f"Skipping manifest line {line_no}: {e}")
+                continue
+            if not isinstance(entry, dict) or not entry.get('input'):
+                print(f"Skipping manifest line {line_no}: no input")
+                continue
+            generator = entry.get('generator', 'multi')
+            if generator not in GENERATORS:
+                print(f"Skipping manifest line {line_no}: unknown generator {generator!r}")
+                continue
+            jobs.append({
+                'index': len(jobs),
+                'input': entry['input'],
+                'output': entry.get('output'),
+                'generator': generator,
+                'options': entry.get('options') or {},
+            })
+    return jobs
+
+def run_job(job):
+    """Run one conversion in this process, returns its result record"""
+    if job['generator'] == 'single':
+        import single_slide_generator as generator
+        style_memo = generator.resolve_shape_style
+    else:
+        import multi_slide_generator as generator
+        style_memo = generator.resolve_style
+    output = job['output']
+    before = os.path.getmtime(output) if output and os.path.exists(output) else None
+    log = io.StringIO()
+    start = time.perf_counter()
+    error = None
+    try:
+        with contextlib.redirect_stdout(log):
+            generator.create_pptx_from_json(job['input'], output, **job['options'])
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        # A job that raised skipped the generator's own clear, drop its style dicts here
+        style_memo.clear()
+    seconds = time.perf_counter() - start
+    lines = log.getvalue().splitlines()
+    if error is None and output and (not os.path.exists(output) or os.path.getmtime(output) == before):
+        error = f"no output written: {lines[-1]}" if lines else "no output written"
+    return {
+        'index': job['index'],
+        'input': job['input'],
+        'output': output,
+        'ok': error is None,
+        'error': error,
+        'seconds': seconds,
+        'pid': os.getpid(),
+        'log': lines[-LOG_TAIL_LINES:],
+    }
+
+def _worker_main(tasks, results, max_jobs, max_rss_bytes):
+    warm_up()
+    done = 0
+    while True:
+        job = tasks.get()
+        if job is None:
+            return
+        result = run_job(job)
+        done += 1
+        result['recycle'] = done >= max_jobs or current_rss_bytes() > max_rss_bytes
+        results.put((os.getpid(), result))
+        if result['recycle']:
+            return
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+def run_batch(jobs, workers=None, max_jobs=DEFAULT_MAX_JOBS_PER_WORKER, max_rss_mb=DEFAULT_MAX_RSS_MB,
+              on_result=None):
+    """Run jobs on a recycled worker pool, returns (results in job order, summary dict).
+
+    on_result is called with each result record as it arrives.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    # Forked workers inherit the warm interpreter and the parsed templates
+    warm_up({job['options']['template'] for job in jobs if job['options'].get('template')})
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    result_queue = ctx.Queue()
+    pending = collections.deque(jobs)
+    jobs_by_index = {job['index']: job for job in jobs}
+    # Jobs are handed to one worker at a time through its own queue, so the
+    # parent always knows which job a worker holds, even if it dies before
+    # starting it
+    processes = {}  # pid -> (process, task queue)
+    in_flight = {}  # pid -> job index
+    results = {}
+    recycled = 0
+
+    def dispatch(pid):
+        """Hand the next job to an idle worker, or tell it to exit when none are left"""
+        tasks = processes[pid][1]
+        if pending:
+            job = pending.popleft()
+            in_flight[pid] = job['index']
+            tasks.put(job)
+        else:
+            tasks.put(None)
+
+    def start_worker():
+        tasks = ctx.Queue()
+        process = ctx.Process(target=_worker_main, args=(tasks, result_queue, max_jobs, max_rss_mb * 1024 * 1024))
+        process.start()
+        processes[process.pid] = (process, tasks)
+        dispatch(process.pid)
+
+    def finish(result):
+        results[result['index']] = result
+        if on_result:
+            on_result(result)
+
+    def handle(pid, result):
+        nonlocal recycled
+        in_flight.pop(pid, None)
+        if result['index'] in results:
+            # Already failed as lost when the worker exited right after sending it
+            return
+        finish(result)
+        if result.pop('recycle'):
+            recycled += 1
+            processes.pop(pid)[0].join()
+            if pending:
+                start_worker()
+        elif processes[pid][0].is_alive():
+            dispatch(pid)
+
+    def sweep():
+        """Replace workers that died, e.g. killed by the OOM killer, and fail the job they held"""
+        dead = [pid for pid, (process, _) in processes.items() if not process.is_alive()]
+        if not dead:
+            return
+        # A worker that exited on its own flushed its last result first, read it before failing its job
+        while True:
+            try:
+                handle(*result_queue.get_nowait())
+            except queue.Empty:
+                break
+        for pid in dead:
+            if pid not in processes:
+                continue
+            process = processes.pop(pid)[0]
+            process.join()
+            if pid in in_flight:
+                index = in_flight.pop(pid)
+                finish({'index': index, 'input': jobs_by_index[index]['input'],
+                        'output': jobs_by_index[index]['output'], 'ok': False,
+                        'error': f"worker exited with code {process.exitcode}", 'seconds': 0.0,
+                        'pid': pid, 'log': []})
+            if pending:
+                start_worker()
+
+    start = time.perf_counter()
+    for _ in range(workers):
+        start_worker()
+
+    while len(results) < len(jobs):
+        try:
+            handle(*result_queue.get(timeout=0.5))
+        except queue.Empty:
+            pass
+        # Every iteration, so a dead worker is noticed while the others keep reporting
+        sweep()
+
+    # Every remaining worker was told to exit once the jobs ran out
+    for process, _ in processes.values():
+        process.join()
+    wall = time.perf_counter() - start
+
+    ordered = [results[job['index']] for job in jobs]
+    latencies = [r['seconds'] for r in ordered]
+    summary = {
+        'jobs': len(ordered),
+        'failed': sum(1 for r in ordered if not r['ok']),
+        'workers': workers,
+        'workers_recycled': recycled,
+        'wall_seconds': wall,
+        'jobs_per_second': len(ordered) / wall if wall > 0 else 0.0,
+        'latency_p50': _percentile(latencies, 0.5),
+        'latency_p95': _percentile(latencies, 0.95),
+        'latency_max': max(latencies, default=0.0),
+    }
+    return ordered, summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('manifest', help='JSONL file with one job per line')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--max-jobs', type=int, default=DEFAULT_MAX_JOBS_PER_WORKER,
+                        help='replace a worker after this many jobs')
+    parser.add_argument('--max-rss-mb', type=int, default=DEFAULT_MAX_RSS_MB,
+                        help='replace a worker once its resident memory exceeds this')
+    parser.add_argument('--report', help='write per-job results and the summary to this JSON file')
+    args = parser.parse_args()
+
+    try:
+        jobs = read_manifest(args.manifest)
+    except OSError as e:
+        print(f"Error reading manifest: {e}")
+        return 1
+    if not jobs:
+        print("No jobs found in manifest")
+        return 1
+
+    def print_result(result):
+        status = 'ok' if result['ok'] else 'FAILED'
+        print(f"[{status}] {result['seconds']:7.2f} s  {result['input']} -> {result['output']}"
+              + (f"  ({result['error']})" if result['error'] else ''))
+
+    results, summary = run_batch(jobs, args.workers, args.max_jobs, args.max_rss_mb, on_result=print_result)
+    print(f"{summary['jobs']} jobs ({summary['failed']} failed) on {summary['workers']} workers "
+          f"in {summary['wall_seconds']:.2f} s: {summary['jobs_per_second']:.2f} jobs/s")
+    print(f"latency p50 {summary['latency_p50']:.2f} s, p95 {summary['latency_p95']:.2f} s, "
+          f"max {summary['latency_max']:.2f} s; {summary['workers_recycled']} worker(s) recycled")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'jobs': results}, f, indent=2)
+    return 1 if summary['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Shape count and file size of non-uniform borders: freeform vs. one rectangle per side.
+
+Renders border-heavy decks (accent bars on one side, top/bottom dividers,
+sides with different widths and colors, over filled boxes) through
+multi_slide_generator twice: with create_precise_border_shapes as it is, and
+with the per-side rectangles it used to draw, and reports the shapes on the
+slides, the size of the saved file and the render time.
+
+Usage: python benchmarks/bench_border_shapes.py [--slides 20] [--boxes 40 120] [--runs 3]
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx.enum.shapes import MSO_SHAPE
+
+import multi_slide_generator
+from style_resolver import pixels_to_emu
+
+COLORS = ('#1f2937', '#2563eb', '#059669', '#b45309', '#dc2626')
+FILLS = ('#f3f4f6', '#eff6ff', '#ecfdf5', '#fffbeb', None)
+# Sides drawn per box: (side, width, color index) with -1 meaning "a different color"
+BORDER_PATTERNS = (
+    (('Left', 4, 0),),
+    (('Top', 1, 0), ('Bottom', 1, 0)),
+    (('Left', 3, 0), ('Bottom', 1, -1)),
+    (('Top', 2, 0), ('Right', 1, 0), ('Bottom', 2, 0), ('Left', 1, 0)),
+    (('Top', 3, 0), ('Right', 1, -1), ('Bottom', 1, -1), ('Left', 1, -1)),
+)
+
+
+def make_box(rng, x, y, width, height):
+    styles = {}
+    color = rng.randrange(len(COLORS))
+    for side, border_width, color_offset in rng.choice(BORDER_PATTERNS):
+        styles[f'border{side}Width'] = f'{border_width}px'
+        styles[f'border{side}Style'] = 'solid'
+        styles[f'border{side}Color'] = COLORS[(color + (color_offset < 0)) % len(COLORS)]
+    fill = rng.choice(FILLS)
+    if fill:
+        styles['backgroundColor'] = fill
+    return {'type': 'div', 'x': x, 'y': y, 'width': width, 'height': height, 'styles': styles}
+
+
+def make_slides(slides, boxes, seed=1):
+    rng = random.Random(seed)
+    columns = max(1, int(boxes ** 0.5 * 1.6))
+    rows = -(-boxes // columns)
+    width, height = 1800 / columns, 960 / rows
+    return [{'styles': {}, 'elements': [make_box(rng, 60 + (i % columns) * width, 60 + (i // columns) * height,
+                                                 width - 8, height - 8) for i in range(boxes)]}
+            for _ in range(slides)]
+
+
+def per_side_rectangles(slide, x, y, width, height, border_info, border_radius=0):
+    """The previous border drawing: one filled rectangle per side, corners overlapping"""
+    shapes_created = []
+    for side, info in border_info.items():
+        if not info['has_border']:
+            continue
+        w = info['width']
+        rect = {'top': (x, y, width, w), 'right': (x + width - w, y, w, height),
+                'bottom': (x, y + height - w, width, w), 'left': (x, y, w, height)}[side]
+        shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, *(pixels_to_emu(v) for v in rect))
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = info['color']
+        shape.line.fill.background()
+        shape.shadow.inherit = False
+        shapes_created.append(shape)
+    return shapes_created
+
+
+def render(slides_data, legacy):
+    border_shapes = multi_slide_generator.create_precise_border_shapes
+    if legacy:
+        multi_slide_generator.create_precise_border_shapes = per_side_rectangles
+    try:
+        start = time.perf_counter()
+        prs = multi_slide_generator.new_presentation(1920, 1080)
+        for slide_data in slides_data:
+            multi_slide_generator.add_slide_from_data(prs, slide_data, 1920, 1080)
+        elapsed = time.perf_counter() - start
+    finally:
+        multi_slide_generator.create_precise_border_shapes = border_shapes
+    shapes = sum(len(slide.shapes) for slide in prs.slides)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return elapsed, shapes, buffer.tell()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, default=20)
+    parser.add_argument('--boxes', type=int, nargs='+', default=[40, 120], help='bordered boxes per slide')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    for boxes in args.boxes:
+        slides_data = make_slides(args.slides, boxes)
+        for label, legacy in (('per-side', True), ('freeform', False)):
+            runs = [render(slides_data, legacy) for _ in range(args.runs)]
+            seconds = min(run[0] for run in runs)
+            _, shapes, size = runs[0]
+            print(f"{args.slides} x {boxes:4d} boxes  {label:8s}  {shapes:6d} shapes "
+                  f"({shapes / (args.slides * boxes):.2f} per box)  {size / 1024:8.1f} KB  {seconds * 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Parse time and memory of extraction JSON vs. the compact format (compact_json.py).
+
+For every deck, loads the plain JSON with json.load and the compact
+document with json.load plus expand_document, and reports file size, the
+best load time, and the memory held by the loaded slides and the peak while
+loading (tracemalloc). Decks are the JSON files given on the command line,
+or synthetic decks of every profile (see synthetic_decks.py).
+
+Usage: python benchmarks/bench_compact_json.py [deck.json ...] [--slides 50] [--elements 100] [--runs 5]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from compact_json import compact_document
+from slide_stream import expand_document
+from synthetic_decks import PROFILES, make_deck
+
+# Nothing is rendered, so image decks only need the paths in their JSON
+IMAGE_PATHS = [f'image{i}.png' for i in range(8)]
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return expand_document(json.load(f))
+
+
+def measure(path, runs):
+    """(best load seconds, bytes held by the result, peak bytes while loading)"""
+    seconds = min(_timed_load(path) for _ in range(runs))
+    tracemalloc.start()
+    document = load(path)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del document
+    return seconds, held, peak
+
+
+def _timed_load(path):
+    start = time.perf_counter()
+    load(path)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('decks', nargs='*', help='extraction JSON files, default synthetic decks')
+    parser.add_argument('--slides', type=int, default=50)
+    parser.add_argument('--elements', type=int, default=100)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        decks = list(args.decks)
+        if not decks:
+            for generator in ('multi', 'single'):
+                for profile in PROFILES:
+                    path = os.path.join(tmp, f'{generator}_{profile}.json')
+                    deck = make_deck(generator, profile, args.slides, args.elements, IMAGE_PATHS)
+                    with open(path, 'w', encoding='utf-8') as f:
+                        json.dump(deck, f)
+                    decks.append(path)
+
+        for path in decks:
+            with open(path, 'r', encoding='utf-8') as f:
+                compact, references = compact_document(json.load(f))
+            compact_path = os.path.join(tmp, 'compact.json')
+            with open(compact_path, 'w', encoding='utf-8') as f:
+                json.dump(compact, f, separators=(',', ':'), ensure_ascii=False)
+            plain = measure(path, args.runs)
+            packed = measure(compact_path, args.runs)
+            print(f"{os.path.basename(path)}: {references} style dicts, {len(compact['styles'])} distinct")
+            for label, size, (seconds, held, peak) in (('plain', os.path.getsize(path), plain),
+                                                       ('compact', os.path.getsize(compact_path), packed)):
+                print(f"  {label:8s} {size / 1024:9.1f} KB  load {seconds * 1000:8.1f} ms  "
+                      f"held {held / 2**20:7.1f} MB  peak {peak / 2**20:7.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Build and serialization time of element_models text cells: unvalidated normalization vs. revalidating.
+
+Builds a PPTTable of PPTText cells with a default style (two strings per
+cell), then times table.dict() twice; every call resolves the style into
+paragraphs and runs. The same runs with the normalization as it used to be
+(every PPTPara and PPTRun built through validation, runs serialized with
+PPTRun.dict) are reported for comparison, and both must give the same dict.
+
+Usage: python benchmarks/bench_element_models.py [--rows 500] [--columns 20] [--runs 3]
+"""
+import argparse
+import os
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx.util import Inches
+
+import element_models
+from element_models import PPTPara, PPTRun, PPTTable, PPTText
+
+
+def legacy_convert_runs(self):
+    if isinstance(self.runs, PPTRun):
+        return [self.runs]
+    if isinstance(self.runs, str):
+        return [self._apply_style(self.runs)]
+    if isinstance(self.runs, list):
+        return [r if isinstance(r, PPTRun) else self._apply_style(r) for r in self.runs]
+    return []
+
+
+def legacy_apply_run_style(self, text):
+    return PPTRun(text=text, **self.default_run_style.dict(exclude={"text"}))
+
+
+def legacy_convert_para(self):
+    if isinstance(self.paras, PPTPara):
+        return [self.paras]
+    if isinstance(self.paras, (PPTRun, str)):
+        return [self._apply_style(self.paras)]
+    if isinstance(self.paras, list):
+        return [p if isinstance(p, PPTPara) else self._apply_style(p) for p in self.paras]
+    return []
+
+
+def legacy_apply_para_style(self, runs):
+    return PPTPara(runs=runs, **self.default_para_style.dict(exclude={"runs"}),
+                   default_run_style=self.default_para_style.default_run_style)
+
+
+def legacy_patches():
+    return [mock.patch.object(PPTPara, '_convert_runs', legacy_convert_runs),
+            mock.patch.object(PPTPara, '_apply_style', legacy_apply_run_style),
+            mock.patch.object(PPTText, '_convert_para', legacy_convert_para),
+            mock.patch.object(PPTText, '_apply_style', legacy_apply_para_style),
+            mock.patch.object(element_models, '_run_dict', lambda run: run.dict())]
+
+
+def build_table(rows, columns):
+    cells = [[PPTText(paras=[f'Row {r}', f'value {c}'], font_size=10, bold=r == 0, color=[20, 30, 40],
+                      alignment='center')
+              for c in range(columns)] for r in range(rows)]
+    return PPTTable(column_widths=[Inches(1)] * columns, row_heights=[Inches(0.3)] * rows, table_data=cells)
+
+
+def measure(rows, columns, runs):
+    """(best build, first dict and repeated dict seconds, dict of the last table)"""
+    best = [float('inf')] * 3
+    for _ in range(runs):
+        start = time.perf_counter()
+        table = build_table(rows, columns)
+        built = time.perf_counter()
+        data = table.dict()
+        first = time.perf_counter()
+        table.dict()
+        again = time.perf_counter()
+        best = [min(b, t) for b, t in zip(best, (built - start, first - built, again - first))]
+    return best, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--columns', type=int, default=20)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    patches = legacy_patches()
+    for patch in patches:
+        patch.start()
+    try:
+        legacy, legacy_data = measure(args.rows, args.columns, args.runs)
+    finally:
+        for patch in patches:
+            patch.stop()
+    built, built_data = measure(args.rows, args.columns, args.runs)
+    if built_data != legacy_data:
+        print("Warning: table dicts differ between the two paths")
+
+    print(f"{args.rows}x{args.columns} = {args.rows * args.columns} PPTText cells")
+    print(f"{'':12s} {'build':>8s} {'first dict':>11s} {'again':>8s}")
+    for label, (build, first, again) in (('revalidate', legacy), ('construct', built)):
+        print(f"{label:12s} {build:7.2f}s {first:10.2f}s {again:7.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Memory and decode time of element records (element_records.py) vs. the extraction dicts.
+
+For every profile, loads a synthetic multi-slide deck (see synthetic_decks.py)
+and reports, per 10k elements (elements, inline runs, list items, table rows
+and cells): the memory the dicts hold, the memory held once the slides are
+decoded with decode_slide and the dicts dropped, and the decode time. Style
+dicts are kept by the records, so memory is measured for the plain JSON and
+for its compact form (compact_json.py), where each distinct style is loaded
+once. Render time against the dict-based handlers is measured with
+bench_suite.py --compare on a baseline from the revision before
+element_records.
+
+Usage: python benchmarks/bench_element_records.py [--slides 20] [--elements 500] [--runs 3]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from compact_json import compact_document
+from element_records import decode_slide
+from slide_stream import expand_document
+from synthetic_decks import PROFILES, make_deck
+
+# Nothing is rendered, so image decks only need the paths in their JSON
+IMAGE_PATHS = [f'image{i}.png' for i in range(8)]
+
+
+def held_bytes(build):
+    """Bytes still allocated by build() once it returns, with its result alive"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def load(text):
+    return expand_document(json.loads(text))
+
+
+def decode_deck(text):
+    slides = load(text)
+    return [decode_slide(slide) for slide in slides]
+
+
+def count_nodes(value):
+    """Number of dicts with styles below value: elements, inline runs, list items, table rows and cells"""
+    if isinstance(value, dict):
+        return ('styles' in value) + sum(count_nodes(child) for key, child in value.items() if key != 'styles')
+    if isinstance(value, list):
+        return sum(count_nodes(child) for child in value)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, default=20)
+    parser.add_argument('--elements', type=int, default=500)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'':17s} {'MB per 10k elements':^39s}")
+    print(f"{'profile':8s} {'elements':>8s} {'dicts':>9s} {'records':>9s} {'compact dicts':>14s} {'records':>9s} "
+          f"{'decode ms/10k':>14s}")
+    for profile in PROFILES:
+        deck = make_deck('multi', profile, args.slides, args.elements, IMAGE_PATHS)
+        text = json.dumps(deck)
+        compact_text = json.dumps(compact_document(deck)[0])
+        count = count_nodes(deck)
+        per_10k = 10_000 / count
+        decode = float('inf')
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            [decode_slide(slide) for slide in deck]
+            decode = min(decode, time.perf_counter() - start)
+        del deck
+        sizes = [held_bytes(lambda: build(source)) * per_10k / 2**20
+                 for source in (text, compact_text) for build in (load, decode_deck)]
+        print(f"{profile:8s} {count:8d} {sizes[0]:9.2f} {sizes[1]:9.2f} {sizes[2]:14.2f} {sizes[3]:9.2f} "
+              f"{decode * per_10k * 1000:14.1f}")
+
+
+if __name__ == '__main__':
+    main()
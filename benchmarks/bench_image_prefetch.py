@@ -0,0 +1,81 @@
+"""Image prefetch vs. serial fetching against a local HTTP server with injected latency.
+
+Usage: python benchmarks/bench_image_prefetch.py [--images 80] [--latency 0.05]
+"""
+import argparse
+import http.server
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from asset_cache import ImageCache
+
+
+def png_bytes(seed):
+    buf = io.BytesIO()
+    Image.new('RGB', (64, 64), (seed % 256, (seed * 7) % 256, 90)).save(buf, 'PNG')
+    return buf.getvalue()
+
+
+def start_server(latency):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            body = png_bytes(int(self.path.strip('/').split('.')[0]))
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(http.server.ThreadingHTTPServer):
+        request_queue_size = 256
+
+    server = Server(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--images', type=int, default=80)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every response')
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    server = start_server(args.latency)
+    urls = [f'http://127.0.0.1:{server.server_port}/{i}.png' for i in range(args.images)]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        serial = ImageCache(os.path.join(cache_dir, 'serial'))
+        start = time.perf_counter()
+        for url in urls:
+            serial.get_image_bytes(url)
+        serial_s = time.perf_counter() - start
+
+        prefetched = ImageCache(os.path.join(cache_dir, 'prefetch'))
+        start = time.perf_counter()
+        loaded = prefetched.prefetch(urls, max_workers=args.workers)
+        for url in urls:
+            prefetched.get_image_bytes(url)
+        prefetch_s = time.perf_counter() - start
+    server.shutdown()
+
+    print(f"{args.images} images, {args.latency * 1000:.0f} ms latency each")
+    print(f"serial:   {serial_s:.2f} s")
+    print(f"prefetch: {prefetch_s:.2f} s ({loaded} loaded, {args.workers} workers)")
+    print(f"lower bound (waves of {args.workers}): {-(-args.images // args.workers) * args.latency:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Cold import time of the generator modules, measured with python -X importtime.
+
+Each module is imported in fresh interpreters; the best cumulative time is
+compared against its budget. The check also fails when a module pulls in a
+dependency that should only load on the code path that needs it (requests
+for URL images, the process pool for parallel rendering, pydantic).
+Exits non-zero on any regression.
+
+Usage: python benchmarks/bench_import_time.py [--runs 5] [--budget-scale 1.0]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budgets in milliseconds; pptx alone accounts for most of the generators'
+BUDGETS_MS = {
+    'multi_slide_generator': 250,
+    'single_slide_generator': 250,
+    'batch_runner': 60,
+    'asset_cache': 60,
+    'slide_stream': 30,
+}
+LAZY_MODULES = ('requests', 'concurrent.futures.process', 'pydantic')
+IMPORTTIME_RE = re.compile(r'import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)\s*$')
+
+def import_time_ms(module):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"no importtime entry for {module}")
+
+def eager_modules(module):
+    code = f'import json, sys, {module}; print(json.dumps(sorted(sys.modules)))'
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    loaded = set(json.loads(result.stdout))
+    return [name for name in LAZY_MODULES if name in loaded]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-scale', type=float, default=1.0, help='multiply every budget, for slow machines')
+    args = parser.parse_args()
+
+    failures = 0
+    for module, budget in BUDGETS_MS.items():
+        budget *= args.budget_scale
+        best = min(import_time_ms(module) for _ in range(args.runs))
+        eager = eager_modules(module)
+        ok = best <= budget and not eager
+        failures += not ok
+        note = f"  loads {', '.join(eager)} eagerly" if eager else ''
+        print(f"{'ok  ' if ok else 'FAIL'} {module:24s} {best:7.1f} ms (budget {budget:.0f} ms){note}")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
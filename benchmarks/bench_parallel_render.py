@@ -0,0 +1,124 @@
+"""Serial vs. multi-process rendering of a synthetic deck with the multi-slide generator.
+
+Also checks that every parallel result has the same package parts as the
+serial one, with the default template and with a template that holds a
+slide of its own.
+
+Usage: python benchmarks/bench_parallel_render.py [--slides 400] [--workers 2 4 8]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+TEXT_STYLES = {'fontSize': '28px', 'fontFamily': 'Arial', 'fontWeight': '400', 'color': '#1f2937',
+               'textAlign': 'left', 'paddingLeft': '8px', 'paddingTop': '4px'}
+CARD_STYLES = {'backgroundColor': '#f3f4f6', 'borderRadius': '12px', 'borderTopWidth': '1px',
+               'borderTopStyle': 'solid', 'borderTopColor': '#d1d5db', 'borderRightWidth': '1px',
+               'borderRightStyle': 'solid', 'borderRightColor': '#d1d5db', 'borderBottomWidth': '1px',
+               'borderBottomStyle': 'solid', 'borderBottomColor': '#d1d5db', 'borderLeftWidth': '1px',
+               'borderLeftStyle': 'solid', 'borderLeftColor': '#d1d5db'}
+
+
+def make_deck(slides, image_paths):
+    deck = []
+    for i in range(slides):
+        elements = [{'type': 'span', 'text': f'Slide {i + 1} title', 'x': 80, 'y': 60, 'width': 1200,
+                     'height': 70, 'styles': dict(TEXT_STYLES, fontSize='48px', fontWeight='700')}]
+        for card in range(3):
+            x = 80 + card * 600
+            elements.append({'type': 'div', 'x': x, 'y': 200, 'width': 560, 'height': 700, 'styles': CARD_STYLES})
+            elements.append({'type': 'img', 'x': x + 20, 'y': 220, 'width': 520, 'height': 300, 'styles': {},
+                             'mediaInfo': {'src': image_paths[(i + card) % len(image_paths)]}})
+            for line in range(4):
+                elements.append({'type': 'span', 'text': f'Point {line + 1} of card {card + 1}', 'x': x + 20,
+                                 'y': 560 + line * 80, 'width': 520, 'height': 60, 'styles': TEXT_STYLES})
+        rows = [{'index': r, 'rect': {'height': 50}, 'styles': {},
+                 'cells': [{'cellIndex': c, 'text': f'R{r}C{c}', 'rect': {'width': 290}, 'styles': TEXT_STYLES}
+                           for c in range(6)]}
+                for r in range(2)]
+        elements.append({'type': 'table', 'x': 80, 'y': 940, 'width': 1760, 'height': 100, 'styles': {},
+                         'tableInfo': {'rowCount': 2, 'columnCount': 6, 'rows': rows, 'styles': {}}})
+        deck.append({'slideWidth': 1920, 'slideHeight': 1080, 'elements': elements})
+    return deck
+
+
+def make_template(path):
+    """Template with one slide of its own, which every deck built on it starts with"""
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1)).text_frame.text = 'template slide'
+    prs.save(path)
+
+
+def render(json_path, output_path, workers, template=None):
+    import multi_slide_generator  # after PPTGEN_CACHE_DIR is set
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        multi_slide_generator.create_pptx_from_json(json_path, output_path, render_workers=workers,
+                                                    template=template)
+    return time.perf_counter() - start
+
+
+def same_parts(a, b):
+    with zipfile.ZipFile(a) as za, zipfile.ZipFile(b) as zb:
+        names = sorted(za.namelist())
+        return names == sorted(zb.namelist()) and all(za.read(n) == zb.read(n) for n in names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, default=400)
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['PPTGEN_CACHE_DIR'] = os.path.join(tmp, 'cache')
+        image_paths = []
+        for i in range(12):
+            path = os.path.join(tmp, f'photo{i}.png')
+            Image.new('RGB', (1040, 600), (20 * i, 120, 200 - 10 * i)).save(path)
+            image_paths.append(path)
+        json_path = os.path.join(tmp, 'slides_data.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(make_deck(args.slides, image_paths), f)
+
+        # Several chunks, each cloned from a template that holds a slide
+        template_path = os.path.join(tmp, 'template.pptx')
+        make_template(template_path)
+        small_path = os.path.join(tmp, 'small.json')
+        with open(small_path, 'w', encoding='utf-8') as f:
+            json.dump(make_deck(25, image_paths), f)
+        render(small_path, os.path.join(tmp, 'template_serial.pptx'), 1, template_path)
+        render(small_path, os.path.join(tmp, 'template_parallel.pptx'), 2, template_path)
+        match = ('same parts as serial' if same_parts(os.path.join(tmp, 'template_serial.pptx'),
+                                                      os.path.join(tmp, 'template_parallel.pptx'))
+                 else 'DIFFERS from serial')
+        print(f"template with a slide, 2 workers: {match}")
+
+        print(f"{args.slides} slides, {os.cpu_count()} CPUs")
+        serial_path = os.path.join(tmp, 'serial.pptx')
+        serial_s = render(json_path, serial_path, 1)
+        print(f"serial:     {serial_s:6.2f} s")
+        for workers in args.workers:
+            output_path = os.path.join(tmp, f'parallel_{workers}.pptx')
+            elapsed = render(json_path, output_path, workers)
+            match = 'same parts as serial' if same_parts(serial_path, output_path) else 'DIFFERS from serial'
+            print(f"{workers} workers: {elapsed:6.2f} s  speedup {serial_s / elapsed:4.2f}x  {match}")
+
+
+if __name__ == '__main__':
+    main()
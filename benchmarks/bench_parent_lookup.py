@@ -0,0 +1,70 @@
+"""Parent lookup scaling: build_parent_map vs. the per-element get_parent scan.
+
+Usage: python benchmarks/bench_parent_lookup.py [--legacy-max 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from element_records import decode_element
+from multi_slide_generator import get_parent, build_parent_map
+
+
+def dashboard_elements(count, slide_width=1920, slide_height=1080, seed=0):
+    """Dashboard-like slide: a grid of cards, each holding a few text/img children."""
+    rnd = random.Random(seed)
+    elements = [{'type': 'div', 'x': 0, 'y': 0, 'width': slide_width, 'height': slide_height}]
+    cards = max(1, count // 5)
+    cols = max(1, int(cards ** 0.5))
+    rows = -(-cards // cols)
+    card_w = slide_width / cols
+    card_h = slide_height / rows
+    for i in range(cards):
+        cx = (i % cols) * card_w
+        cy = (i // cols) * card_h
+        elements.append({'type': 'div', 'x': cx + 1, 'y': cy + 1, 'width': card_w - 2, 'height': card_h - 2})
+        for _ in range(4):
+            w = rnd.uniform(0.1, 0.8) * card_w
+            h = rnd.uniform(0.1, 0.4) * card_h
+            elements.append({
+                'type': rnd.choice(['span', 'img', 'h3']),
+                'x': cx + 2 + rnd.uniform(0, card_w - w - 4),
+                'y': cy + 2 + rnd.uniform(0, card_h - h - 4),
+                'width': w, 'height': h,
+            })
+    return [decode_element(element) for element in elements[:count]]
+
+
+def time_call(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 1000, 3000, 10000])
+    parser.add_argument('--legacy-max', type=int, default=2000,
+                        help='skip the quadratic get_parent loop above this element count')
+    args = parser.parse_args()
+
+    print(f"{'elements':>9} {'index (ms)':>11} {'us/elem':>8} {'legacy (ms)':>12}")
+    for n in args.sizes:
+        elements = dashboard_elements(n)
+        index_s = time_call(lambda: build_parent_map(elements))
+        legacy = '-'
+        if n <= args.legacy_max:
+            legacy_s = time_call(lambda: [get_parent(el, elements) for el in elements], repeat=1)
+            legacy = f"{legacy_s * 1000:.1f}"
+        print(f"{n:>9} {index_s * 1000:>11.1f} {index_s / n * 1e6:>8.2f} {legacy:>12}")
+
+
+if __name__ == '__main__':
+    main()
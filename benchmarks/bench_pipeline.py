@@ -0,0 +1,79 @@
+"""End-to-end time of an extraction feeding the generator: NDJSON pipeline vs. file handoff.
+
+Writes a synthetic deck as NDJSON and replays it at --rate slides per
+second, standing in for a live extractor. The handoff case waits for the
+last slide before rendering the whole list, as the JSON file pipeline does;
+the pipeline case renders each slide as its line arrives
+(slide_pipeline.render_ndjson). Reports wall time from the first slide to
+the saved deck, and the time spent after the last slide arrived.
+
+Usage: python benchmarks/bench_pipeline.py [--profile text] [--slides 60] [--elements 30] [--rate 10]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import multi_slide_generator
+import slide_pipeline
+from slide_stream import iter_ndjson_slides
+from synthetic_decks import PROFILES, make_deck, make_images
+
+
+def timed_replay(path, rate, arrivals):
+    """replay of the NDJSON file at path that records when the last slide was handed out"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for slide in slide_pipeline.replay(iter_ndjson_slides(f), rate):
+            arrivals.append(time.perf_counter())
+            yield slide
+
+
+def file_handoff(path, output_path, rate):
+    arrivals = []
+    start = time.perf_counter()
+    slides = list(timed_replay(path, rate, arrivals))
+    multi_slide_generator.create_pptx_from_slides(slides, output_path)
+    end = time.perf_counter()
+    return end - start, end - arrivals[-1]
+
+
+def pipeline(path, output_path, rate):
+    arrivals = []
+    start = time.perf_counter()
+    multi_slide_generator.create_pptx_from_slides(timed_replay(path, rate, arrivals), output_path, stream=True)
+    end = time.perf_counter()
+    return end - start, end - arrivals[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profile', choices=PROFILES, default='text')
+    parser.add_argument('--slides', type=int, default=60)
+    parser.add_argument('--elements', type=int, default=30)
+    parser.add_argument('--rate', type=float, default=10.0, help='slides per second the replay hands out')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image_paths = make_images(tmp) if args.profile == 'image' else ()
+        path = os.path.join(tmp, 'deck.ndjson')
+        with open(path, 'w', encoding='utf-8') as f:
+            for slide in make_deck('multi', args.profile, args.slides, args.elements, image_paths):
+                f.write(json.dumps(slide, separators=(',', ':')) + '\n')
+        print(f"{args.slides} {args.profile} slides x {args.elements} elements at {args.rate:g} slides/s "
+              f"(arrival alone takes {(args.slides - 1) / args.rate:.2f} s)")
+        for label, run in (('file handoff', file_handoff), ('pipeline', pipeline)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                total, tail = run(path, os.path.join(tmp, 'deck.pptx'), args.rate)
+            print(f"{label:12s}  total {total:6.2f} s  after last slide {tail:6.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Peak memory of json.load vs. streaming ingestion on a large synthetic deck.
+
+Each mode renders in its own subprocess so its peak RSS can be measured alone.
+
+Usage: python benchmarks/bench_stream_memory.py [--slides 300] [--style-props 150]
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RENDER = """
+import contextlib, io, sys
+sys.path.insert(0, {root!r})
+import multi_slide_generator
+with contextlib.redirect_stdout(io.StringIO()):
+    multi_slide_generator.create_pptx_from_json({json_path!r}, {output_path!r}, prefetch_workers=0, stream={stream})
+"""
+
+
+def make_slide(index, style_props):
+    buf = io.BytesIO()
+    Image.frombytes('RGB', (96, 96), random.Random(index).randbytes(96 * 96 * 3)).save(buf, 'PNG')
+    styles = {f'prop{k}': f'{k}px' for k in range(style_props)}
+    styles.update({'backgroundColor': '#3366cc', 'borderRadius': '8px', 'fontSize': '24px', 'color': '#222222'})
+    return {
+        'slideWidth': 1920,
+        'slideHeight': 1080,
+        'elements': [
+            {'type': 'div', 'x': 40, 'y': 40, 'width': 1840, 'height': 1000, 'styles': styles},
+            {'type': 'span', 'text': f'Slide {index}', 'x': 80, 'y': 80, 'width': 800, 'height': 60,
+             'styles': styles},
+            {'type': 'img', 'x': 1000, 'y': 200, 'width': 96, 'height': 96, 'styles': styles,
+             'mediaInfo': {'src': 'data:image/png;base64,' + base64.b64encode(buf.getvalue()).decode()}},
+        ],
+    }
+
+
+def run(json_path, output_path, stream, cache_dir):
+    env = dict(os.environ, PPTGEN_CACHE_DIR=cache_dir)
+    code = RENDER.format(root=ROOT, json_path=json_path, output_path=output_path, stream=stream)
+    before = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], check=True, env=env)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return elapsed, peak_kb if peak_kb > before else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, default=300)
+    parser.add_argument('--style-props', type=int, default=150, help='computed style properties per element')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'slides_data.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump([make_slide(i, args.style_props) for i in range(args.slides)], f, indent=2)
+        print(f"{args.slides} slides, {os.path.getsize(json_path) / 1e6:.1f} MB of JSON")
+        # Streaming first: ru_maxrss of children only grows, so the larger run goes last
+        for stream in (True, False):
+            elapsed, peak_kb = run(json_path, os.path.join(tmp, f'out_{stream}.pptx'), stream,
+                                   os.path.join(tmp, 'cache'))
+            peak = f"{peak_kb / 1024:.0f} MB peak RSS" if peak_kb else "peak RSS not above the previous run"
+            print(f"{'stream' if stream else 'json.load':9s}: {elapsed:.2f} s, {peak}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Synthetic-workload benchmark suite for both generators.
+
+Renders every case of a preset (generator x profile x slides x elements per
+slide, see synthetic_decks.py) in a fresh interpreter and records the best
+wall time of create_pptx_from_json, the peak RSS of the rendering process
+and the output size. Results are written as JSON together with the git
+revision and library versions, so runs of different versions can be compared:
+
+    python benchmarks/bench_suite.py --preset default --output before.json
+    (change the code)
+    python benchmarks/bench_suite.py --preset default --output after.json --compare before.json
+
+With --compare the exit status is 1 when any case got slower or larger in
+memory than --threshold times the baseline.
+
+Usage: python benchmarks/bench_suite.py [--preset quick|default|full] [--generators multi single]
+       [--profiles text table ...] [--repeat 3] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_decks import PROFILES, make_deck, make_images
+
+GENERATORS = ('multi', 'single')
+# (slides, content elements per slide) run for every generator and profile
+PRESETS = {
+    'quick': [(1, 10), (10, 50)],
+    'default': [(1, 10), (1, 1000), (50, 50), (200, 20)],
+    'full': [(1, 10), (1, 1000), (1, 10000), (50, 50), (200, 20), (2000, 10)],
+}
+RESULTS_VERSION = 1
+
+# Runs in the child interpreter: render once and report time, peak RSS and output size
+CHILD_CODE = """
+import contextlib, io, json, os, resource, sys, time
+sys.path.insert(0, {root!r})
+import {module} as generator
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    generator.create_pptx_from_json({json_path!r}, {output_path!r})
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+peak_kb = peak // 1024 if sys.platform == 'darwin' else peak
+size = os.path.getsize({output_path!r}) if os.path.exists({output_path!r}) else 0
+print(json.dumps({{'seconds': seconds, 'peak_rss_kb': peak_kb, 'output_bytes': size}}))
+"""
+
+def case_key(result):
+    return (result['generator'], result['profile'], result['slides'], result['elements'])
+
+def case_name(result):
+    return f"{result['generator']}/{result['profile']}/{result['slides']}x{result['elements']}"
+
+def run_case(json_path, output_path, generator, env):
+    """Render json_path in a fresh interpreter, returns its measurement dict or None on failure"""
+    module = 'single_slide_generator' if generator == 'single' else 'multi_slide_generator'
+    code = CHILD_CODE.format(root=ROOT, module=module, json_path=json_path, output_path=output_path)
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit code {result.returncode}")
+        return None
+    measurement = json.loads(result.stdout.strip().splitlines()[-1])
+    return measurement if measurement['output_bytes'] else None
+
+def git_revision():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True)
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True)
+    except OSError:
+        return None
+    revision = result.stdout.strip() or None
+    return f"{revision}-dirty" if revision and dirty.stdout.strip() else revision
+
+def environment():
+    import pptx
+    import PIL
+
+    return {
+        'revision': git_revision(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'python_pptx': pptx.__version__,
+        'pillow': PIL.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+def run_suite(cases, generators, profiles, repeat, tmp):
+    env = dict(os.environ, PPTGEN_CACHE_DIR=os.path.join(tmp, 'cache'))
+    image_paths = make_images(tmp)
+    results = []
+    for generator in generators:
+        for profile in profiles:
+            for slides, elements in cases:
+                record = {'generator': generator, 'profile': profile, 'slides': slides, 'elements': elements}
+                json_path = os.path.join(tmp, 'deck.json')
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    json.dump(make_deck(generator, profile, slides, elements, image_paths), f)
+                record['input_bytes'] = os.path.getsize(json_path)
+                runs = [run_case(json_path, os.path.join(tmp, 'deck.pptx'), generator, env) for _ in range(repeat)]
+                runs = [run for run in runs if run]
+                if len(runs) < repeat:
+                    record.update(ok=False, seconds=None, peak_rss_mb=None, output_bytes=None)
+                    print(f"FAIL {case_name(record)}")
+                else:
+                    record.update(ok=True, seconds=min(run['seconds'] for run in runs),
+                                  peak_rss_mb=max(run['peak_rss_kb'] for run in runs) / 1024,
+                                  output_bytes=runs[0]['output_bytes'])
+                    print(f"{case_name(record):32s} {record['seconds']:8.3f} s  {record['peak_rss_mb']:7.1f} MB  "
+                          f"{record['output_bytes'] / 1024:9.1f} KB")
+                results.append(record)
+    return results
+
+def compare(results, baseline, threshold):
+    """Print each case against the baseline, returns the number of regressions"""
+    previous = {case_key(r): r for r in baseline['results'] if r.get('ok')}
+    print(f"\nagainst {baseline['environment'].get('revision')} ({baseline['environment'].get('timestamp')}):")
+    regressions = 0
+    for result in results:
+        before = previous.get(case_key(result))
+        if not result['ok'] or before is None:
+            print(f"{case_name(result):32s} {'failed' if not result['ok'] else 'no baseline'}")
+            continue
+        time_ratio = result['seconds'] / before['seconds'] if before['seconds'] else 1.0
+        rss_ratio = result['peak_rss_mb'] / before['peak_rss_mb'] if before['peak_rss_mb'] else 1.0
+        size_ratio = result['output_bytes'] / before['output_bytes'] if before['output_bytes'] else 1.0
+        regressed = time_ratio > threshold or rss_ratio > threshold
+        regressions += regressed
+        print(f"{case_name(result):32s} time {time_ratio:5.2f}x  rss {rss_ratio:5.2f}x  size {size_ratio:5.2f}x"
+              + ('  REGRESSION' if regressed else ''))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='default')
+    parser.add_argument('--generators', nargs='+', choices=GENERATORS, default=list(GENERATORS))
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=list(PROFILES))
+    parser.add_argument('--repeat', type=int, default=3, help='renders per case, the fastest is kept')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='results JSON of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='time or RSS ratio over the baseline that counts as a regression')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    env_info = environment()
+    print(f"revision {env_info['revision']}, python-pptx {env_info['python_pptx']}, {env_info['cpus']} CPUs")
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_suite(PRESETS[args.preset], args.generators, args.profiles, max(1, args.repeat), tmp)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'version': RESULTS_VERSION, 'preset': args.preset, 'environment': env_info,
+                       'results': results}, f, indent=2)
+        print(f"Wrote {len(results)} results to {args.output}")
+
+    failures = sum(1 for r in results if not r['ok'])
+    if baseline is not None:
+        failures += compare(results, baseline, args.threshold)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
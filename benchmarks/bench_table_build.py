@@ -0,0 +1,118 @@
+"""Bulk a:tbl XML builder vs. python-pptx's per-cell API for large tables.
+
+Renders report-style tables (striped rows, bordered and padded cells, a
+header row with column spans, inline runs) through add_table_element both
+ways and checks the two slides serialize to the same XML. Small tables with
+overlapping spans are checked the same way first, whether build_table_xml
+merges them itself or hands them to the per-cell path.
+
+Usage: python benchmarks/bench_table_build.py [--shapes 50x20 100x10 25x40] [--runs 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+
+import multi_slide_generator
+from element_records import decode_element
+
+CELL_STYLES = {'fontSize': '13px', 'fontFamily': '"Inter", Arial', 'fontWeight': '400', 'color': '#1f2937',
+               'textAlign': 'left', 'paddingLeft': '6px', 'paddingRight': '6px', 'paddingTop': '3px',
+               'paddingBottom': '3px', 'borderBottomWidth': '1px', 'borderBottomStyle': 'solid',
+               'borderBottomColor': '#e5e7eb'}
+HEADER_STYLES = dict(CELL_STYLES, fontWeight='700', backgroundColor='#111827', color='#ffffff', textAlign='center')
+
+
+# Overlapping spans as (row, [(cellIndex, colSpan, rowSpan), ...]) on a 4x4 table
+SPAN_CASES = {
+    'span over a later cell': [(0, [(0, 2, 1), (1, 1, 1), (2, 1, 1)])],
+    'span over an earlier cell': [(0, [(2, 1, 1), (0, 3, 1)])],
+    'span anchored in a merge': [(0, [(0, 2, 2)]), (1, [(1, 2, 2)])],
+    'spans crossing': [(0, [(1, 1, 3)]), (1, [(0, 3, 1)])],
+    'span past the bottom': [(2, [(2, 1, 5)])],
+}
+
+
+def make_span_table(span_rows):
+    rows_data = [{'index': r, 'rect': {'height': 22}, 'styles': {}, 'cells': []} for r in range(4)]
+    for r, cells in span_rows:
+        rows_data[r]['cells'] = [{'cellIndex': c, 'colSpan': col_span, 'rowSpan': row_span, 'text': f'{r},{c}',
+                                  'rect': {'width': 80 * col_span}, 'styles': CELL_STYLES}
+                                 for c, col_span, row_span in cells]
+    return decode_element({'type': 'table', 'x': 40, 'y': 40, 'width': 640, 'height': 200, 'styles': {},
+                           'tableInfo': {'rowCount': 4, 'columnCount': 4, 'rows': rows_data, 'styles': {}}})
+
+
+def make_table(rows, cols):
+    rows_data = []
+    # Header: pairs of columns grouped under one heading
+    header = [{'cellIndex': c, 'text': f'Group {c // 2 + 1}', 'colSpan': min(2, cols - c), 'styles': HEADER_STYLES,
+               'rect': {'width': 160 * min(2, cols - c)}} for c in range(0, cols, 2)]
+    rows_data.append({'index': 0, 'rect': {'height': 28}, 'styles': {}, 'cells': header})
+    for r in range(1, rows):
+        cells = []
+        for c in range(cols):
+            cell = {'cellIndex': c, 'rect': {'width': 80}, 'styles': dict(CELL_STYLES, textAlign='right') if c else
+                    CELL_STYLES}
+            if c == 0:
+                cell['inlineGroup'] = {'inlineElements': [
+                    {'type': 'span', 'text': f'Item {r} ', 'styles': dict(CELL_STYLES, fontWeight='700')},
+                    {'type': 'span', 'text': '(est.)', 'styles': dict(CELL_STYLES, fontStyle='italic')}]}
+            else:
+                cell['text'] = f'{(r * 37 + c * 11) % 1000:,}.{c:02d}'
+            cells.append(cell)
+        rows_data.append({'index': r, 'rect': {'height': 22},
+                          'styles': {'backgroundColor': '#f9fafb'} if r % 2 else {}, 'cells': cells})
+    return decode_element({'type': 'table', 'x': 40, 'y': 40, 'width': 1840, 'height': 1000, 'styles': {},
+                           'tableInfo': {'rowCount': rows, 'columnCount': cols, 'rows': rows_data, 'styles': {}}})
+
+
+def render(element, per_cell):
+    prs = multi_slide_generator.new_presentation(1920, 1080)
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    build_table_xml = multi_slide_generator.build_table_xml
+    if per_cell:
+        multi_slide_generator.build_table_xml = lambda *args: None
+    try:
+        start = time.perf_counter()
+        multi_slide_generator.add_table_element(slide, element, 1920, 1080)
+        elapsed = time.perf_counter() - start
+    finally:
+        multi_slide_generator.build_table_xml = build_table_xml
+    return elapsed, etree.tostring(slide._element)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--shapes', nargs='+', default=['50x20', '100x10', '25x40', '60x20'],
+                        help='tables as ROWSxCOLS')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    for name, span_rows in SPAN_CASES.items():
+        element = make_span_table(span_rows)
+        info = element.table_info
+        try:
+            bulk = multi_slide_generator.build_table_xml(info, info.row_count, info.column_count, 640, 200)
+        except Exception:
+            bulk = None  # add_table_element falls back as well
+        path = 'per-cell' if bulk is None else 'bulk'
+        match = 'same XML' if render(element, False)[1] == render(element, True)[1] else 'XML DIFFERS'
+        print(f"{name:26s} {path:8s}  {match}")
+
+    for shape in args.shapes:
+        rows, cols = (int(n) for n in shape.split('x'))
+        element = make_table(rows, cols)
+        per_cell, per_cell_xml = min(render(element, True) for _ in range(args.runs))
+        bulk, bulk_xml = min(render(element, False) for _ in range(args.runs))
+        match = 'same XML' if bulk_xml == per_cell_xml else 'XML DIFFERS'
+        print(f"{shape:>7s} ({rows * cols:5d} cells): per-cell {per_cell * 1000:7.1f} ms  "
+              f"bulk {bulk * 1000:6.1f} ms  speedup {per_cell / bulk:5.1f}x  {match}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""Synthetic extraction JSON for benchmarking both generators.
+
+Each profile stresses one kind of content, the way real decks extracted from
+HTML do:
+
+    text    title plus paragraphs of styled spans
+    table   one or more tables, elements counts the cells
+    image   a grid of pictures
+    list    bulleted/numbered lists with nested sub-lists, elements counts the items
+    shadow  rounded cards with borders and box shadows, each holding a label
+
+make_multi_deck returns the slide list read by multi_slide_generator,
+make_single_deck the {slideWidth, slideHeight, slides} object read by
+single_slide_generator. The single-slide format has no tables or lists, so
+those profiles become grids of bordered divs and stacked paragraphs there.
+Decks are deterministic for a given seed.
+
+Usage: python benchmarks/synthetic_decks.py profile output.json [--format multi] [--slides 10] [--elements 50]
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+
+PROFILES = ('text', 'table', 'image', 'list', 'shadow')
+SLIDE_WIDTH = 1920
+SLIDE_HEIGHT = 1080
+MARGIN = 60
+TITLE_HEIGHT = 90
+WORDS = ('revenue', 'growth', 'quarterly', 'pipeline', 'customer', 'retention', 'platform', 'launch',
+         'margin', 'forecast', 'segment', 'roadmap', 'hiring', 'latency', 'adoption', 'budget')
+COLORS = ('#1f2937', '#374151', '#2563eb', '#059669', '#b45309', '#7c3aed', '#dc2626')
+FILLS = ('#f3f4f6', '#eff6ff', '#ecfdf5', '#fffbeb', '#f5f3ff')
+
+def text_styles(rng, font_size=20, weight='400'):
+    return {'fontSize': f'{font_size}px', 'fontFamily': rng.choice(('Arial', 'Segoe UI', 'Georgia')),
+            'fontWeight': weight, 'fontStyle': 'normal', 'color': rng.choice(COLORS), 'textAlign': 'left',
+            'lineHeight': 'normal', 'paddingLeft': '4px', 'paddingTop': '2px'}
+
+def border_styles(color, width=1, radius=0):
+    styles = {'borderRadius': f'{radius}px'}
+    for side in ('Top', 'Right', 'Bottom', 'Left'):
+        styles[f'border{side}Width'] = f'{width}px'
+        styles[f'border{side}Style'] = 'solid'
+        styles[f'border{side}Color'] = color
+    return styles
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+def grid(count, x=MARGIN, y=MARGIN + TITLE_HEIGHT, width=SLIDE_WIDTH - 2 * MARGIN,
+         height=SLIDE_HEIGHT - 2 * MARGIN - TITLE_HEIGHT, gap=8):
+    """count cells of a near-square grid filling the box, as (x, y, width, height)"""
+    count = max(1, count)
+    cols = max(1, math.ceil(math.sqrt(count * width / height)))
+    rows = math.ceil(count / cols)
+    cell_w = max(1, (width - gap * (cols - 1)) // cols)
+    cell_h = max(1, (height - gap * (rows - 1)) // rows)
+    return [(x + (i % cols) * (cell_w + gap), y + (i // cols) * (cell_h + gap), cell_w, cell_h)
+            for i in range(count)]
+
+def make_images(directory, count=8, size=(800, 600)):
+    """Write count distinct PNGs to directory, returns their paths"""
+    from PIL import Image
+
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f'synthetic_{i}.png')
+        if not os.path.exists(path):
+            Image.new('RGB', size, (30 * i % 256, 140, 220 - 20 * i % 200)).save(path)
+        paths.append(path)
+    return paths
+
+def _title(rng, index):
+    return {'type': 'h1', 'text': f'Slide {index + 1}: {sentence(rng, 3)}', 'x': MARGIN, 'y': MARGIN,
+            'width': SLIDE_WIDTH - 2 * MARGIN, 'height': TITLE_HEIGHT - 20,
+            'styles': text_styles(rng, 44, '700')}
+
+def _list_items(rng, budget, x, y, width, line_height, depth=0):
+    """Up to budget items counting nested ones, returns (items, y below them, items used)"""
+    items = []
+    used = 0
+    while used < budget:
+        item = {'text': sentence(rng, 5), 'rect': {'x': x, 'y': y, 'width': width, 'height': line_height - 4},
+                'styles': text_styles(rng, 18)}
+        y += line_height
+        used += 1
+        remaining = budget - used
+        if depth < 2 and remaining >= 2 and rng.random() < 0.3:
+            nested, y, nested_used = _list_items(rng, min(remaining, rng.randint(2, 4)), x + 36, y, width - 36,
+                                                 line_height, depth + 1)
+            item['nestedList'] = {'type': 'ul', 'items': nested, 'listStyles': {'listStyleType': 'circle'},
+                                  'styles': {'lineHeight': 'normal'}}
+            used += nested_used
+        items.append(item)
+    return items, y, used
+
+def _multi_elements(profile, rng, count, image_paths):
+    if profile == 'text':
+        return [{'type': 'span', 'text': sentence(rng, rng.randint(6, 18)), 'x': x, 'y': y, 'width': w,
+                 'height': h, 'styles': text_styles(rng, rng.choice((16, 18, 20, 24)))}
+                for x, y, w, h in grid(count)]
+    if profile == 'image':
+        return [{'type': 'img', 'x': x, 'y': y, 'width': w, 'height': h, 'styles': {},
+                 'mediaInfo': {'src': image_paths[i % len(image_paths)]}}
+                for i, (x, y, w, h) in enumerate(grid(count))]
+    if profile == 'table':
+        # Tables of at most 20x8 cells stacked in a grid
+        tables = math.ceil(count / 160)
+        elements = []
+        for t, (x, y, w, h) in enumerate(grid(tables, gap=20)):
+            cells = min(160, count - t * 160)
+            cols = min(8, cells)
+            rows = math.ceil(cells / cols)
+            row_h = max(1, h // rows)
+            col_w = max(1, w // cols)
+            row_data = [{'index': r, 'rect': {'height': row_h},
+                         'styles': {'backgroundColor': FILLS[r % len(FILLS)]} if r % 2 else {},
+                         'cells': [{'cellIndex': c, 'text': f'{rng.choice(WORDS)} {r * cols + c}',
+                                    'rect': {'width': col_w},
+                                    'styles': dict(text_styles(rng, 14), **border_styles('#d1d5db'))}
+                                   for c in range(cols) if r * cols + c < cells]}
+                        for r in range(rows)]
+            elements.append({'type': 'table', 'x': x, 'y': y, 'width': col_w * cols, 'height': row_h * rows,
+                             'styles': {}, 'tableInfo': {'rowCount': rows, 'columnCount': cols, 'rows': row_data,
+                                                         'styles': {}}})
+        return elements
+    if profile == 'list':
+        # Lists of at most 24 items side by side
+        lists = math.ceil(count / 24)
+        elements = []
+        for n, (x, y, w, h) in enumerate(grid(lists, gap=20)):
+            items = min(24, count - n * 24)
+            list_type = 'ol' if n % 2 else 'ul'
+            elements.append({'type': list_type, 'x': x, 'y': y, 'width': w, 'height': h, 'styles': {},
+                             'listInfo': {'type': list_type, 'rect': {'x': x, 'y': y, 'width': w, 'height': h},
+                                          'items': _list_items(rng, items, x, y, w, max(4, h // items))[0],
+                                          'listStyles': {'listStyleType': 'decimal' if n % 2 else 'disc'},
+                                          'styles': {'lineHeight': '1.2'}}})
+        return elements
+    if profile == 'shadow':
+        elements = []
+        for x, y, w, h in grid(math.ceil(count / 2), gap=16):
+            card = dict(border_styles(rng.choice(COLORS), rng.choice((1, 2)), rng.choice((0, 8, 16))),
+                        backgroundColor=rng.choice(FILLS), boxShadow='0px 4px 12px 0px #9ca3af')
+            elements.append({'type': 'div', 'x': x, 'y': y, 'width': w, 'height': h, 'styles': card})
+            if len(elements) < count:
+                elements.append({'type': 'span', 'text': sentence(rng, 3), 'x': x + 8, 'y': y + 8,
+                                 'width': max(1, w - 16), 'height': max(1, h - 16), 'styles': text_styles(rng, 16)})
+        return elements
+    raise ValueError(f"unknown profile {profile!r}")
+
+def make_multi_deck(profile, slides=10, elements=50, image_paths=(), seed=0):
+    """Slide list for multi_slide_generator with elements content elements per slide plus a title"""
+    rng = random.Random(seed)
+    deck = []
+    for i in range(slides):
+        content = _multi_elements(profile, rng, elements, image_paths)
+        deck.append({'slideWidth': SLIDE_WIDTH, 'slideHeight': SLIDE_HEIGHT, 'elements': [_title(rng, i)] + content,
+                     'slideStyles': {'backgroundColor': '#ffffff'}})
+    return deck
+
+def _single_elements(profile, rng, count, image_paths):
+    if profile in ('text', 'list'):
+        indent = 36 if profile == 'list' else 0
+        return [{'type': 'p', 'text': ('• ' if profile == 'list' else '') + sentence(rng, rng.randint(6, 18)),
+                 'x': x + (i % 3) * indent, 'y': y, 'width': max(1, w - (i % 3) * indent), 'height': h,
+                 'styles': text_styles(rng, rng.choice((16, 18, 20)))}
+                for i, (x, y, w, h) in enumerate(grid(count))]
+    if profile == 'image':
+        return [{'type': 'img', 'src': image_paths[i % len(image_paths)], 'x': x, 'y': y, 'width': w, 'height': h,
+                 'styles': {}}
+                for i, (x, y, w, h) in enumerate(grid(count))]
+    if profile == 'table':
+        return [{'type': 'div', 'text': f'{rng.choice(WORDS)} {i}', 'x': x, 'y': y, 'width': w, 'height': h,
+                 'styles': dict(text_styles(rng, 14), backgroundColor=FILLS[(i // 8) % len(FILLS)],
+                                border='1px solid #d1d5db')}
+                for i, (x, y, w, h) in enumerate(grid(count, gap=0))]
+    if profile == 'shadow':
+        return [{'type': 'div', 'x': x, 'y': y, 'width': w, 'height': h, 'zIndex': 0,
+                 'styles': {'backgroundColor': rng.choice(FILLS), 'border': f'1px solid {rng.choice(COLORS)}',
+                            'borderRadius': f'{rng.choice((0, 8, 16))}px',
+                            'boxShadow': '0px 4px 12px 0px #9ca3af'}}
+                for x, y, w, h in grid(count, gap=16)]
+    raise ValueError(f"unknown profile {profile!r}")
+
+def make_single_deck(profile, slides=10, elements=50, image_paths=(), seed=0):
+    """{slideWidth, slideHeight, slides} for single_slide_generator with elements elements per slide plus a title"""
+    rng = random.Random(seed)
+    deck = []
+    for i in range(slides):
+        title = dict(_title(rng, i), zIndex=1)
+        deck.append({'slideId': f'slide-{i + 1}', 'elements': [title] + _single_elements(profile, rng, elements,
+                                                                                          image_paths)})
+    return {'slideWidth': SLIDE_WIDTH, 'slideHeight': SLIDE_HEIGHT, 'slides': deck}
+
+def make_deck(generator, profile, slides=10, elements=50, image_paths=(), seed=0):
+    """Deck in the input format of generator ('multi' or 'single')"""
+    make = make_single_deck if generator == 'single' else make_multi_deck
+    return make(profile, slides, elements, image_paths, seed)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('profile', choices=PROFILES)
+    parser.add_argument('output', help='JSON file to write')
+    parser.add_argument('--format', choices=('multi', 'single'), default='multi', help='generator input format')
+    parser.add_argument('--slides', type=int, default=10)
+    parser.add_argument('--elements', type=int, default=50, help='content elements per slide')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--image-dir', help='where to write the images (default: next to the output)')
+    args = parser.parse_args()
+
+    image_dir = args.image_dir or os.path.dirname(os.path.abspath(args.output))
+    image_paths = make_images(image_dir) if args.profile == 'image' else ()
+    deck = make_deck(args.format, args.profile, args.slides, args.elements, image_paths, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(deck, f)
+    print(f"Wrote {args.slides} {args.profile} slides ({args.format} format) to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
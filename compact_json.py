@@ -0,0 +1,79 @@
+"""Convert extraction JSON to the compact format and back.
+
+Extraction attaches a full computed-style dict to every element, and most
+of them are identical across siblings and slides. A compact document stores
+each distinct style dict once:
+
+    {"format": "pptgen-compact", "version": 1, "styles": [{...}, ...], "document": ...}
+
+document is the original extraction JSON (the multi-slide array, the
+single-slide {slideWidth, slideHeight, slides} object or a single slide)
+with every "styles" and "slideStyles" dict replaced by its index in styles.
+Both generators read compact documents wherever they read extraction JSON,
+including in stream mode (see slide_stream).
+
+Usage: python compact_json.py input.json output.json [--expand]
+"""
+import argparse
+import json
+import os
+
+from slide_stream import COMPACT_FORMAT, COMPACT_VERSION, STYLE_KEYS, expand_document
+
+def compact_document(document):
+    """Compact document of extraction JSON, which is left unchanged; returns (compact document, style references)"""
+    styles = []
+    ids = {}  # canonical JSON of a style dict -> index in styles
+    references = 0
+
+    def style_id(style):
+        key = json.dumps(style, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        index = ids.get(key)
+        if index is None:
+            index = ids[key] = len(styles)
+            styles.append(style)
+        return index
+
+    def compact(value):
+        nonlocal references
+        if isinstance(value, dict):
+            result = {}
+            for key, child in value.items():
+                if key in STYLE_KEYS and isinstance(child, dict):
+                    result[key] = style_id(child)
+                    references += 1
+                else:
+                    result[key] = compact(child)
+            return result
+        if isinstance(value, list):
+            return [compact(child) for child in value]
+        return value
+
+    body = compact(document)
+    return {'format': COMPACT_FORMAT, 'version': COMPACT_VERSION, 'styles': styles, 'document': body}, references
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', help='extraction JSON, or a compact document with --expand')
+    parser.add_argument('output')
+    parser.add_argument('--expand', action='store_true', help='write the plain extraction JSON of a compact document')
+    args = parser.parse_args()
+
+    try:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading JSON file: {e}")
+        return 1
+    if args.expand:
+        output = expand_document(document)
+    else:
+        output, references = compact_document(document)
+        print(f"{references} style dict(s), {len(output['styles'])} distinct")
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, separators=(',', ':'), ensure_ascii=False)
+    print(f"Wrote {args.output}: {os.path.getsize(args.output)} bytes, from {os.path.getsize(args.input)} bytes")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
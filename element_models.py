@@ -11,6 +11,11 @@ from enum import Enum
 
 
 
+# Keyword arguments PPTPara and PPTText take as the style of their default run and paragraph
+RUN_STYLE_KEYS = frozenset(["font_size", "font_name", "bold", "italic", "underline", "color", "link"])
+PARA_STYLE_KEYS = RUN_STYLE_KEYS | {"level", "alignment", "space_before", "space_after", "line_spacing", "bullet_char"}
+
+
 class PPTRun(BaseModel):
     text: str = ""
     font_size: int = None
@@ -24,6 +29,20 @@ class PPTRun(BaseModel):
 
 
 
+def _run_dict(run: PPTRun) -> dict:
+    """run.dict() without pydantic's per-field walk: PPTRun fields are flat, only color needs a copy"""
+    if type(run) is not PPTRun:
+        return run.dict()
+    data = dict(run.__dict__)
+    if isinstance(data["color"], (list, tuple)):
+        data["color"] = type(data["color"])(data["color"])
+    return data
+
+
+# PPTPara fields copied into the paragraphs PPTText builds from strings and runs
+PARA_STYLE_FIELDS = ("level", "alignment", "space_before", "space_after", "line_spacing", "bullet_char")
+
+
 class PPTPara(BaseModel):
     runs: Union[str, PPTRun, List[Union[str, PPTRun]]] = []
     default_run_style: PPTRun = Field(default_factory=PPTRun)
@@ -35,8 +54,7 @@ class PPTPara(BaseModel):
     bullet_char: bool = None 
 
     def __init__(self, **data):
-        run_style_keys = {"font_size", "font_name", "bold", "italic", "underline", "color", "link"}
-        style_args = {k: data.pop(k) for k in list(data) if k in run_style_keys}
+        style_args = {k: data.pop(k) for k in list(data) if k in RUN_STYLE_KEYS}
         
         if "default_run_style" not in data and style_args:
             data["default_run_style"] = PPTRun(**style_args)
@@ -48,7 +66,7 @@ class PPTPara(BaseModel):
         if exclude is None:
             exclude = set()
         dict_data =  {
-            "runs": [r.dict() for r in runs],
+            "runs": [_run_dict(r) for r in runs],
             "level": self.level,
             "alignment": self.alignment,
             "space_before": self.space_before,
@@ -68,7 +86,8 @@ class PPTPara(BaseModel):
         return []
 
     def _apply_style(self, text: str) -> PPTRun:
-        return PPTRun(text=text, **self.default_run_style.dict(exclude={"text"}))
+        # text passed validation as a run of this paragraph and the style as default_run_style, skip revalidating
+        return PPTRun.construct(**{**_run_dict(self.default_run_style), "text": text})
           
       
 class PPTText(BaseModel):
@@ -118,23 +137,7 @@ class PPTText(BaseModel):
 
 
     def __init__(self, **data):
-        para_style_keys = {
-                            "level", 
-                            "alignment", 
-                            "space_before", 
-                            "space_after", 
-                            "line_spacing",
-                            "bullet_char", 
-                            "font_size", 
-                            "font_name", 
-                            "bold", 
-                            "italic",
-                            "underline",
-                            "color", 
-                            "link"
-                        }
-        
-        style_args = {k: data.pop(k) for k in list(data) if k in para_style_keys}
+        style_args = {k: data.pop(k) for k in list(data) if k in PARA_STYLE_KEYS}
         if "default_para_style" not in data and style_args:
             data["default_para_style"] = PPTPara(**style_args)
         super().__init__(**data)
@@ -169,20 +172,20 @@ class PPTText(BaseModel):
     def _convert_para(self) -> List[PPTPara]:
         if isinstance(self.paras, PPTPara):
             return [self.paras]
-        if isinstance(self.paras, PPTRun):
-            return [self._apply_style(self.paras)]
-        if isinstance(self.paras, str):
+        if isinstance(self.paras, (PPTRun, str)):
             return [self._apply_style(self.paras)]
         if isinstance(self.paras, list):
             return [p if isinstance(p, PPTPara) else self._apply_style(p) for p in self.paras]
-        
         return []
 
-    def _apply_style(self, runs: str) -> PPTPara:
-        return  PPTPara(runs=runs, 
-                       **self.default_para_style.dict(exclude={"runs"}), 
-                       default_run_style = self.default_para_style.default_run_style
-                    )
+    def _apply_style(self, runs: Union[str, PPTRun]) -> PPTPara:
+        # parse_paras let through only strings and runs, and default_para_style is validated, skip revalidating;
+        # copies stand in for the ones validation made, so paragraphs don't share a run
+        style = self.default_para_style
+        if isinstance(runs, PPTRun):
+            runs = runs.copy()
+        return PPTPara.construct(runs=runs, default_run_style=style.default_run_style.copy(),
+                                 **{name: getattr(style, name) for name in PARA_STYLE_FIELDS})
 
 
 class PPTTitle(BaseModel):
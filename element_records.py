@@ -0,0 +1,218 @@
+"""Typed records of extracted slides, decoded once per slide before rendering.
+
+decode_slide turns a slide dict of extraction JSON into __slots__ records
+holding the fields the renderers read, with the extraction defaults applied
+and geometry as floats, so handlers read attributes instead of chains of
+.get calls with defaults. Elements without a size are 100x100 px. styles
+dicts are kept as they are, shared with the JSON, and parsed by
+style_resolver.resolve_style.
+"""
+from style_resolver import safe_float, safe_int
+
+# Shared by every record without styles, treat as read-only
+EMPTY_STYLES = {}
+
+def _float(value, default):
+    """value as a float, default when it is missing or not a number"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if value is None:
+        return default
+    return safe_float(value, default)
+
+def _styles(data):
+    return data.get('styles') or EMPTY_STYLES
+
+class SlideRecord:
+    __slots__ = ('elements', 'styles')
+
+    def __init__(self, elements, styles):
+        self.elements = elements
+        self.styles = styles
+
+class ElementRecord:
+    """One extracted element; type is lower case, the *_info fields are None when absent"""
+    __slots__ = ('type', 'class_name', 'text', 'styles', 'x', 'y', 'width', 'height', 'z_index',
+                 'inline_group', 'list_info', 'table_info', 'media_info', 'src')
+
+    def __init__(self, type, class_name, text, styles, x, y, width, height, z_index=0,
+                 inline_group=None, list_info=None, table_info=None, media_info=None, src=''):
+        self.type = type
+        self.class_name = class_name
+        self.text = text
+        self.styles = styles
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.z_index = z_index
+        self.inline_group = inline_group
+        self.list_info = list_info
+        self.table_info = table_info
+        self.media_info = media_info
+        self.src = src
+
+class InlineRun:
+    """One entry of an inline group: a text run or a 'br'"""
+    __slots__ = ('type', 'text', 'styles')
+
+    def __init__(self, type, text, styles):
+        self.type = type
+        self.text = text
+        self.styles = styles
+
+class InlineGroup:
+    """Runs of mixed inline formatting, with the rect of their container"""
+    __slots__ = ('runs', 'styles', 'x', 'y', 'width', 'height')
+
+    def __init__(self, runs, styles, x, y, width, height):
+        self.runs = runs
+        self.styles = styles
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+class ListItem:
+    __slots__ = ('text', 'styles', 'y', 'height', 'inline_group', 'nested_list')
+
+    def __init__(self, text, styles, y, height, inline_group=None, nested_list=None):
+        self.text = text
+        self.styles = styles
+        self.y = y
+        self.height = height
+        self.inline_group = inline_group
+        self.nested_list = nested_list
+
+class ListInfo:
+    __slots__ = ('ordered', 'start', 'style_type', 'line_height', 'items', 'x', 'y', 'width', 'height')
+
+    def __init__(self, ordered, start, style_type, line_height, items, x, y, width, height):
+        self.ordered = ordered
+        self.start = start
+        self.style_type = style_type
+        self.line_height = line_height
+        self.items = items
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+class TableCell:
+    __slots__ = ('type', 'text', 'styles', 'width', 'col_span', 'row_span', 'index', 'inline_group')
+
+    def __init__(self, type, text, styles, width, col_span, row_span, index, inline_group=None):
+        self.type = type
+        self.text = text
+        self.styles = styles
+        self.width = width
+        self.col_span = col_span
+        self.row_span = row_span
+        self.index = index
+        self.inline_group = inline_group
+
+class TableRow:
+    """height is None when the extraction has no row rect"""
+    __slots__ = ('index', 'height', 'styles', 'cells')
+
+    def __init__(self, index, height, styles, cells):
+        self.index = index
+        self.height = height
+        self.styles = styles
+        self.cells = cells
+
+class TableInfo:
+    __slots__ = ('styles', 'row_count', 'column_count', 'rows', 'x', 'y', 'width', 'height')
+
+    def __init__(self, styles, row_count, column_count, rows, x, y, width, height):
+        self.styles = styles
+        self.row_count = row_count
+        self.column_count = column_count
+        self.rows = rows
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+class MediaInfo:
+    """natural_width is None when the extraction has none"""
+    __slots__ = ('src', 'natural_width')
+
+    def __init__(self, src, natural_width):
+        self.src = src
+        self.natural_width = natural_width
+
+def decode_inline_group(data):
+    """InlineGroup of an inlineGroup dict, None for a missing or empty one"""
+    if not data:
+        return None
+    runs = [InlineRun(run.get('type'), run.get('text') or '', _styles(run))
+            for run in data.get('inlineElements') or ()]
+    rect = data.get('groupRect') or {}
+    return InlineGroup(runs, _styles(data), _float(rect.get('x'), 0.0), _float(rect.get('y'), 0.0),
+                       _float(rect.get('width'), 100.0), _float(rect.get('height'), 20.0))
+
+def decode_list_info(data, width=100.0, height=100.0):
+    """ListInfo of a listInfo dict; width and height stand in for a missing rect"""
+    if not data:
+        return None
+    ordered = data.get('type') == 'ol'
+    rect = data.get('rect') or {}
+    items = []
+    for item in data.get('items') or ():
+        item_rect = item.get('rect') or {}
+        items.append(ListItem(item.get('text') or '', _styles(item), _float(item_rect.get('y'), 0.0),
+                              _float(item_rect.get('height'), 0.0), decode_inline_group(item.get('inlineGroup')),
+                              decode_list_info(item.get('nestedList'))))
+    return ListInfo(ordered, safe_int(data.get('start', 1), 1),
+                    (data.get('listStyles') or {}).get('listStyleType', 'decimal' if ordered else 'disc'),
+                    (data.get('styles') or {}).get('lineHeight', 'normal'), items,
+                    _float(rect.get('x'), 0.0), _float(rect.get('y'), 0.0),
+                    _float(rect.get('width'), width), _float(rect.get('height'), height))
+
+def decode_table_info(data, x=0.0, y=0.0, width=100.0, height=100.0):
+    """TableInfo of a tableInfo dict; x, y, width and height stand in for a missing rect"""
+    if not data:
+        return None
+    rows = []
+    for row_position, row in enumerate(data.get('rows') or ()):
+        row_rect = row.get('rect') or {}
+        cells = []
+        for cell_position, cell in enumerate(row.get('cells') or ()):
+            cells.append(TableCell(cell.get('type'), cell.get('text') or '', _styles(cell),
+                                   _float((cell.get('rect') or {}).get('width'), 0.0),
+                                   safe_int(cell.get('colSpan', 1), 1), safe_int(cell.get('rowSpan', 1), 1),
+                                   safe_int(cell.get('cellIndex', cell_position), cell_position),
+                                   decode_inline_group(cell.get('inlineGroup'))))
+        rows.append(TableRow(safe_int(row.get('index', row_position), row_position),
+                             _float(row_rect['height'], 0.0) if 'height' in row_rect else None,
+                             _styles(row), cells))
+    row_count = data.get('rowCount')
+    column_count = data.get('columnCount')
+    rect = data.get('rect') or {}
+    return TableInfo(_styles(data),
+                     len(rows) if row_count is None else safe_int(row_count),
+                     max((sum(cell.col_span for cell in row.cells) for row in rows), default=0)
+                     if column_count is None else safe_int(column_count),
+                     rows, _float(rect.get('x'), x), _float(rect.get('y'), y),
+                     _float(rect.get('width'), width), _float(rect.get('height'), height))
+
+def decode_element(data):
+    x = _float(data.get('x'), 0.0)
+    y = _float(data.get('y'), 0.0)
+    width = _float(data.get('width'), 100.0)
+    height = _float(data.get('height'), 100.0)
+    media = data.get('mediaInfo')
+    return ElementRecord(
+        (data.get('type') or '').lower(), data.get('className') or '', data.get('text') or '', _styles(data),
+        x, y, width, height, data.get('zIndex', 0),
+        decode_inline_group(data.get('inlineGroup')),
+        decode_list_info(data.get('listInfo'), width, height),
+        decode_table_info(data.get('tableInfo'), x, y, width, height),
+        MediaInfo(media.get('src') or '', _float(media.get('naturalWidth'), None)) if media else None,
+        data.get('src') or '')
+
+def decode_slide(slide_data):
+    """SlideRecord of a slide dict from either extractor"""
+    return SlideRecord([decode_element(element) for element in slide_data.get('elements') or ()],
+                       slide_data.get('slideStyles') or EMPTY_STYLES)
@@ -1,7 +1,16 @@
 const puppeteer = require('puppeteer');
 const fs = require('fs').promises;
+const { createWriteStream } = require('fs');
+
+// Output "-" (stdout) or a .ndjson path streams one compact slide per line as each slide is extracted
+function isNdjsonOutput(outputPath) {
+    return outputPath === '-' || outputPath.endsWith('.ndjson');
+}
 
 async function extractSlideData(htmlFilePath, outputPath) {
+    const ndjson = isNdjsonOutput(outputPath);
+    // Keep stdout for the slides when streaming to it
+    const log = outputPath === '-' ? console.error : console.log;
     const browser = await puppeteer.launch({
         headless: true,
         devtools: false,
@@ -19,7 +28,7 @@ async function extractSlideData(htmlFilePath, outputPath) {
             const images = Array.from(document.querySelectorAll('img'));
             const fonts = document.fonts ? document.fonts.ready : Promise.resolve();
             return Promise.all([fonts, images.every(img => img.complete)]);
-        }, { timeout: 15000 }).catch(() => console.log('Some resources may not have loaded'));
+        }, { timeout: 15000 }).catch(() => log('Some resources may not have loaded'));
 
         const documentInfo = await page.evaluate(() => {
             const body = document.body;
@@ -61,13 +70,25 @@ async function extractSlideData(htmlFilePath, outputPath) {
             };
         });
 
-        console.log('Document dimensions:', documentInfo);
-        console.log(`Found ${documentInfo.slidesCount} slides`);
+        log('Document dimensions:', documentInfo);
+        log(`Found ${documentInfo.slidesCount} slides`);
 
         const targetWidth = Math.max(documentInfo.actualWidth, 1920);
         const targetHeight = Math.max(documentInfo.actualHeight, 1080);
         await page.setViewport({ width: targetWidth, height: targetHeight });
 
+        let output = null;
+        let emitted = 0;
+        if (ndjson) {
+            output = outputPath === '-' ? process.stdout : createWriteStream(outputPath, 'utf-8');
+            await page.exposeFunction('emitSlide', slide => {
+                emitted++;
+                if (!output.write(JSON.stringify(slide) + '\n')) {
+                    return new Promise(resolve => output.once('drain', resolve));
+                }
+            });
+        }
+
         const allSlidesData = await page.evaluate(async (docInfo) => {
             const slides = [];
             const slideElements = Array.from(document.querySelectorAll('.slide')) || [document.body];
@@ -808,14 +829,25 @@ async function extractSlideData(htmlFilePath, outputPath) {
 
                 // Sort elements by z-index for proper layering
                 slide.elements.sort((a, b) => a.zIndex - b.zIndex || 0);
-                slides.push(slide);
+                if (typeof window.emitSlide === 'function') {
+                    await window.emitSlide(slide);
+                } else {
+                    slides.push(slide);
+                }
             }
 
             return slides;
         }, documentInfo);
 
-        await fs.writeFile(outputPath, JSON.stringify(allSlidesData, null, 2), 'utf-8');
-        console.log(`Successfully extracted ${allSlidesData.length} slides to ${outputPath}`);
+        if (ndjson) {
+            if (output !== process.stdout) {
+                await new Promise((resolve, reject) => output.end(err => (err ? reject(err) : resolve())));
+            }
+            log(`Successfully streamed ${emitted} slides to ${outputPath === '-' ? 'stdout' : outputPath}`);
+        } else {
+            await fs.writeFile(outputPath, JSON.stringify(allSlidesData, null, 2), 'utf-8');
+            log(`Successfully extracted ${allSlidesData.length} slides to ${outputPath}`);
+        }
 
     } catch (err) {
         console.error('Error processing slides:', err);
@@ -824,8 +856,9 @@ async function extractSlideData(htmlFilePath, outputPath) {
     }
 };
 
-const htmlFilePath = 'input.html';
-const outputPath = 'slides_data.json';
+// Usage: node extract_multi_slide.js [input.html] [slides_data.json | slides.ndjson | -]
+const htmlFilePath = process.argv[2] || 'input.html';
+const outputPath = process.argv[3] || 'slides_data.json';
 
 extractSlideData(htmlFilePath, outputPath).catch(err => {
     console.error('Error:', err);
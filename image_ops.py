@@ -0,0 +1,168 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw
+
+# Above this many pixels PNG output uses fast compression, the file gets a bit
+# larger but encoding a big photo at the default level costs far more
+FAST_PNG_PIXELS = 1_000_000
+FAST_PNG_COMPRESS_LEVEL = 1
+DEFAULT_PNG_COMPRESS_LEVEL = 6
+# Byte budgets of the per-process mask and output caches; a mask takes a byte per pixel
+MAX_CACHED_MASK_BYTES = 32 * 1024 * 1024
+MAX_CACHED_OUTPUT_BYTES = 64 * 1024 * 1024
+# Only resample when the image is at least this much larger than its target size
+MIN_DOWNSAMPLE_RATIO = 1.1
+JPEG_QUALITY = 90
+
+class ByteLRU:
+    """Thread-safe LRU map bounded by the total size of its values.
+
+    Values larger than a quarter of max_bytes are not kept, so one big photo
+    can't flush everything else.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()  # key -> (value, size)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key, value, size):
+        if size > self.max_bytes // 4:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._total -= old[1]
+            self._items[key] = (value, size)
+            self._total += size
+            while self._total > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._total -= evicted
+
+    def total_bytes(self):
+        return self._total
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._total = 0
+
+_mask_cache = ByteLRU(MAX_CACHED_MASK_BYTES)  # (size, radius) -> L mask
+_output_cache = ByteLRU(MAX_CACHED_OUTPUT_BYTES)  # (image hash, operation, parameter) -> encoded bytes
+
+def rounded_mask(size, radius):
+    """L mask with rounded corners, shared by every image of the same size and radius"""
+    key = (size, radius)
+    mask = _mask_cache.get(key)
+    if mask is None:
+        mask = Image.new("L", size, 0)
+        draw = ImageDraw.Draw(mask)
+        draw.rounded_rectangle((0, 0) + size, radius=radius, fill=255)
+        _mask_cache.put(key, mask, size[0] * size[1])
+    return mask
+
+def png_compress_level(size):
+    return FAST_PNG_COMPRESS_LEVEL if size[0] * size[1] > FAST_PNG_PIXELS else DEFAULT_PNG_COMPRESS_LEVEL
+
+def _encode_png(im):
+    output = io.BytesIO()
+    im.save(output, "PNG", compress_level=png_compress_level(im.size))
+    return output.getvalue()
+
+def _cached_output(key, build):
+    data = _output_cache.get(key)
+    if data is None:
+        data = build()
+        _output_cache.put(key, data, len(data))
+    return data
+
+def make_rounded_image(image_data, radius, image_hash=None):
+    """Round the corners of encoded image bytes, returns a PNG in a BytesIO.
+
+    Results are cached per (image hash, radius), so a logo repeated on every
+    slide is masked and encoded once per process.
+    """
+    image_hash = image_hash or hashlib.sha256(image_data).hexdigest()
+
+    def build():
+        im = Image.open(io.BytesIO(image_data)).convert("RGBA")
+        im.putalpha(rounded_mask(im.size, radius))
+        return _encode_png(im)
+
+    return io.BytesIO(_cached_output((image_hash, 'rounded', radius), build))
+
+class DownsamplePolicy:
+    """Resample images to their displayed size times density before embedding.
+
+    density is image pixels per CSS pixel (2.0 keeps images sharp on HiDPI
+    screens). Images are only shrunk, keep their aspect ratio and format, and
+    the smaller encoding wins. bytes_saved() sums the savings over the unique
+    images of a deck, matching what ends up in the package.
+    """
+
+    def __init__(self, density=2.0):
+        self.density = density
+        self._saved = {}  # (image hash, target size) -> bytes saved
+
+    def target_size(self, natural_size, display_width, display_height):
+        """Pixel size to resample natural_size to, or None to keep the original"""
+        natural_w, natural_h = natural_size
+        want_w = max(1, display_width * self.density)
+        want_h = max(1, display_height * self.density)
+        scale = max(want_w / natural_w, want_h / natural_h)
+        if scale * MIN_DOWNSAMPLE_RATIO > 1:
+            return None
+        return (max(1, round(natural_w * scale)), max(1, round(natural_h * scale)))
+
+    def apply(self, image_data, image_hash, display_width, display_height):
+        """Return (bytes, sha256, pixel size) of the image to embed"""
+        im = Image.open(io.BytesIO(image_data))
+        target = self.target_size(im.size, display_width, display_height)
+        if target is None or getattr(im, 'is_animated', False):
+            return image_data, image_hash, im.size
+        is_jpeg = im.format == 'JPEG'
+
+        def build():
+            if is_jpeg:
+                im.draft('RGB', target)
+            resized = im.resize(target, Image.LANCZOS) if im.mode in ('RGB', 'RGBA', 'L', 'LA') \
+                else im.convert('RGBA').resize(target, Image.LANCZOS)
+            output = io.BytesIO()
+            if is_jpeg:
+                if resized.mode not in ('RGB', 'L'):
+                    resized = resized.convert('RGB')
+                resized.save(output, "JPEG", quality=JPEG_QUALITY)
+            else:
+                resized.save(output, "PNG", compress_level=png_compress_level(target))
+            return output.getvalue()
+
+        data = _cached_output((image_hash, 'downsample', target), build)
+        if len(data) >= len(image_data):
+            return image_data, image_hash, im.size
+        self._saved[(image_hash, target)] = len(image_data) - len(data)
+        return data, hashlib.sha256(data).hexdigest(), target
+
+    def stats(self):
+        """Per-image savings, for handing results back from a worker process"""
+        return dict(self._saved)
+
+    def add_stats(self, stats):
+        self._saved.update(stats)
+
+    def images_resampled(self):
+        return len(self._saved)
+
+    def bytes_saved(self):
+        return sum(self._saved.values())
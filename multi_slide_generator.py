@@ -1,38 +1,57 @@
+import collections
+import copy
+import functools
+import hashlib
+import io
+import itertools
 import json
-import base64
 from pptx import Presentation
 from pptx.util import Pt
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.dml import MSO_LINE, MSO_COLOR_TYPE
-import requests
-from PIL import Image, ImageDraw
 import os
-import re
 import math
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+from lxml import etree
+from pptx.oxml import parse_xml
 from pptx.oxml.xmlchemy import OxmlElement
-from pptx.oxml.ns import qn
+from pptx.oxml.ns import nsdecls, qn
+try:
+    # Private python-pptx helpers build_table_xml reproduces the per-cell output with;
+    # without them (other python-pptx versions) tables go through the per-cell API
+    from pptx.oxml.text import CT_RegularTextRun
+    from pptx.table import _Cell
+    escape_ctrl_chars = CT_RegularTextRun._escape_ctrl_chars
+except (ImportError, AttributeError):
+    _Cell = escape_ctrl_chars = None
+from asset_cache import DEFAULT_PREFETCH_WORKERS, collect_image_sources, get_image_cache, set_picture_name
+from element_records import decode_slide
+from image_ops import DownsamplePolicy, make_rounded_image
+from pptx_merge import PresentationMerger, set_slide_order
+import render_profile
+from slide_cache import get_slide_cache, template_key
+from slide_stream import SlideStream, SlideStreamError, expand_document
+import template_cache
+from style_resolver import (parse_color, parse_radius_spec, parse_shadow, pixels_to_emu, radius_ratio,
+                            resolve_style, safe_float, safe_int)
 
-def safe_int(value, default=0):
-    try:
-        return int(float(value))
-    except (ValueError, TypeError):
-        return default
-
-def safe_float(value, default=0.0):
-    """Safely convert value to float with better error handling"""
-    try:
-        if isinstance(value, str):
-            # Remove units and extract numeric value
-            value = re.sub(r'[^\d.-]', '', value)
-        return float(value) if value else default
-    except (ValueError, TypeError):
-        return default
-
-def pixels_to_emu(pixels):
-    """Convert pixels to EMU with high precision"""
-    return int(round(pixels * 9525))
+# Slides per partial presentation in parallel rendering
+DEFAULT_RENDER_CHUNK_SIZE = 10
+# Space kept above and below tables split across continuation slides, in pixels
+TABLE_PAGE_MARGIN = 40
+# Per-process counters of the current deck, reset by create_pptx_from_json and render_slides_chunk
+render_stats = collections.Counter()
+# Style of tables python-pptx adds, also used by the bulk table builder
+DEFAULT_TABLE_STYLE_ID = '{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}'
+# Functions timed when create_pptx_from_json is called with profile set
+PROFILE_HOOKS = ('add_slide_from_data', 'build_parent_map', 'build_child_map', 'add_bg_shape',
+                 'create_precise_border_shapes', 'apply_shadow', 'apply_parsed_shadow', 'add_inline_group_element',
+                 'add_list_element', 'add_table_element', 'paginate_table', 'build_table_xml', 'set_cell_border',
+                 'add_image_element', 'add_text_element', 'make_rounded_image', 'find_hidden_elements',
+                 'add_slide_from_cache')
 
 def px_to_pt(px):
     """Convert pixels to points"""
@@ -45,176 +64,76 @@ def get_font_size_pt(font_size_px):
 
 def parse_border_radius(radius_str, shape_width_px, shape_height_px):
     """Parse border radius from CSS string"""
-    if not radius_str or radius_str == '0px':
-        return 0
-    try:
-        if isinstance(radius_str, str):
-            if '%' in radius_str:
-                percent = safe_float(radius_str.replace('%', ''))
-                return min(percent / 100, 0.5)
-            match = re.search(r'[\d.]+', radius_str)
-            if match:
-                radius_px = float(match.group())
-            else:
-                return 0
-        else:
-            radius_px = float(radius_str)
-        min_dimension = min(shape_width_px, shape_height_px)
-        if min_dimension > 0:
-            return min(radius_px / min_dimension, 0.5)
-        return 0
-    except (ValueError, TypeError):
-        return 0
-
-def parse_color(color_str):
-    """Enhanced color parsing with better RGB extraction"""
-    if not color_str or color_str in ['transparent', 'rgba(0, 0, 0, 0)', 'none', 'initial', 'inherit']:
-        return None
-    
-    # Handle RGB/RGBA
-    if color_str.startswith(('rgb', 'rgba')):
-        parts = re.findall(r'[\d.]+', color_str)
-        if len(parts) >= 3:
-            r = min(255, max(0, int(float(parts[0]))))
-            g = min(255, max(0, int(float(parts[1]))))
-            b = min(255, max(0, int(float(parts[2]))))
-            return RGBColor(r, g, b)
-    
-    # Handle hex colors
-    elif color_str.startswith('#'):
-        color_str = color_str.lstrip('#')
-        if len(color_str) == 6:
-            try:
-                return RGBColor(int(color_str[0:2], 16), int(color_str[2:4], 16), int(color_str[4:6], 16))
-            except ValueError:
-                pass
-        elif len(color_str) == 3:
-            try:
-                return RGBColor(int(color_str[0]*2, 16), int(color_str[1]*2, 16), int(color_str[2]*2, 16))
-            except ValueError:
-                pass
-    
-    # Named colors
-    named_colors = {
-        'black': RGBColor(0, 0, 0), 'white': RGBColor(255, 255, 255),
-        'red': RGBColor(255, 0, 0), 'green': RGBColor(0, 128, 0),
-        'blue': RGBColor(0, 0, 255), 'yellow': RGBColor(255, 255, 0),
-        'gray': RGBColor(128, 128, 128), 'grey': RGBColor(128, 128, 128),
-        'silver': RGBColor(192, 192, 192), 'maroon': RGBColor(128, 0, 0),
-        'olive': RGBColor(128, 128, 0), 'lime': RGBColor(0, 255, 0),
-        'aqua': RGBColor(0, 255, 255), 'teal': RGBColor(0, 128, 128),
-        'navy': RGBColor(0, 0, 128), 'fuchsia': RGBColor(255, 0, 255),
-        'purple': RGBColor(128, 0, 128)
-    }
-    
-    return named_colors.get(color_str.lower())
+    return radius_ratio(parse_radius_spec(radius_str), shape_width_px, shape_height_px)
 
 def is_uniform_border(styles):
-    widths = [safe_float(styles.get(f'border{side}Width', '0px')) for side in ['Top', 'Right', 'Bottom', 'Left']]
-    styles_list = [styles.get(f'border{side}Style', 'none') for side in ['Top', 'Right', 'Bottom', 'Left']]
-    colors = [styles.get(f'border{side}Color', '') for side in ['Top', 'Right', 'Bottom', 'Left']]
-    return len(set(widths)) == 1 and len(set(styles_list)) == 1 and len(set(colors)) == 1 and widths[0] > 0
+    return resolve_style(styles).uniform_border
 
 def has_any_border(styles):
     """Enhanced border detection"""
-    for side in ['Top', 'Right', 'Bottom', 'Left']:
-        width_key = f'border{side}Width'
-        style_key = f'border{side}Style'
-        color_key = f'border{side}Color'
-        
-        width = safe_float(styles.get(width_key, '0px'))
-        style = styles.get(style_key, 'none')
-        color = parse_color(styles.get(color_key, ''))
-        
-        if width > 0 and style not in ['none', 'hidden'] and color is not None:
-            return True
-    return False
+    return resolve_style(styles).any_border
 
 def get_border_info(styles):
     """Enhanced border information extraction"""
-    border_info = {}
-    for side in ['Top', 'Right', 'Bottom', 'Left']:
-        width_key = f'border{side}Width'
-        style_key = f'border{side}Style'
-        color_key = f'border{side}Color'
-        
-        width = safe_float(styles.get(width_key, '0px'))
-        style = styles.get(style_key, 'none')
-        color = parse_color(styles.get(color_key, ''))
-        
-        border_info[side.lower()] = {
-            'width': width,
-            'style': style,
-            'color': color,
-            'has_border': width > 0 and style not in ['none', 'hidden'] and color is not None
-        }
-    return border_info
-
-def make_rounded_image(input_path, output_path, radius):
-    im = Image.open(input_path).convert("RGBA")
-    mask = Image.new("L", im.size, 0)
-    draw = ImageDraw.Draw(mask)
-    draw.rounded_rectangle((0, 0) + im.size, radius=radius, fill=255)
-    im.putalpha(mask)
-    im.save(output_path, "PNG")
+    return resolve_style(styles).border_info
 
-def create_precise_border_shapes(slide, x, y, width, height, border_info, border_radius=0):
-    """Create precise border shapes with accurate positioning"""
-    shapes_created = []
-    # Always check and draw all four borders if needed
+def border_side_rects(x, y, width, height, border_info):
+    """(side, info, (left, top, right, bottom)) bands in EMU for the drawn border sides.
+
+    Left and right stop at the top and bottom bands so the bands never overlap.
+    """
+    top = border_info['top']['width'] if border_info['top']['has_border'] else 0
+    bottom = border_info['bottom']['width'] if border_info['bottom']['has_border'] else 0
+    rects = []
     for side, info in border_info.items():
         if not info['has_border']:
             continue
         border_width = info['width']
-        border_color = info['color']
-        # Calculate precise line positions
         if side == 'top':
-            line_x = x
-            line_y = y
-            line_width = width
-            line_height = border_width
+            band = (x, y, x + width, y + border_width)
         elif side == 'right':
-            line_x = x + width - border_width
-            line_y = y
-            line_width = border_width
-            line_height = height
+            band = (x + width - border_width, y + top, x + width, y + height - bottom)
         elif side == 'bottom':
-            line_x = x
-            line_y = y + height - border_width
-            line_width = width
-            line_height = border_width
-        elif side == 'left':
-            line_x = x
-            line_y = y
-            line_width = border_width
-            line_height = height
+            band = (x, y + height - border_width, x + width, y + height)
+        else:
+            band = (x, y + top, x + border_width, y + height - bottom)
+        left, band_top, right, band_bottom = (pixels_to_emu(v) for v in band)
+        if right > left and band_bottom > band_top:
+            rects.append((side, info, (left, band_top, right, band_bottom)))
+    return rects
+
+def create_precise_border_shapes(slide, x, y, width, height, border_info, border_radius=0):
+    """Draw non-uniform borders as one freeform shape per border color, one filled band per side"""
+    shapes_created = []
+    by_color = {}
+    for side, info, rect in border_side_rects(x, y, width, height, border_info):
+        by_color.setdefault(str(info['color']), (info['color'], []))[1].append((side, rect))
+    for color, bands in by_color.values():
         try:
-            # Always use rectangle for side borders, rounded only for full shape
-            shape_type = MSO_SHAPE.RECTANGLE
-            border_shape = slide.shapes.add_shape(
-                shape_type,
-                pixels_to_emu(line_x), pixels_to_emu(line_y),
-                pixels_to_emu(line_width), pixels_to_emu(line_height)
-            )
+            builder = slide.shapes.build_freeform(bands[0][1][0], bands[0][1][1])
+            for i, (side, (left, top, right, bottom)) in enumerate(bands):
+                if i:
+                    builder.move_to(left, top)
+                builder.add_line_segments([(right, top), (right, bottom), (left, bottom)])
+            border_shape = builder.convert_to_shape()
             border_shape.fill.solid()
-            border_shape.fill.fore_color.rgb = border_color
+            border_shape.fill.fore_color.rgb = color
             border_shape.line.fill.background()
             border_shape.shadow.inherit = False
             shapes_created.append(border_shape)
         except Exception as e:
-            print(f"Error creating {side} border: {e}")
+            print(f"Error creating {'/'.join(side for side, _ in bands)} border: {e}")
     return shapes_created
 
 def add_bg_shape(slide, styles, x, y, width, height):
     """Enhanced background shape creation with precise positioning"""
-    bg_color = parse_color(styles.get('backgroundColor'))
-    border_radius_str = styles.get('borderRadius', '0px')
-    border_radius = parse_border_radius(border_radius_str, width, height)
+    style = resolve_style(styles)
+    bg_color = style.bg_color
+    border_radius = style.radius_ratio(width, height)
     has_radius = border_radius > 0
-    box_shadow = styles.get('boxShadow', 'none')
-    has_shadow = box_shadow != 'none'
-    has_uniform_border = is_uniform_border(styles)
-    has_any_border_sides = has_any_border(styles)
+    has_shadow = style.has_shadow
+    has_uniform_border = style.uniform_border
+    has_any_border_sides = style.any_border
     shapes_created = []
     # Create main background shape
     if bg_color or has_uniform_border or has_radius or has_shadow:
@@ -250,75 +169,63 @@ def add_bg_shape(slide, styles, x, y, width, height):
             else:
                 bg_shape.line.fill.background()
             if has_shadow:
-                apply_shadow(bg_shape, box_shadow)
+                apply_parsed_shadow(bg_shape, style.shadow)
             shapes_created.append(bg_shape)
         except Exception as e:
             print(f"Error adding bg shape: {e}")
     # Always handle non-uniform borders for all sides
     if has_any_border_sides and not has_uniform_border:
-        border_info = get_border_info(styles)
         border_shapes = create_precise_border_shapes(
-            slide, x, y, width, height, border_info,
+            slide, x, y, width, height, style.border_info,
             border_radius * min(width, height) if has_radius else 0
         )
         shapes_created.extend(border_shapes)
     return shapes_created
 
+def bg_shape_count(style, width, height):
+    """Number of shapes add_bg_shape adds for style"""
+    count = int(bool(style.bg_color or style.uniform_border or style.has_shadow or
+                     style.radius_ratio(width, height) > 0))
+    if style.any_border and not style.uniform_border:
+        count += len({str(info['color']) for info in style.border_info.values() if info['has_border']})
+    return count
+
 def apply_shadow(shape, box_shadow_str):
-    if box_shadow_str == 'none':
-        return
-    parts = box_shadow_str.split()
-    if len(parts) < 3:
-        return
-    offset_x_px = safe_float(parts[0])
-    offset_y_px = safe_float(parts[1])
-    blur_px = safe_float(parts[2])
-    spread_px = safe_float(parts[3]) if len(parts) > 3 else 0
-    color_str = parts[4] if len(parts) > 4 else parts[3]
-    if offset_x_px == 0 and offset_y_px == 0 and blur_px == 0 and spread_px == 0:
-        return
-    color = parse_color(color_str)
-    alpha = 1.0
-    if 'rgba' in color_str:
-        color_parts = re.findall(r'\d+', color_str)
-        if len(color_parts) == 4:
-            alpha = float(color_parts[3]) / 255
-    if not color:
+    apply_parsed_shadow(shape, parse_shadow(box_shadow_str))
+
+def apply_parsed_shadow(shape, shadow):
+    if shadow is None:
         return
-    distance_px = math.sqrt(offset_x_px**2 + offset_y_px**2)
-    direction = math.degrees(math.atan2(offset_y_px, offset_x_px)) if distance_px > 0 else 0
     shape.shadow.inherit = False
-    shape.shadow.blur = Pt(px_to_pt(blur_px))
-    shape.shadow.distance = Pt(px_to_pt(distance_px))
-    shape.shadow.angle = direction
+    shape.shadow.blur = shadow.blur
+    shape.shadow.distance = shadow.distance
+    shape.shadow.angle = shadow.angle
     shape.shadow.color.type = MSO_COLOR_TYPE.RGB
-    shape.shadow.color.rgb = color
-    shape.shadow.transparency = 1 - alpha
+    shape.shadow.color.rgb = shadow.color
+    shape.shadow.transparency = shadow.transparency
 
 def add_inline_group_element(slide, element, slide_width, slide_height, parent_has_shadow=False):
-    inline_group = element.get('inlineGroup')
+    inline_group = element.inline_group
     if not inline_group:
         return
-    inline_elements = inline_group.get('inlineElements', [])
+    inline_elements = inline_group.runs
     if not inline_elements:
         return
-    has_content = any(elem.get('text', '').strip() for elem in inline_elements)
+    has_content = any(run.text.strip() for run in inline_elements)
     if not has_content:
         return
-    group_rect = inline_group.get('groupRect', {})
-    x = max(0, min(group_rect.get('x', 0), slide_width - 10))
-    y = max(0, min(group_rect.get('y', 0), slide_height - 10))
-    width = max(10, min(group_rect.get('width', 100), slide_width - x))
-    height = max(10, min(group_rect.get('height', 20), slide_height - y))
-    styles = inline_group.get('styles', {})
-    box_shadow = styles.get('boxShadow', 'none')
-    has_shadow = box_shadow != 'none' and not parent_has_shadow
-    bg_color = parse_color(styles.get('backgroundColor'))
-    border_radius_str = styles.get('borderRadius', '0px')
-    border_radius = parse_border_radius(border_radius_str, width, height)
+    x = max(0, min(inline_group.x, slide_width - 10))
+    y = max(0, min(inline_group.y, slide_height - 10))
+    width = max(10, min(inline_group.width, slide_width - x))
+    height = max(10, min(inline_group.height, slide_height - y))
+    styles = inline_group.styles
+    style = resolve_style(styles)
+    has_shadow = style.has_shadow and not parent_has_shadow
+    bg_color = style.bg_color
+    border_radius = style.radius_ratio(width, height)
     has_radius = border_radius > 0
-    has_border = is_uniform_border(styles)
-    has_any_border_sides = has_any_border(styles)
+    has_border = style.uniform_border
+    has_any_border_sides = style.any_border
     try:
         if bg_color or has_border or has_any_border_sides or has_radius or has_shadow:
             add_bg_shape(slide, styles, x, y, width, height)
@@ -329,10 +236,8 @@ def add_inline_group_element(slide, element, slide_width, slide_height, parent_h
         text_frame = textbox.text_frame
         text_frame.word_wrap = True
         text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
-        text_frame.margin_left = pixels_to_emu(safe_float(styles.get('paddingLeft', '0px').replace('px', '')))
-        text_frame.margin_right = pixels_to_emu(safe_float(styles.get('paddingRight', '0px').replace('px', '')))
-        text_frame.margin_top = pixels_to_emu(safe_float(styles.get('paddingTop', '0px').replace('px', '')))
-        text_frame.margin_bottom = pixels_to_emu(safe_float(styles.get('paddingBottom', '0px').replace('px', '')))
+        (text_frame.margin_left, text_frame.margin_right,
+         text_frame.margin_top, text_frame.margin_bottom) = style.margins_emu()
         textbox.fill.background()
         textbox.line.fill.background()
         textbox.shadow.inherit = False
@@ -343,13 +248,13 @@ def add_inline_group_element(slide, element, slide_width, slide_height, parent_h
         alignment = PP_ALIGN.CENTER if text_align == 'center' else PP_ALIGN.RIGHT if text_align == 'right' else PP_ALIGN.LEFT
         p.alignment = alignment
         for inline_element in inline_elements:
-            if inline_element.get('type') == 'br':
+            if inline_element.type == 'br':
                 if p is not None:
                     p = text_frame.add_paragraph()
                     p.alignment = alignment
                 first = True
                 continue
-            element_text = inline_element.get('text', '')
+            element_text = inline_element.text
             if first:
                 element_text = element_text.lstrip()
             if not element_text.strip():
@@ -357,7 +262,7 @@ def add_inline_group_element(slide, element, slide_width, slide_height, parent_h
             first = False
             run = p.add_run()
             run.text = element_text
-            inline_styles = inline_element.get('styles', {})
+            inline_styles = inline_element.styles
             font = run.font
             font_size_px = safe_float(inline_styles.get('fontSize', '16').replace('px', ''))
             font.name = inline_styles.get('fontFamily', 'Segoe UI').split(',')[0].strip('"\'')
@@ -377,28 +282,26 @@ def add_inline_group_element(slide, element, slide_width, slide_height, parent_h
 def add_list_paragraphs(text_frame, list_info, level=0, counters=None):
     if counters is None:
         counters = {}
-    list_type = list_info.get('type')
-    is_ordered = list_type == 'ol'
-    list_styles = list_info.get('listStyles', {})
-    list_style_type = list_styles.get('listStyleType', 'disc' if not is_ordered else 'decimal')
+    is_ordered = list_info.ordered
+    list_style_type = list_info.style_type
     if is_ordered:
         counter_key = f'ol_{level}'
-        counters[counter_key] = list_info.get('start', 1) - 1
+        counters[counter_key] = list_info.start - 1
     # Calculate average space_after
-    items = list_info.get('items', [])
+    items = list_info.items
     avg_space_px = 0
     if len(items) > 1:
         spaces = []
         for i in range(len(items) - 1):
-            item_bottom = items[i]['rect']['y'] + items[i]['rect']['height']
-            next_top = items[i+1]['rect']['y']
+            item_bottom = items[i].y + items[i].height
+            next_top = items[i+1].y
             space_px = next_top - item_bottom
             if space_px > 0:
                 spaces.append(space_px)
         avg_space_px = sum(spaces) / len(spaces) if spaces else 0
     space_after_pt = px_to_pt(avg_space_px)
     # Line spacing
-    line_height_str = list_info.get('styles', {}).get('lineHeight', 'normal')
+    line_height_str = list_info.line_height
     if line_height_str == 'normal':
         line_spacing = 1.15
     else:
@@ -410,17 +313,17 @@ def add_list_paragraphs(text_frame, list_info, level=0, counters=None):
     first_item = True
     for item in items:
         p = None
-        item_styles = item.get('styles', {})
+        item_styles = item.styles
         default_font_size_px = safe_float(item_styles.get('fontSize', '16').replace('px', ''))
         default_font_size_pt = get_font_size_pt(default_font_size_px)
         default_font_name = item_styles.get('fontFamily', 'Segoe UI').split(',')[0].strip('"\'')
         default_color = parse_color(item_styles.get('color'))
-        if item.get('inlineGroup') and item['inlineGroup'].get('inlineElements'):
-            inline_elements = item['inlineGroup']['inlineElements']
+        if item.inline_group and item.inline_group.runs:
+            inline_elements = item.inline_group.runs
             first = True
             bullet_added = False
             for inline_element in inline_elements:
-                if inline_element.get('type') == 'br':
+                if inline_element.type == 'br':
                     if p is not None:
                         p = text_frame.add_paragraph()
                         p.level = level
@@ -431,7 +334,7 @@ def add_list_paragraphs(text_frame, list_info, level=0, counters=None):
                         p.first_line_indent = Pt(-18)
                     first = True
                     continue
-                element_text = inline_element.get('text', '')
+                element_text = inline_element.text
                 if p is None:
                     if first_item and level == 0:
                         p = text_frame.paragraphs[0]  # Use first paragraph for first item
@@ -480,7 +383,7 @@ def add_list_paragraphs(text_frame, list_info, level=0, counters=None):
                 first = False
                 run = p.add_run()
                 run.text = element_text
-                inline_styles = inline_element.get('styles', {})
+                inline_styles = inline_element.styles
                 font = run.font
                 font_size_px = safe_float(inline_styles.get('fontSize', '16').replace('px', ''))
                 font.name = inline_styles.get('fontFamily', 'Segoe UI').split(',')[0].strip('"\'')
@@ -534,7 +437,7 @@ def add_list_paragraphs(text_frame, list_info, level=0, counters=None):
                 if default_color:
                     bullet_run.font.color.rgb = default_color
             run = p.add_run()
-            run.text = item.get('text', '').strip()
+            run.text = item.text.strip()
             font = run.font
             font.name = default_font_name
             font.size = Pt(default_font_size_pt)
@@ -545,27 +448,25 @@ def add_list_paragraphs(text_frame, list_info, level=0, counters=None):
                 font.color.rgb = color
         
         first_item = False  # Set to False after first item
-        if item.get('nestedList'):
-            add_list_paragraphs(text_frame, item['nestedList'], level + 1, counters)
+        if item.nested_list:
+            add_list_paragraphs(text_frame, item.nested_list, level + 1, counters)
 
 def add_list_element(slide, element, slide_width, slide_height, parent_has_shadow=False):
-    list_info = element.get('listInfo', {})
-    if not list_info.get('items'):
+    list_info = element.list_info
+    if not list_info or not list_info.items:
         return
-    rect = list_info.get('rect', {})
-    x = safe_int(rect.get('x', 0))
-    y = safe_int(rect.get('y', 0))
-    width = safe_int(rect.get('width', element.get('width', 100)))
-    height = safe_int(rect.get('height', element.get('height', 100)))
-    styles = element.get('styles', {})
-    box_shadow = styles.get('boxShadow', 'none')
-    has_shadow = box_shadow != 'none' and not parent_has_shadow
-    bg_color = parse_color(styles.get('backgroundColor'))
-    border_radius_str = styles.get('borderRadius', '0px')
-    border_radius = parse_border_radius(border_radius_str, width, height)
+    x = int(list_info.x)
+    y = int(list_info.y)
+    width = int(list_info.width)
+    height = int(list_info.height)
+    styles = element.styles
+    style = resolve_style(styles)
+    has_shadow = style.has_shadow and not parent_has_shadow
+    bg_color = style.bg_color
+    border_radius = style.radius_ratio(width, height)
     has_radius = border_radius > 0
-    has_border = is_uniform_border(styles)
-    has_any_border_sides = has_any_border(styles)
+    has_border = style.uniform_border
+    has_any_border_sides = style.any_border
     try:
         if bg_color or has_border or has_any_border_sides or has_radius or has_shadow:
             add_bg_shape(slide, styles, x, y, width, height)
@@ -576,10 +477,8 @@ def add_list_element(slide, element, slide_width, slide_height, parent_has_shado
         text_frame = textbox.text_frame
         text_frame.word_wrap = True
         text_frame.vertical_anchor = MSO_ANCHOR.TOP
-        text_frame.margin_left = pixels_to_emu(safe_float(styles.get('paddingLeft', '0px').replace('px', '')))
-        text_frame.margin_right = pixels_to_emu(safe_float(styles.get('paddingRight', '0px').replace('px', '')))
-        text_frame.margin_top = pixels_to_emu(safe_float(styles.get('paddingTop', '0px').replace('px', '')))
-        text_frame.margin_bottom = pixels_to_emu(safe_float(styles.get('paddingBottom', '0px').replace('px', '')))
+        (text_frame.margin_left, text_frame.margin_right,
+         text_frame.margin_top, text_frame.margin_bottom) = style.margins_emu()
         textbox.fill.background()
         textbox.line.fill.background()
         textbox.shadow.inherit = False
@@ -620,29 +519,314 @@ def set_cell_border(cell, side, width_pt, color_rgb, style='solid'):
     side_elem.append(ln)
     tcBorders.append(side_elem)
 
+# Text insets python-pptx leaves out of a:bodyPr when set to the default
+BODY_INSET_DEFAULTS = (('lIns', 91440), ('rIns', 91440), ('tIns', 45720), ('bIns', 45720))
+CELL_ALIGNMENTS = {'center': 'ctr', 'right': 'r'}
+BOLD_WEIGHTS = ('bold', '600', '700', '800', '900')
+CELL_BORDER_SIDES = ('left', 'right', 'top', 'bottom')
+EMPTY_TC_XML = '<a:txBody><a:bodyPr/><a:lstStyle/><a:p/></a:txBody><a:tcPr/>'
+A_NSDECL = ' ' + nsdecls('a')
+
+def _xml_attr(value):
+    return quoteattr(value, {'\n': '&#10;', '\r': '&#13;', '\t': '&#9;'})
+
+@functools.lru_cache(maxsize=1024)
+def _body_props_xml(margins):
+    insets = ''.join(f' {name}="{value}"' for (name, default), value in zip(BODY_INSET_DEFAULTS, margins)
+                     if value != default)
+    return f'<a:bodyPr wrap="square" anchor="ctr"{insets}/>'
+
+@functools.lru_cache(maxsize=1024)
+def _run_props_xml(size, bold, italic, color, typeface):
+    fill = f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>' if color else ''
+    return (f'<a:rPr sz="{size}" b="{int(bold)}" i="{int(italic)}">{fill}'
+            f'<a:latin typeface={_xml_attr(typeface)}/></a:rPr>')
+
+def _cell_run_props_xml(styles):
+    """a:rPr of a table cell run, as add_table_element sets the font"""
+    font_size_px = safe_float(styles.get('fontSize', '14').replace('px', ''))
+    color = parse_color(styles.get('color'))
+    return _run_props_xml(Pt(max(9, get_font_size_pt(font_size_px))).centipoints,
+                          styles.get('fontWeight', '400') in BOLD_WEIGHTS,
+                          styles.get('fontStyle', 'normal') == 'italic',
+                          str(color) if color else None,
+                          styles.get('fontFamily', 'Segoe UI').split(',')[0].strip('"\''))
+
+@functools.lru_cache(maxsize=1024)
+def _cell_borders_xml(borders):
+    """a:tcBorders that set_cell_border writes for borders, (side, width_pt, color, style) tuples"""
+    tc = OxmlElement('a:tc')
+    cell = _Cell(tc, None)
+    for side, width_pt, color, style in borders:
+        set_cell_border(cell, side, width_pt, color, style)
+    tcBorders = tc.tcPr.find(qn('a:tcBorders')) if tc.tcPr is not None else None
+    if tcBorders is None:
+        return ''
+    return etree.tostring(tcBorders, encoding='unicode').replace(A_NSDECL, '')
+
+@functools.lru_cache(maxsize=1024)
+def _cell_props_xml(fill, borders):
+    fill_xml = f'<a:solidFill><a:srgbClr val="{fill}"/></a:solidFill>' if fill else '<a:noFill/>'
+    return f'<a:tcPr>{fill_xml}{_cell_borders_xml(borders)}</a:tcPr>'
+
+def _cell_content_xml(cell_data, row_bg_color):
+    """a:txBody and a:tcPr of a filled cell, returns (xml, has an empty run)"""
+    cell_styles = cell_data.styles
+    cell_style = resolve_style(cell_styles)
+    fill = cell_style.bg_color or row_bg_color
+    borders = []
+    for side in CELL_BORDER_SIDES:
+        cap_side = side.capitalize()
+        width_pt = safe_float(cell_styles.get(f'border{cap_side}Width', '0px').replace('px', ''))
+        color = parse_color(cell_styles.get(f'border{cap_side}Color'))
+        borders.append((side, width_pt, color, cell_styles.get(f'border{cap_side}Style', 'solid')))
+    algn = CELL_ALIGNMENTS.get(cell_styles.get('textAlign', 'left'), 'l')
+
+    paragraphs = [[]]  # runs as [escaped text, rPr xml]
+    if cell_data.inline_group and cell_data.inline_group.runs:
+        first = True
+        for inline_element in cell_data.inline_group.runs:
+            if inline_element.type == 'br':
+                paragraphs.append([])
+                first = True
+                continue
+            element_text = inline_element.text
+            if first:
+                element_text = element_text.lstrip()
+            if not element_text.strip():
+                continue
+            first = False
+            paragraphs[-1].append([escape_ctrl_chars(element_text),
+                                   _cell_run_props_xml(inline_element.styles)])
+        # Trim trailing spaces from the last run in the last paragraph
+        if paragraphs[-1]:
+            paragraphs[-1][-1][0] = paragraphs[-1][-1][0].rstrip()
+    else:
+        paragraphs[0].append([escape_ctrl_chars(cell_data.text.strip()),
+                              _cell_run_props_xml(cell_styles)])
+
+    has_empty_run = False
+    parts = [_body_props_xml(cell_style.margins_emu(8)), '<a:lstStyle/>']
+    for runs in paragraphs:
+        parts.append(f'<a:p><a:pPr algn="{algn}"/>')
+        for text, run_props in runs:
+            has_empty_run = has_empty_run or not text
+            parts.append(f'<a:r>{run_props}<a:t>{escape(text)}</a:t></a:r>')
+        parts.append('</a:p>')
+    return (f'<a:txBody>{"".join(parts)}</a:txBody>'
+            f'{_cell_props_xml(str(fill) if fill else None, tuple(borders))}'), has_empty_run
+
+def _merge_cell_attrs(tc_attrs, written, row, col, end_row, end_col):
+    """Record the span attributes _Cell.merge sets for a range.
+
+    A range containing merged cells is left unmerged, as _Cell.merge refuses
+    it, and still returns True. Returns False when the range covers an
+    already written cell besides its anchor, where only the per-cell path
+    reproduces the result.
+    """
+    span = [(r, c) for r in range(row, end_row + 1) for c in range(col, end_col + 1)]
+    if any(tc_attrs.get(rc) for rc in span):
+        return True
+    if any(rc in written for rc in span[1:]):
+        return False
+    row_count, col_count = end_row - row + 1, end_col - col + 1
+    for r, c in span:
+        attrs = {}
+        if r == row and row_count > 1:
+            attrs['rowSpan'] = str(row_count)
+        if c == col and col_count > 1:
+            attrs['gridSpan'] = str(col_count)
+        if c > col:
+            attrs['hMerge'] = '1'
+        if r > row:
+            attrs['vMerge'] = '1'
+        if attrs:
+            tc_attrs[(r, c)] = attrs
+    return True
+
+def build_table_xml(table_info, rows, cols, width, height):
+    """Whole a:tbl element for table_info, as add_table_element's per-cell calls would write it.
+
+    width and height are the table size in pixels. Cell properties and run
+    fonts are emitted from fragments cached per distinct style. Returns the
+    parsed element, or None when cells repeat or a span covers an already
+    filled cell and only the per-cell path reproduces the result.
+    """
+    rows_data = table_info.rows
+    if len(rows_data) > rows or escape_ctrl_chars is None:
+        return None
+    cx, cy = pixels_to_emu(width), pixels_to_emu(height)
+    # Column widths
+    col_html_widths = [0] * cols
+    for row_data in rows_data:
+        cell_idx = 0
+        for cell_data in row_data.cells:
+            cell_width = cell_data.width
+            col_span = cell_data.col_span
+            for _ in range(col_span):
+                col_html_widths[cell_idx] = max(col_html_widths[cell_idx], cell_width / col_span)
+                cell_idx += 1
+    total_html_width = sum(col_html_widths)
+    if total_html_width > 0:
+        col_widths = [pixels_to_emu(max(10, (w / total_html_width) * width)) for w in col_html_widths]
+    else:
+        col_widths = [cx // cols] * (cols - 1) + [cx - (cols - 1) * (cx // cols)]
+    row_heights = [cy // rows] * (rows - 1) + [cy - (rows - 1) * (cy // rows)]
+    for row_idx, row_data in enumerate(rows_data):
+        row_heights[row_idx] = pixels_to_emu(height / rows if row_data.height is None else row_data.height)
+
+    tc_attrs = {}  # (row, col) -> span attributes
+    contents = {}  # (row, col) -> cell content xml
+    written = set()
+    has_empty_run = False
+    for row_data in rows_data:
+        row_index = row_data.index
+        if row_index >= rows:
+            continue
+        row_bg_color = parse_color(row_data.styles.get('backgroundColor'))
+        for cell_data in row_data.cells:
+            cell_index = cell_data.index
+            if cell_index >= cols:
+                continue
+            if (row_index, cell_index) in written:
+                return None
+            col_span = cell_data.col_span
+            row_span = cell_data.row_span
+            if col_span < 1 or row_span < 1:
+                return None
+            if col_span > 1 or row_span > 1:
+                end_row = min(rows - 1, row_index + row_span - 1)
+                end_col = min(cols - 1, cell_index + col_span - 1)
+                if not _merge_cell_attrs(tc_attrs, written, row_index, cell_index, end_row, end_col):
+                    return None
+            written.add((row_index, cell_index))
+            contents[(row_index, cell_index)], empty_run = _cell_content_xml(cell_data, row_bg_color)
+            has_empty_run = has_empty_run or empty_run
+
+    parts = [f'<a:tbl {nsdecls("a")}><a:tblPr firstRow="1" bandRow="1">'
+             f'<a:tableStyleId>{DEFAULT_TABLE_STYLE_ID}</a:tableStyleId></a:tblPr><a:tblGrid>']
+    parts.extend(f'<a:gridCol w="{w}"/>' for w in col_widths)
+    parts.append('</a:tblGrid>')
+    for r in range(rows):
+        parts.append(f'<a:tr h="{row_heights[r]}">')
+        for c in range(cols):
+            attrs = tc_attrs.get((r, c))
+            attrs_xml = ''.join(f' {name}="{value}"' for name, value in attrs.items()) if attrs else ''
+            parts.append(f'<a:tc{attrs_xml}>{contents.get((r, c), EMPTY_TC_XML)}</a:tc>')
+        parts.append('</a:tr>')
+    parts.append('</a:tbl>')
+    tbl = parse_xml(''.join(parts))
+    if has_empty_run:
+        # python-pptx writes empty run text as <a:t></a:t>, which the parser reads back as no text
+        for t in tbl.iter(qn('a:t')):
+            if t.text is None:
+                t.text = ''
+    return tbl
+
+def _table_row_blocks(rows_data):
+    """Split rows into (first, end, height) blocks no rowSpan crosses, in one pass"""
+    blocks = []
+    span_end = -1
+    for i, row_data in enumerate(rows_data):
+        row_height = row_data.height or 0
+        if i > span_end:
+            blocks.append([i, i + 1, row_height])
+        else:
+            blocks[-1][1] = i + 1
+            blocks[-1][2] += row_height
+        for cell_data in row_data.cells:
+            span_end = max(span_end, i + cell_data.row_span - 1)
+    return blocks
+
+def _table_page(element, rows_data, y):
+    height = sum(row_data.height or 0 for row_data in rows_data)
+    rows = []
+    for i, row_data in enumerate(rows_data):
+        row = copy.copy(row_data)
+        row.index = i
+        rows.append(row)
+    table_info = copy.copy(element.table_info)
+    table_info.y, table_info.height, table_info.row_count, table_info.rows = y, height, len(rows), rows
+    page = copy.copy(element)
+    page.y, page.height, page.table_info = y, height, table_info
+    return page
+
+def paginate_table(element, slide_height, margin=TABLE_PAGE_MARGIN):
+    """Split a table element taller than the slide into per-slide table elements.
+
+    The first page keeps the table's position, later pages start margin
+    pixels from the top. Leading rows made of th cells are repeated at the
+    top of every page, and rows joined by a rowSpan stay on one page.
+    Returns [element] when the table fits.
+    """
+    table_info = element.table_info
+    rows_data = table_info.rows if table_info else []
+    y = int(table_info.y) if table_info else int(element.y)
+    blocks = _table_row_blocks(rows_data)
+    if y + sum(block[2] for block in blocks) <= slide_height:
+        return [element]
+
+    # Header: the leading blocks whose rows only hold th cells
+    header_blocks = 0
+    for first, end, _ in blocks:
+        if not all(row.cells and all(cell.type == 'th' for cell in row.cells)
+                   for row in rows_data[first:end]):
+            break
+        header_blocks += 1
+    if header_blocks == len(blocks):
+        return [element]
+    header_rows = rows_data[:blocks[header_blocks][0]]
+    header_height = sum(block[2] for block in blocks[:header_blocks])
+
+    pages = []
+    page_rows = []
+    page_y = y
+    available = slide_height - margin - y - header_height
+    for first, end, block_height in blocks[header_blocks:]:
+        if page_rows and block_height > available:
+            pages.append(_table_page(element, header_rows + page_rows, page_y))
+            page_rows = []
+            page_y = margin
+            available = slide_height - 2 * margin - header_height
+        page_rows.extend(rows_data[first:end])
+        available -= block_height
+    pages.append(_table_page(element, header_rows + page_rows, page_y))
+    return pages
+
 def add_table_element(slide, element, slide_width, slide_height, parent_has_shadow=False):
-    table_info = element.get('tableInfo', {})
-    if not table_info.get('rows'):
+    table_info = element.table_info
+    if not table_info or not table_info.rows:
         return
-    rect = table_info.get('rect', {})
-    x = safe_int(rect.get('x', element.get('x', 0)))
-    y = safe_int(rect.get('y', element.get('y', 0)))
-    width = safe_int(rect.get('width', element.get('width', 100)))
-    height = safe_int(rect.get('height', element.get('height', 100)))
-    styles = table_info.get('styles', {})
-    box_shadow = styles.get('boxShadow', 'none')
-    has_shadow = box_shadow != 'none' and not parent_has_shadow
-    bg_color = parse_color(styles.get('backgroundColor'))
-    border_radius_str = styles.get('borderRadius', '0px')
-    border_radius = parse_border_radius(border_radius_str, width, height)
+    x = int(table_info.x)
+    y = int(table_info.y)
+    width = int(table_info.width)
+    height = int(table_info.height)
+    styles = table_info.styles
+    style = resolve_style(styles)
+    has_shadow = style.has_shadow and not parent_has_shadow
+    bg_color = style.bg_color
+    border_radius = style.radius_ratio(width, height)
     has_radius = border_radius > 0
-    has_border = is_uniform_border(styles)
-    has_any_border_sides = has_any_border(styles)
+    has_border = style.uniform_border
+    has_any_border_sides = style.any_border
     try:
         if bg_color or has_border or has_any_border_sides or has_radius or has_shadow:
             add_bg_shape(slide, styles, x, y, width, height)
-        rows = table_info['rowCount']
-        cols = table_info['columnCount']
+        rows = table_info.row_count
+        cols = table_info.column_count
+        try:
+            tbl = build_table_xml(table_info, rows, cols, width, height)
+        except Exception:
+            tbl = None  # malformed table data, the per-cell path below reports it
+        if tbl is not None:
+            table_shape = slide.shapes.add_table(
+                1, 1, pixels_to_emu(x), pixels_to_emu(y), pixels_to_emu(width), pixels_to_emu(height))
+            placeholder_tbl = table_shape.table._tbl
+            placeholder_tbl.getparent().replace(placeholder_tbl, tbl)
+            # python-pptx resizes the frame to the sum of the rows and columns when they are set
+            table_shape.width = sum(gridCol.w for gridCol in tbl.tblGrid.gridCol_lst)
+            table_shape.height = sum(tr.h for tr in tbl.tr_lst)
+            return
         table_shape = slide.shapes.add_table(
             rows, cols, 
             pixels_to_emu(x), pixels_to_emu(y), 
@@ -651,11 +835,11 @@ def add_table_element(slide, element, slide_width, slide_height, parent_has_shad
         # Column widths
         total_html_width = 0
         col_html_widths = [0] * cols
-        for row_data in table_info['rows']:
+        for row_data in table_info.rows:
             cell_idx = 0
-            for cell_data in row_data['cells']:
-                cell_width = cell_data.get('rect', {}).get('width', 0)
-                col_span = cell_data.get('colSpan', 1)
+            for cell_data in row_data.cells:
+                cell_width = cell_data.width
+                col_span = cell_data.col_span
                 for _ in range(col_span):
                     col_html_widths[cell_idx] = max(col_html_widths[cell_idx], cell_width / col_span)
                     cell_idx += 1
@@ -664,20 +848,20 @@ def add_table_element(slide, element, slide_width, slide_height, parent_has_shad
             for col_idx in range(cols):
                 proportional_width = (col_html_widths[col_idx] / total_html_width) * width
                 table.columns[col_idx].width = pixels_to_emu(max(10, proportional_width))
-        for row_idx, row_data in enumerate(table_info['rows']):
-            table.rows[row_idx].height = pixels_to_emu(safe_float(row_data.get('rect').get('height', height / rows)))
-        for row_data in table_info['rows']:
-            row_index = row_data['index']
+        for row_idx, row_data in enumerate(table_info.rows):
+            table.rows[row_idx].height = pixels_to_emu(height / rows if row_data.height is None else row_data.height)
+        for row_data in table_info.rows:
+            row_index = row_data.index
             if row_index >= rows:
                 continue
-            row_bg_color = parse_color(row_data.get('styles', {}).get('backgroundColor'))
-            for cell_data in row_data['cells']:
-                cell_index = cell_data['cellIndex']
+            row_bg_color = parse_color(row_data.styles.get('backgroundColor'))
+            for cell_data in row_data.cells:
+                cell_index = cell_data.index
                 if cell_index >= cols:
                     continue
                 pptx_cell = table.cell(row_index, cell_index)
-                col_span = cell_data.get('colSpan', 1)
-                row_span = cell_data.get('rowSpan', 1)
+                col_span = cell_data.col_span
+                row_span = cell_data.row_span
                 if col_span > 1 or row_span > 1:
                     try:
                         end_row = min(rows - 1, row_index + row_span - 1)
@@ -688,12 +872,11 @@ def add_table_element(slide, element, slide_width, slide_height, parent_has_shad
                 text_frame = pptx_cell.text_frame
                 text_frame.word_wrap = True
                 text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
-                cell_styles = cell_data.get('styles', {})
-                text_frame.margin_left = pixels_to_emu(safe_float(cell_styles.get('paddingLeft', '8px').replace('px', '')))
-                text_frame.margin_right = pixels_to_emu(safe_float(cell_styles.get('paddingRight', '8px').replace('px', '')))
-                text_frame.margin_top = pixels_to_emu(safe_float(cell_styles.get('paddingTop', '8px').replace('px', '')))
-                text_frame.margin_bottom = pixels_to_emu(safe_float(cell_styles.get('paddingBottom', '8px').replace('px', '')))
-                bg_color_cell = parse_color(cell_styles.get('backgroundColor'))
+                cell_styles = cell_data.styles
+                cell_style = resolve_style(cell_styles)
+                (text_frame.margin_left, text_frame.margin_right,
+                 text_frame.margin_top, text_frame.margin_bottom) = cell_style.margins_emu(8)
+                bg_color_cell = cell_style.bg_color
                 if bg_color_cell:
                     pptx_cell.fill.solid()
                     pptx_cell.fill.fore_color.rgb = bg_color_cell
@@ -716,15 +899,15 @@ def add_table_element(slide, element, slide_width, slide_height, parent_has_shad
                 text_align = cell_styles.get('textAlign', 'left')
                 alignment = PP_ALIGN.CENTER if text_align == 'center' else PP_ALIGN.RIGHT if text_align == 'right' else PP_ALIGN.LEFT
                 p.alignment = alignment
-                if cell_data.get('inlineGroup') and cell_data['inlineGroup'].get('inlineElements'):
-                    for inline_element in cell_data['inlineGroup']['inlineElements']:
-                        if inline_element.get('type') == 'br':
+                if cell_data.inline_group and cell_data.inline_group.runs:
+                    for inline_element in cell_data.inline_group.runs:
+                        if inline_element.type == 'br':
                             if p is not None:
                                 p = text_frame.add_paragraph()
                                 p.alignment = alignment
                             first = True
                             continue
-                        element_text = inline_element.get('text', '')
+                        element_text = inline_element.text
                         if first:
                             element_text = element_text.lstrip()
                         if not element_text.strip():
@@ -732,7 +915,7 @@ def add_table_element(slide, element, slide_width, slide_height, parent_has_shad
                         first = False
                         run = p.add_run()
                         run.text = element_text
-                        inline_styles = inline_element.get('styles', {})
+                        inline_styles = inline_element.styles
                         font = run.font
                         font_size_px = safe_float(inline_styles.get('fontSize', '14').replace('px', ''))
                         font.name = inline_styles.get('fontFamily', 'Segoe UI').split(',')[0].strip('"\'')
@@ -748,7 +931,7 @@ def add_table_element(slide, element, slide_width, slide_height, parent_has_shad
                         last_run.text = last_run.text.rstrip()
                 else:
                     run = p.add_run()
-                    run.text = cell_data.get('text', '').strip()
+                    run.text = cell_data.text.strip()
                     font = run.font
                     font_size_px = safe_float(cell_styles.get('fontSize', '14').replace('px', ''))
                     font.name = cell_styles.get('fontFamily', 'Segoe UI').split(',')[0].strip('"\'')
@@ -761,65 +944,44 @@ def add_table_element(slide, element, slide_width, slide_height, parent_has_shad
     except Exception as e:
         print(f"Failed to add table: {e}")
 
-def add_image_element(slide, element, slide_width, slide_height, parent_has_shadow=False):
-    media_info = element.get('mediaInfo', {})
-    img_src = media_info.get('src', '')
-    styles = element.get('styles', {})
+def add_image_element(slide, element, slide_width, slide_height, parent_has_shadow=False, image_policy=None):
+    media_info = element.media_info
+    img_src = media_info.src if media_info else ''
+    styles = element.styles
     if not img_src:
         return
     # Use precise positioning from extraction
-    x = element.get('x', 0)
-    y = element.get('y', 0)
-    width = max(1, element.get('width', 100))
-    height = max(1, element.get('height', 100))
+    x = element.x
+    y = element.y
+    width = max(1, element.width)
+    height = max(1, element.height)
     
     # Ensure coordinates are within slide bounds
     x = max(0, min(x, slide_width - width))
     y = max(0, min(y, slide_height - height))
     
-    natural_width = media_info.get('naturalWidth', width)
-    border_radius_str = styles.get('borderRadius', '0px')
-    radius_ratio = parse_border_radius(border_radius_str, width, height)
-    radius_display = radius_ratio * min(width, height)
+    natural_width = width if media_info.natural_width is None else media_info.natural_width
+    style = resolve_style(styles)
+    border_radius = style.radius_ratio(width, height)
+    radius_display = border_radius * min(width, height)
     has_radius = radius_display > 0
-    box_shadow = styles.get('boxShadow', 'none')
-    has_shadow = box_shadow != 'none' and not parent_has_shadow
-    has_border = is_uniform_border(styles)
+    has_shadow = style.has_shadow and not parent_has_shadow
+    has_border = style.uniform_border
     
     try:
-        temp_path = None
-        if img_src.startswith('data:'):
-            _, data = img_src.split(',', 1)
-            img_data = base64.b64decode(data)
-            temp_path = 'temp_image.png'
-            with open(temp_path, 'wb') as f:
-                f.write(img_data)
-        elif img_src.startswith('http'):
-            response = requests.get(img_src, timeout=10)
-            if response.status_code == 200:
-                temp_path = 'temp_image.png'
-                with open(temp_path, 'wb') as f:
-                    f.write(response.content)
-            else:
-                print(f"Failed to download image: {img_src}")
-                return
-        else:
-            if os.path.exists(img_src):
-                temp_path = img_src
-            else:
-                print(f"Image file not found: {img_src}")
-                return
+        # Verified bytes come from the shared cache, downloads and decodes happen once per asset
+        img_data, img_hash = get_image_cache().get_image(img_src)
+        if img_data is None:
+            return
+        if image_policy is not None:
+            # Resample to the displayed size first so rounding works on the smaller image
+            img_data, img_hash, (natural_width, _) = image_policy.apply(img_data, img_hash, width, height)
         
-        with Image.open(temp_path) as img:
-            img.verify()
-        
-        image_to_add = temp_path
+        image_to_add = io.BytesIO(img_data)
         if has_radius:
             scale_x = natural_width / width if width > 0 else 1
             radius_natural = int(radius_display * scale_x)
-            temp_rounded = 'temp_rounded.png'
-            make_rounded_image(temp_path, temp_rounded, radius_natural)
-            image_to_add = temp_rounded
+            image_to_add = make_rounded_image(img_data, radius_natural, img_hash)
         
         # Add image with precise positioning
         picture = slide.shapes.add_picture(
@@ -827,10 +989,11 @@ def add_image_element(slide, element, slide_width, slide_height, parent_has_shad
             pixels_to_emu(x), pixels_to_emu(y),
             pixels_to_emu(width), pixels_to_emu(height)
         )
+        set_picture_name(picture, img_src)
         picture.shadow.inherit = False
         
-        # Handle borders and shadows
-        if has_border or has_radius or has_shadow:
+        # Handle borders and shadows; rounding alone is already in the image's alpha
+        if has_border or has_shadow:
             shape_type = MSO_SHAPE.ROUNDED_RECTANGLE if has_radius else MSO_SHAPE.RECTANGLE
             border_shape = slide.shapes.add_shape(
                 shape_type,
@@ -838,11 +1001,11 @@ def add_image_element(slide, element, slide_width, slide_height, parent_has_shad
                 pixels_to_emu(width), pixels_to_emu(height)
             )
             if has_radius:
-                border_shape.adjustments[0] = radius_ratio
+                border_shape.adjustments[0] = border_radius
             border_shape.fill.background()
             border_shape.shadow.inherit = False
             if has_shadow:
-                apply_shadow(border_shape, box_shadow)
+                apply_parsed_shadow(border_shape, style.shadow)
             if has_border:
                 border_width = safe_float(styles.get('borderTopWidth', '0px'))
                 border_color = parse_color(styles.get('borderTopColor'))
@@ -860,45 +1023,38 @@ def add_image_element(slide, element, slide_width, slide_height, parent_has_shad
             sp = border_shape._sp
             parent = sp.getparent()
             parent.remove(sp)
-            pic_sp = picture._sp
+            pic_sp = picture._element
             idx = list(parent).index(pic_sp)
             parent.insert(idx, sp)
         elif has_shadow:
-            apply_shadow(picture, box_shadow)
-        
-        # Clean up temporary files
-        if image_to_add != temp_path and os.path.exists(image_to_add):
-            os.remove(image_to_add)
-        if temp_path != img_src and os.path.exists(temp_path):
-            os.remove(temp_path)
+            apply_parsed_shadow(picture, style.shadow)
     except Exception as e:
         print(f"Failed to add image: {e}")
 
 def add_text_element(slide, element, slide_width, slide_height, parent_has_shadow=False):
     """Enhanced text element creation with precise positioning"""
-    text = element.get('text', '').strip()
+    text = element.text.strip()
     if not text:
         return
     
     # Use precise positioning
-    x = element.get('x', 0)
-    y = element.get('y', 0)
-    width = max(1, element.get('width', 100))
-    height = max(1, element.get('height', 100))
+    x = element.x
+    y = element.y
+    width = max(1, element.width)
+    height = max(1, element.height)
     
     # Ensure coordinates are within slide bounds
     x = max(0, min(x, slide_width - width))
     y = max(0, min(y, slide_height - height))
     
-    styles = element.get('styles', {})
-    box_shadow = styles.get('boxShadow', 'none')
-    has_shadow = box_shadow != 'none' and not parent_has_shadow
-    bg_color = parse_color(styles.get('backgroundColor'))
-    border_radius_str = styles.get('borderRadius', '0px')
-    border_radius = parse_border_radius(border_radius_str, width, height)
+    styles = element.styles
+    style = resolve_style(styles)
+    has_shadow = style.has_shadow and not parent_has_shadow
+    bg_color = style.bg_color
+    border_radius = style.radius_ratio(width, height)
     has_radius = border_radius > 0
-    has_border = is_uniform_border(styles)
-    has_any_border_sides = has_any_border(styles)
+    has_border = style.uniform_border
+    has_any_border_sides = style.any_border
     
     try:
         # Add background/border shapes first
@@ -927,10 +1083,8 @@ def add_text_element(slide, element, slide_width, slide_height, parent_has_shado
             text_frame.vertical_anchor = MSO_ANCHOR.TOP
         
         # Apply precise margins
-        text_frame.margin_left = pixels_to_emu(safe_float(styles.get('paddingLeft', '0px')))
-        text_frame.margin_right = pixels_to_emu(safe_float(styles.get('paddingRight', '0px')))
-        text_frame.margin_top = pixels_to_emu(safe_float(styles.get('paddingTop', '0px')))
-        text_frame.margin_bottom = pixels_to_emu(safe_float(styles.get('paddingBottom', '0px')))
+        (text_frame.margin_left, text_frame.margin_right,
+         text_frame.margin_top, text_frame.margin_bottom) = style.margins_emu()
         
         # Remove textbox styling
         textbox.fill.background()
@@ -969,19 +1123,19 @@ def add_text_element(slide, element, slide_width, slide_height, parent_has_shado
         print(f"Failed to add text: {e}")
 
 def get_parent(element, all_elements):
-    el_x = element.get('x', 0)
-    el_y = element.get('y', 0)
-    el_w = element.get('width', 0)
-    el_h = element.get('height', 0)
+    el_x = element.x
+    el_y = element.y
+    el_w = element.width
+    el_h = element.height
     el_rect = (el_x, el_y, el_x + el_w, el_y + el_h)
     potential_parents = []
     for other in all_elements:
         if other is element:
             continue
-        o_x = other.get('x', 0)
-        o_y = other.get('y', 0)
-        o_w = other.get('width', 0)
-        o_h = other.get('height', 0)
+        o_x = other.x
+        o_y = other.y
+        o_w = other.width
+        o_h = other.height
         o_rect = (o_x, o_y, o_x + o_w, o_y + o_h)
         if el_rect[0] >= o_rect[0] and el_rect[1] >= o_rect[1] and el_rect[2] <= o_rect[2] and el_rect[3] <= o_rect[3]:
             area = o_w * o_h
@@ -991,176 +1145,690 @@ def get_parent(element, all_elements):
         return potential_parents[0][1]
     return None
 
-def create_pptx_from_json(json_path, output_path=None):
-    """Enhanced PowerPoint generation with precise positioning"""
+def _element_rect(element):
+    x = element.x
+    y = element.y
+    return (x, y, x + element.width, y + element.height)
+
+def build_parent_map(elements, max_grid=256):
+    """Map id(element) -> smallest enclosing element, same result as get_parent.
+
+    Candidates are bucketed into a uniform grid once, in (area, order) so each
+    bucket is already sorted smallest-first; a lookup only scans the bucket
+    holding the element's top-left corner and stops at the first container.
+    """
+    parent_map = {}
+    if not elements:
+        return parent_map
+    rects = [_element_rect(el) for el in elements]
+    min_x = min(r[0] for r in rects)
+    min_y = min(r[1] for r in rects)
+    max_x = max(max(r[0], r[2]) for r in rects)
+    max_y = max(max(r[1], r[3]) for r in rects)
+    grid = max(1, min(max_grid, int(math.sqrt(len(elements)))))
+    cell_w = (max_x - min_x) / grid or 1
+    cell_h = (max_y - min_y) / grid or 1
+
+    def cell_x(v):
+        return min(grid - 1, max(0, int((v - min_x) / cell_w)))
+
+    def cell_y(v):
+        return min(grid - 1, max(0, int((v - min_y) / cell_h)))
+
+    # Ties on area keep the first element in input order, like the stable sort in get_parent
+    order = sorted(range(len(elements)), key=lambda i: (elements[i].width * elements[i].height, i))
+    buckets = {}
+    for i in order:
+        x1, y1, x2, y2 = rects[i]
+        for cx in range(cell_x(x1), cell_x(max(x1, x2)) + 1):
+            for cy in range(cell_y(y1), cell_y(max(y1, y2)) + 1):
+                buckets.setdefault((cx, cy), []).append(i)
+
+    for i, el in enumerate(elements):
+        ex1, ey1, ex2, ey2 = rects[i]
+        if ex2 < ex1 or ey2 < ey1:
+            # Inverted rects can sit outside the bucket of their corner, fall back to a full scan
+            candidates = order
+        else:
+            candidates = buckets.get((cell_x(ex1), cell_y(ey1)), ())
+        parent = None
+        for j in candidates:
+            if j == i:
+                continue
+            ox1, oy1, ox2, oy2 = rects[j]
+            if ex1 >= ox1 and ey1 >= oy1 and ex2 <= ox2 and ey2 <= oy2:
+                parent = elements[j]
+                break
+        parent_map[id(el)] = parent
+    return parent_map
+
+def build_child_map(elements, parent_map):
+    """Invert parent_map into id(parent) -> children, children kept in elements order"""
+    child_map = {}
+    for el in elements:
+        parent = parent_map.get(id(el))
+        if parent is not None:
+            child_map.setdefault(id(parent), []).append(el)
+    return child_map
+
+def iter_subtree(element, child_map, stop=None):
+    """Yield descendants of element depth-first, not descending below elements matching stop"""
+    stack = list(reversed(child_map.get(id(element), [])))
+    seen = {id(element)}
+    while stack:
+        child = stack.pop()
+        if id(child) in seen:
+            continue
+        seen.add(id(child))
+        yield child
+        if stop is not None and stop(child):
+            continue
+        stack.extend(reversed(child_map.get(id(child), [])))
+
+def is_child_container(element):
+    """.company and .footer divs render their img/span children themselves"""
+    if element.type != 'div':
+        return False
+    class_name = element.class_name
+    return 'company' in class_name or 'footer' in class_name
+
+# Enhanced sorting: separate background elements from content elements
+# Background elements (divs without content) should render first
+# Images and text should render last to stay on top
+def get_element_priority(element):
+    element_type = element.type
+    has_text = bool(element.text.strip())
+    has_inline_group = element.inline_group is not None
+    has_image = element_type == 'img'
+    has_table = element_type == 'table'
+    has_list = element_type in ['ul', 'ol']
+    
+    # Priority order (lower number = rendered first/behind)
+    if element_type == 'div' and not has_text and not has_inline_group:
+        return (0, element.z_index, element.y, element.x)  # Background divs first
+    elif has_list or has_table:
+        return (1, element.z_index, element.y, element.x)  # Lists and tables
+    elif has_text or has_inline_group:
+        return (2, element.z_index, element.y, element.x)  # Text elements
+    elif has_image:
+        return (3, element.z_index, element.y, element.x)  # Images on top
+    else:
+        return (1, element.z_index, element.y, element.x)  # Other elements
+
+def _box_rect(element):
+    """(left, top, right, bottom) of the box add_bg_shape draws for element"""
+    x = element.x
+    y = element.y
+    return (x, y, x + max(1, element.width), y + max(1, element.height))
+
+def _is_background_div(element):
+    """Divs and headings without text rendered by add_slide_from_data as a plain add_bg_shape"""
+    return (element.type in ['div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'] and
+            not element.text.strip() and not element.inline_group)
+
+def _opaque_box(style, rect):
+    """True if the shapes of style cover all of rect: a solid fill and square corners"""
+    return style.bg_color is not None and style.radius_ratio(rect[2] - rect[0], rect[3] - rect[1]) == 0
+
+def find_hidden_elements(elements_sorted, parent_map, slide_width, slide_height, grid=16):
+    """Occlusion pass over a slide's elements in render order.
+
+    Returns (hidden, slide_fill, shapes): the ids of background divs whose
+    box is covered by an opaque box painted later, or painted again later
+    with the same rect and styles, the color of a plain full-slide
+    background div painted first, which becomes the slide fill (its id is
+    in hidden too), and the number of shapes the hidden divs would have added.
+    Only background divs are dropped and only their bg shapes occlude, so
+    the parent lookups made on the full element list stay valid.
+    """
+    hidden = set()
+    shapes = 0
+    cell_w = max(1, slide_width) / grid
+    cell_h = max(1, slide_height) / grid
+
+    def cell(x, y):
+        return (min(grid - 1, max(0, int(x // cell_w))), min(grid - 1, max(0, int(y // cell_h))))
+
+    buckets = collections.defaultdict(list)  # grid cell -> opaque rects painted later
+    painted = set()  # (rect, style) of background boxes painted later
+    for element in reversed(elements_sorted):
+        if element.type == 'canvas':
+            continue
+        container = is_child_container(element)
+        parent = parent_map.get(id(element))
+        if not container and (not _is_background_div(element) or (parent and is_child_container(parent))):
+            continue
+        style = resolve_style(element.styles)
+        if not (style.any_border or style.bg_color or style.has_shadow):
+            continue
+        rect = _box_rect(element)
+        if not container and not style.has_shadow:
+            left, top, right, bottom = rect
+            if (rect, style) in painted or any(
+                    o[0] <= left and o[1] <= top and o[2] >= right and o[3] >= bottom
+                    for o in buckets.get(cell(left, top), ())):
+                hidden.add(id(element))
+                shapes += bg_shape_count(style, rect[2] - rect[0], rect[3] - rect[1])
+                continue
+        painted.add((rect, style))
+        if _opaque_box(style, rect):
+            first_x, first_y = cell(rect[0], rect[1])
+            last_x, last_y = cell(rect[2], rect[3])
+            for cx in range(first_x, last_x + 1):
+                for cy in range(first_y, last_y + 1):
+                    buckets[(cx, cy)].append(rect)
+
+    slide_fill = None
+    for element in elements_sorted:
+        if id(element) in hidden or element.type == 'canvas':
+            continue
+        parent = parent_map.get(id(element))
+        if parent and is_child_container(parent) and not is_child_container(element):
+            continue
+        style = resolve_style(element.styles)
+        background = _is_background_div(element) and not is_child_container(element)
+        if background and not (style.any_border or style.bg_color or style.has_shadow):
+            continue
+        rect = _box_rect(element)
+        if (background and
+                rect[0] <= 0 and rect[1] <= 0 and rect[2] >= slide_width and rect[3] >= slide_height and
+                _opaque_box(style, rect) and not style.any_border and not style.has_shadow):
+            hidden.add(id(element))
+            shapes += 1
+            slide_fill = style.bg_color
+        break
+    return hidden, slide_fill, shapes
+
+def add_blank_slide(prs, slide_record, slide_width, slide_height, layout=None, fill=None, cull_hidden=True):
+    """New slide of prs with the background of slide_record (a SlideRecord) and no elements.
+
+    With cull_hidden a slideStyles background that is a plain fill becomes
+    the slide fill instead of a full-slide shape. fill, the color of an
+    opaque element covering the slide, replaces both.
+    """
+    slide_layout = layout or prs.slide_layouts[6]  # Blank layout
+    slide = prs.slides.add_slide(slide_layout)
+    
+    # Add slide background styling
+    slide_styles = slide_record.styles
+    if slide_styles:
+        style = resolve_style(slide_styles)
+        if fill is not None:
+            render_stats['hidden_shapes'] += bg_shape_count(style, slide_width, slide_height)
+        elif (cull_hidden and style.bg_color is not None and not style.any_border and not style.has_shadow and
+                style.radius_ratio(slide_width, slide_height) == 0):
+            fill = style.bg_color
+            render_stats['hidden_shapes'] += 1
+        else:
+            add_bg_shape(slide, slide_styles, 0, 0, slide_width, slide_height)
+    
+    # Set slide background
+    slide.background.fill.solid()
+    slide.background.fill.fore_color.rgb = fill or parse_color('#ffffff') or RGBColor(255, 255, 255)
+    return slide
+
+def add_slide_from_data(prs, slide_data, slide_width, slide_height, image_policy=None, layout=None,
+                        paginate_tables=False, cull_hidden=True):
+    """Render one extracted slide dict as a new slide of prs, on layout (default: blank).
+
+    The slide is decoded once into element_records, which the handlers take.
+
+    With paginate_tables, tables taller than the slide continue on extra
+    slides added right after this one, see paginate_table.
+
+    With cull_hidden, background divs nobody can see are not drawn and a
+    full-slide one painted first becomes the slide fill, see
+    find_hidden_elements; the count is added to render_stats['hidden_shapes'].
+    """
+    slide_record = decode_slide(slide_data)
+    elements_sorted = sorted(slide_record.elements, key=get_element_priority)
+    
+    # Build parent hierarchy for shadow inheritance
+    parent_map = build_parent_map(elements_sorted)
+    child_map = build_child_map(elements_sorted, parent_map)
+    rendered = set()
+    hidden, slide_fill = set(), None
+    if cull_hidden:
+        hidden, slide_fill, hidden_shapes = find_hidden_elements(elements_sorted, parent_map, slide_width,
+                                                                 slide_height)
+        render_stats['hidden_shapes'] += hidden_shapes
+    
+    slide = add_blank_slide(prs, slide_record, slide_width, slide_height, layout, slide_fill, cull_hidden)
+    continued_tables = []
+    
+    # Process each element with enhanced positioning
+    for element in elements_sorted:
+        element_type = element.type
+        
+        if id(element) in rendered or id(element) in hidden:
+            continue
+
+        # --- Enhancement: handle .company and .footer children as separate elements ---
+        if is_child_container(element):
+            # Render background first
+            styles = element.styles
+            style = resolve_style(styles)
+            if style.any_border or style.bg_color or style.has_shadow:
+                add_bg_shape(slide, styles, element.x, element.y, max(1, element.width), max(1, element.height))
+            
+            # Then render children on top, nested containers render their own subtree
+            for child in iter_subtree(element, child_map, stop=is_child_container):
+                if id(child) in rendered:
+                    continue
+                if child.type == 'img':
+                    add_image_element(slide, child, slide_width, slide_height, image_policy=image_policy)
+                    rendered.add(id(child))
+                elif child.type == 'span':
+                    add_text_element(slide, child, slide_width, slide_height)
+                    rendered.add(id(child))
+            continue
+
+        if element_type == 'canvas':
+            continue
+            
+        # Skip child elements of company/footer divs as they're handled above
+        parent = parent_map.get(id(element))
+        if parent and is_child_container(parent):
+            continue
+        
+        parent_has_shadow = bool(parent and resolve_style(parent.styles).has_shadow)
+        
+        if element.inline_group:
+            add_inline_group_element(slide, element, slide_width, slide_height, parent_has_shadow)
+        elif element_type in ['ul', 'ol']:
+            add_list_element(slide, element, slide_width, slide_height, parent_has_shadow)
+        elif element_type == 'table':
+            pages = paginate_table(element, slide_height) if paginate_tables else [element]
+            add_table_element(slide, pages[0], slide_width, slide_height, parent_has_shadow)
+            continued_tables.extend(pages[1:])
+        elif element_type == 'img':
+            add_image_element(slide, element, slide_width, slide_height, parent_has_shadow, image_policy)
+        elif element_type == 'span':
+            add_text_element(slide, element, slide_width, slide_height, parent_has_shadow)
+        elif element_type in ['div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+            style = resolve_style(element.styles)
+            has_text = bool(element.text.strip())
+            if has_text or style.any_border or style.bg_color or style.has_shadow:
+                if has_text and not element.inline_group:
+                    add_text_element(slide, element, slide_width, slide_height, parent_has_shadow)
+                elif not has_text:
+                    add_bg_shape(slide, element.styles, element.x, element.y, max(1, element.width),
+                                 max(1, element.height))
+    for page in continued_tables:
+        continuation = add_blank_slide(prs, slide_record, slide_width, slide_height, layout, cull_hidden=cull_hidden)
+        add_table_element(continuation, page, slide_width, slide_height)
+    return slide
+
+def add_slide_from_cache(slide_cache, merger, options, prs, slide_data, slide_width, slide_height, image_policy=None,
+                         layout=None, paginate_tables=False, cull_hidden=True):
+    """add_slide_from_data through slide_cache: graft the slides cached for slide_data, or render and store them.
+
+    options are the render options that are not in the arguments (see
+    slide_cache_options). merger is a PresentationMerger of prs. Hits and
+    misses are added to render_stats.
+    """
+    image_cache = get_image_cache()
+    media_hashes = [image_cache.get_image(src)[1] for src in collect_image_sources([slide_data])]
+    key = slide_cache.slide_key(slide_data, media_hashes, [slide_width, slide_height, paginate_tables, cull_hidden]
+                                + options)
+    cached = slide_cache.get(key)
+    if cached is not None:
+        render_stats['slide_cache_hits'] += 1
+        for cSld, rels in cached:
+            merger.add_slide(layout or prs.slide_layouts[6], cSld, rels)
+        return
+    render_stats['slide_cache_misses'] += 1
+    slides_before = len(prs.slides)
+    add_slide_from_data(prs, slide_data, slide_width, slide_height, image_policy, layout, paginate_tables, cull_hidden)
+    slides = [prs.slides[i] for i in range(slides_before, len(prs.slides))]
+    for slide in slides:
+        merger.track_images(slide)
+    slide_cache.put(key, slides)
+
+def slide_cache_options(image_density=None, template=None):
+    """Render options of a deck that add_slide_from_cache keys on besides its own arguments"""
+    return [image_density, template_key(template)]
+
+def new_presentation(slide_width, slide_height, template=None):
+    """Empty presentation from the cached template with the given slide size in pixels"""
+    return template_cache.new_presentation(pixels_to_emu(slide_width), pixels_to_emu(slide_height), template)
+
+def render_slides_chunk(slides_data, slide_width, slide_height, image_density=None, template=None,
+                        paginate_tables=False, cull_hidden=True, slide_cache=False):
+    """Process pool entry point: render slides into a partial presentation.
+
+    Returns (pptx bytes, downsample stats, render_stats) for merging in the parent.
+    """
+    image_policy = DownsamplePolicy(image_density) if image_density else None
+    prs = new_presentation(slide_width, slide_height, template)
+    layout = template_cache.blank_layout(template)
+    template_slides = len(prs.slides)
+    render_stats.clear()
+    if slide_cache:
+        cache = get_slide_cache()
+        merger = PresentationMerger(prs)
+        options = slide_cache_options(image_density, template)
+    for slide_data in slides_data:
+        if slide_cache:
+            add_slide_from_cache(cache, merger, options, prs, slide_data, slide_width, slide_height, image_policy,
+                                 layout, paginate_tables, cull_hidden)
+        else:
+            add_slide_from_data(prs, slide_data, slide_width, slide_height, image_policy, layout, paginate_tables,
+                                cull_hidden)
+    resolve_style.clear()
+    if template_slides:
+        # The parent deck already starts with the template's slides, only ship the rendered ones
+        set_slide_order(prs, list(prs.slides)[template_slides:])
+    output = io.BytesIO()
+    prs.save(output)
+    return output.getvalue(), image_policy.stats() if image_policy else {}, dict(render_stats)
+
+def _chunked(slides_data, chunk_size):
+    chunk = []
+    for slide_data in slides_data:
+        chunk.append(slide_data)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def render_slides_parallel(prs, slides_data, slide_width, slide_height, workers, image_density=None,
+                           image_policy=None, chunk_size=DEFAULT_RENDER_CHUNK_SIZE, prefetch_workers=0,
+                           template=None, paginate_tables=False, cull_hidden=True, slide_cache=False):
+    """Render slides_data across a pool of worker processes and merge the partial decks into prs in order.
+
+    At most two chunks per worker are in flight, so slides can come from a
+    stream. With prefetch_workers set, each chunk's images are prefetched
+    into the shared disk cache before it is handed out. Returns the number
+    of slides added, None if a worker process died.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    image_cache = get_image_cache()
+    merger = PresentationMerger(prs)
+    slide_count = 0
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            slides_data = json.load(f)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = collections.deque()
+
+            def merge_next():
+                pptx_bytes, stats, counts = pending.popleft().result()
+                if image_policy is not None:
+                    image_policy.add_stats(stats)
+                render_stats.update(counts)
+                return merger.append(pptx_bytes)
+
+            for chunk in _chunked(slides_data, chunk_size):
+                if prefetch_workers:
+                    image_cache.prefetch(collect_image_sources(chunk), max_workers=prefetch_workers)
+                    image_cache.clear_prefetched()
+                pending.append(pool.submit(render_slides_chunk, chunk, slide_width, slide_height, image_density,
+                                           template, paginate_tables, cull_hidden, slide_cache))
+                if len(pending) >= workers * 2:
+                    slide_count += merge_next()
+            while pending:
+                slide_count += merge_next()
+    except BrokenProcessPool as e:
+        print(f"Error rendering slides: {e}")
+        return None
+    return slide_count
+
+def create_pptx_from_json(json_path, output_path=None, prefetch_workers=DEFAULT_PREFETCH_WORKERS, image_density=None,
+                          stream=False, render_workers=1, template=None, profile=None, paginate_tables=False,
+                          cull_hidden=True, slide_cache=False):
+    """Enhanced PowerPoint generation with precise positioning
+
+    All images of the deck are fetched up front by prefetch_workers threads
+    (0 disables the prefetch) so slide rendering never waits on the network.
+    With image_density set, images larger than their displayed size times
+    image_density are resampled before embedding.
+
+    With stream=True slides are parsed and rendered one at a time instead of
+    loading the whole JSON file, and images are prefetched per slide.
+
+    render_workers > 1 renders chunks of slides in that many processes and
+    merges them into one presentation, see render_slides_parallel.
+
+    template is a .pptx/.potx path to build on instead of the default
+    template; it is parsed once per process and cloned for every deck.
+
+    paginate_tables=True splits tables taller than the slide across
+    continuation slides that repeat the header rows.
+
+    cull_hidden=False draws background divs covered by opaque boxes painted
+    over them too, see find_hidden_elements.
+
+    slide_cache=True looks every slide up in the persistent slide cache
+    (see slide_cache) and only renders the misses, which are then stored.
+
+    profile is a path for a JSON render report (see render_profile); the
+    collapsed stacks for flame graphs are written next to it. Profiled
+    decks are rendered in this process.
+    """
+    if profile:
+        if render_workers > 1:
+            print("Profiling renders in this process, ignoring render_workers")
+        with render_profile.RenderProfiler() as profiler:
+            profiler.instrument(globals(), PROFILE_HOOKS)
+            create_pptx_from_json(json_path, output_path, prefetch_workers, image_density, stream, 1, template,
+                                  paginate_tables=paginate_tables, cull_hidden=cull_hidden, slide_cache=slide_cache)
+        render_profile.write_profile(profiler, profile)
+        return
+    try:
+        if stream:
+            slides_iter = iter(SlideStream(json_path))
+            first_slide = next(slides_iter, None)
+            slides_data = [] if first_slide is None else itertools.chain([first_slide], slides_iter)
+        else:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                slides_data = expand_document(json.load(f))
     except Exception as e:
         print(f"Error reading JSON file: {e}")
         return
+
+    if output_path is None:
+        base_name = os.path.splitext(os.path.basename(json_path))[0]
+        output_path = f"{base_name}_output.pptx"
+    create_pptx_from_slides(slides_data, output_path, prefetch_workers, image_density, stream, render_workers,
+                            template, paginate_tables, cull_hidden, slide_cache)
+
+def create_pptx_from_slides(slides_data, output_path, prefetch_workers=DEFAULT_PREFETCH_WORKERS, image_density=None,
+                            stream=False, render_workers=1, template=None, paginate_tables=False, cull_hidden=True,
+                            slide_cache=False):
+    """Render slide dicts to output_path, see create_pptx_from_json for the options.
+
+    With stream=True slides_data can be any iterable, such as a generator
+    yielding slides as they are extracted: each slide is rendered as soon as
+    it arrives and released afterwards. Otherwise it must be a list.
+    """
+    if stream:
+        slides_iter = iter(slides_data)
+        try:
+            first_slide = next(slides_iter, None)
+        except (OSError, SlideStreamError) as e:
+            print(f"Error reading JSON file: {e}")
+            return
+        slides_data = itertools.chain([first_slide], slides_iter)
+    else:
+        first_slide = slides_data[0] if slides_data else None
     
-    if not slides_data:
+    if first_slide is None:
         print("No slides found in JSON")
         return
     
+    image_cache = get_image_cache()
+    image_policy = DownsamplePolicy(image_density) if image_density else None
+    if prefetch_workers and not stream:
+        image_cache.prefetch(collect_image_sources(slides_data), max_workers=prefetch_workers)
+    
     # Get slide dimensions from first slide
-    first_slide = slides_data[0]
     slide_width = safe_int(first_slide.get('slideWidth', 1920))
     slide_height = safe_int(first_slide.get('slideHeight', 1080))
     
     # Create presentation with precise dimensions
-    prs = Presentation()
-    prs.slide_width = pixels_to_emu(slide_width)
-    prs.slide_height = pixels_to_emu(slide_height)
+    try:
+        prs = new_presentation(slide_width, slide_height, template)
+        layout = template_cache.blank_layout(template)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        print(f"Error loading template: {e}")
+        image_cache.clear_prefetched()
+        return
     
+    slide_count = 0
+    render_stats.clear()
+    try:
+        if render_workers > 1:
+            slide_count = render_slides_parallel(prs, slides_data, slide_width, slide_height, render_workers,
+                                                 image_density, image_policy,
+                                                 prefetch_workers=prefetch_workers if stream else 0,
+                                                 template=template, paginate_tables=paginate_tables,
+                                                 cull_hidden=cull_hidden, slide_cache=slide_cache)
+            if slide_count is None:
+                image_cache.clear_prefetched()
+                resolve_style.clear()
+                return
+        else:
+            if slide_cache:
+                cache = get_slide_cache()
+                merger = PresentationMerger(prs)
+                options = slide_cache_options(image_density, template)
+            slides_before = len(prs.slides)
+            for slide_data in slides_data:
+                if stream and prefetch_workers:
+                    image_cache.prefetch(collect_image_sources([slide_data]), max_workers=prefetch_workers)
+                if slide_cache:
+                    add_slide_from_cache(cache, merger, options, prs, slide_data, slide_width, slide_height,
+                                         image_policy, layout, paginate_tables, cull_hidden)
+                else:
+                    add_slide_from_data(prs, slide_data, slide_width, slide_height, image_policy, layout,
+                                        paginate_tables, cull_hidden)
+                # Paginated tables may have added continuation slides
+                slide_count = len(prs.slides) - slides_before
+                if stream:
+                    # Drop per-slide references so the parsed slide can be freed
+                    image_cache.clear_prefetched()
+                    resolve_style.clear()
+    except (OSError, SlideStreamError) as e:
+        print(f"Error reading JSON file: {e}")
+        image_cache.clear_prefetched()
+        resolve_style.clear()
+        return
+
+    try:
+        prs.save(output_path)
+        print(f"Presentation saved as '{output_path}' with {slide_count} slide(s)")
+        print(f"Slide dimensions: {slide_width}x{slide_height} pixels")
+        if image_policy is not None:
+            print(f"Downsampled {image_policy.images_resampled()} image(s), saved {image_policy.bytes_saved()} bytes")
+        if render_stats['hidden_shapes']:
+            print(f"Skipped {render_stats['hidden_shapes']} hidden background shape(s)")
+        if slide_cache:
+            hits, misses = render_stats['slide_cache_hits'], render_stats['slide_cache_misses']
+            print(f"Slide cache: {hits} hit(s), {misses} miss(es), "
+                  f"{hits / (hits + misses) if hits + misses else 0:.0%} hit rate")
+    except Exception as e:
+        print(f"Error saving presentation: {e}")
+    image_cache.clear_prefetched()
+    resolve_style.clear()
+
+def slide_hash(slide_data):
+    """Hash of a slide dict's canonical JSON, equal for slides that render the same"""
+    canonical = json.dumps(slide_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+def slide_span(slide_data, slide_height, paginate_tables=False):
+    """Number of slides add_slide_from_data adds for slide_data"""
+    if not paginate_tables:
+        return 1
+    return 1 + sum(len(paginate_table(element, slide_height)) - 1 for element in decode_slide(slide_data).elements
+                   if element.type == 'table')
+
+def update_pptx_from_json(json_path, previous_json_path, previous_pptx_path, output_path=None,
+                          prefetch_workers=DEFAULT_PREFETCH_WORKERS, image_density=None, paginate_tables=False,
+                          cull_hidden=True):
+    """Regenerate a deck by re-rendering only the slides that changed since a previous render.
+
+    previous_pptx_path must be the output of create_pptx_from_json (or of
+    this function) for previous_json_path with the same options. Slides of
+    json_path whose slide_hash matches a previous slide reuse that slide's
+    parts and media from the previous package, wherever the slide moved;
+    the others are rendered into it. Images are not re-fetched for reused
+    slides, so a changed image behind an unchanged URL or path needs a full
+    render. Falls back to create_pptx_from_json when the previous files do
+    not match each other or the slide size changed.
+    """
+    def render_all(reason):
+        print(f"{reason}, rendering every slide")
+        create_pptx_from_json(json_path, output_path, prefetch_workers, image_density,
+                              paginate_tables=paginate_tables, cull_hidden=cull_hidden)
+
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            slides_data = expand_document(json.load(f))
+    except Exception as e:
+        print(f"Error reading JSON file: {e}")
+        return
+    if not slides_data:
+        print("No slides found in JSON")
+        return
+    try:
+        with open(previous_json_path, 'r', encoding='utf-8') as f:
+            previous_data = expand_document(json.load(f))
+        prs = Presentation(previous_pptx_path)
+    except Exception as e:
+        render_all(f"Cannot reuse the previous render ({e})")
+        return
+
+    slide_width = safe_int(slides_data[0].get('slideWidth', 1920))
+    slide_height = safe_int(slides_data[0].get('slideHeight', 1080))
+    if (prs.slide_width, prs.slide_height) != (pixels_to_emu(slide_width), pixels_to_emu(slide_height)):
+        render_all("Slide size changed")
+        return
+    previous_slides = list(prs.slides)
+    runs = collections.defaultdict(collections.deque)  # slide_hash -> runs of previous slides
+    start = 0
+    for slide_data in previous_data:
+        span = slide_span(slide_data, slide_height, paginate_tables)
+        runs[slide_hash(slide_data)].append(previous_slides[start:start + span])
+        start += span
+    if start != len(previous_slides):
+        render_all(f"{previous_pptx_path} has {len(previous_slides)} slide(s), {previous_json_path} renders {start}")
+        return
+
+    plan = []  # (slide data, previous slides to reuse or None)
     for slide_data in slides_data:
-        slide_layout = prs.slide_layouts[6]  # Blank layout
-        slide = prs.slides.add_slide(slide_layout)
-        
-        # Set slide background
-        slide.background.fill.solid()
-        slide.background.fill.fore_color.rgb = parse_color('#ffffff') or RGBColor(255, 255, 255)
-        
-        # Add slide background styling
-        slide_styles = slide_data.get('slideStyles', {})
-        if slide_styles:
-            add_bg_shape(slide, slide_styles, 0, 0, slide_width, slide_height)
-        
-        elements = slide_data.get('elements', [])
-        
-        # Enhanced sorting: separate background elements from content elements
-        # Background elements (divs without content) should render first
-        # Images and text should render last to stay on top
-        def get_element_priority(element):
-            element_type = element.get('type', '').lower()
-            has_text = bool(element.get('text', '').strip())
-            has_inline_group = bool(element.get('inlineGroup'))
-            has_image = element_type == 'img'
-            has_table = element_type == 'table'
-            has_list = element_type in ['ul', 'ol']
-            
-            # Priority order (lower number = rendered first/behind)
-            if element_type == 'div' and not has_text and not has_inline_group:
-                return (0, element.get('zIndex', 0), element.get('y', 0), element.get('x', 0))  # Background divs first
-            elif has_list or has_table:
-                return (1, element.get('zIndex', 0), element.get('y', 0), element.get('x', 0))  # Lists and tables
-            elif has_text or has_inline_group:
-                return (2, element.get('zIndex', 0), element.get('y', 0), element.get('x', 0))  # Text elements
-            elif has_image:
-                return (3, element.get('zIndex', 0), element.get('y', 0), element.get('x', 0))  # Images on top
-            else:
-                return (1, element.get('zIndex', 0), element.get('y', 0), element.get('x', 0))  # Other elements
-        
-        elements_sorted = sorted(elements, key=get_element_priority)
-        
-        # Build parent hierarchy for shadow inheritance
-        parent_map = {}
-        for el in elements_sorted:
-            parent = get_parent(el, elements_sorted)
-            parent_map[id(el)] = parent
-        
-        # Process each element with enhanced positioning
-        for element in elements_sorted:
-            element_type = element.get('type', '').lower()
-            
-            # --- Enhancement: handle .company and .footer children as separate elements ---
-            if element_type == 'div' and 'company' in element.get('className', ''):
-                # Find and render background first, then children
-                # Render background div if it has styling
-                styles = element.get('styles', {})
-                if (has_any_border(styles) or 
-                    parse_color(styles.get('backgroundColor')) or
-                    styles.get('boxShadow', 'none') != 'none'):
-                    x = element.get('x', 0)
-                    y = element.get('y', 0)
-                    width = max(1, element.get('width', 100))
-                    height = max(1, element.get('height', 100))
-                    add_bg_shape(slide, styles, x, y, width, height)
-                
-                # Then render children on top
-                for child in elements_sorted:
-                    child_x = child.get('x', 0)
-                    child_y = child.get('y', 0)
-                    elem_x = element.get('x', 0)
-                    elem_y = element.get('y', 0)
-                    
-                    # Check if child is within this element's bounds
-                    if (child_x >= elem_x and child_y >= elem_y and
-                        child_x < elem_x + element.get('width', 0) and
-                        child_y < elem_y + element.get('height', 0)):
-                        
-                        if child.get('type') == 'img':
-                            add_image_element(slide, child, slide_width, slide_height)
-                        elif child.get('type') == 'span':
-                            add_text_element(slide, child, slide_width, slide_height)
-                continue
-                
-            if element_type == 'div' and 'footer' in element.get('className', ''):
-                # Render background first
-                styles = element.get('styles', {})
-                if (has_any_border(styles) or 
-                    parse_color(styles.get('backgroundColor')) or
-                    styles.get('boxShadow', 'none') != 'none'):
-                    x = element.get('x', 0)
-                    y = element.get('y', 0)
-                    width = max(1, element.get('width', 100))
-                    height = max(1, element.get('height', 100))
-                    add_bg_shape(slide, styles, x, y, width, height)
-                
-                # Then render children on top
-                elem_y = element.get('y', 0)
-                for child in elements_sorted:
-                    if child.get('y', 0) >= elem_y:
-                        if child.get('type') == 'img':
-                            add_image_element(slide, child, slide_width, slide_height)
-                        elif child.get('type') == 'span':
-                            add_text_element(slide, child, slide_width, slide_height)
-                continue
+        previous = runs.get(slide_hash(slide_data))
+        plan.append((slide_data, previous.popleft() if previous else None))
+    changed = [slide_data for slide_data, run in plan if run is None]
+    image_cache = get_image_cache()
+    image_policy = DownsamplePolicy(image_density) if image_density else None
+    if prefetch_workers and changed:
+        image_cache.prefetch(collect_image_sources(changed), max_workers=prefetch_workers)
+    layout = previous_slides[0].slide_layout if previous_slides else None
+    render_stats.clear()
+    slides = []
+    for slide_data, run in plan:
+        if run is None:
+            slides_before = len(prs.slides)
+            add_slide_from_data(prs, slide_data, slide_width, slide_height, image_policy, layout, paginate_tables,
+                                cull_hidden)
+            run = [prs.slides[i] for i in range(slides_before, len(prs.slides))]
+        slides.extend(run)
+    set_slide_order(prs, slides)
 
-            if element_type == 'canvas':
-                continue
-                
-            # Skip child elements of company/footer divs as they're handled above
-            parent = parent_map.get(id(element))
-            if parent and ('company' in parent.get('className', '') or 'footer' in parent.get('className', '')):
-                continue
-            
-            parent_has_shadow = bool(parent and parent.get('styles', {}).get('boxShadow', 'none') != 'none')
-            
-            if element.get('inlineGroup'):
-                add_inline_group_element(slide, element, slide_width, slide_height, parent_has_shadow)
-            elif element_type in ['ul', 'ol']:
-                add_list_element(slide, element, slide_width, slide_height, parent_has_shadow)
-            elif element_type == 'table':
-                add_table_element(slide, element, slide_width, slide_height, parent_has_shadow)
-            elif element_type == 'img':
-                add_image_element(slide, element, slide_width, slide_height, parent_has_shadow)
-            elif element_type == 'span':
-                add_text_element(slide, element, slide_width, slide_height, parent_has_shadow)
-            elif element_type in ['div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                if (element.get('text', '').strip() or
-                    has_any_border(element.get('styles', {})) or
-                    parse_color(element.get('styles', {}).get('backgroundColor')) or
-                    element.get('styles', {}).get('boxShadow', 'none') != 'none'):
-                    if element.get('text', '').strip() and not element.get('inlineGroup'):
-                        add_text_element(slide, element, slide_width, slide_height, parent_has_shadow)
-                    elif not element.get('text', '').strip():
-                        x = element.get('x', 0)
-                        y = element.get('y', 0)
-                        width = max(1, element.get('width', 100))
-                        height = max(1, element.get('height', 100))
-                        add_bg_shape(slide, element.get('styles', {}), x, y, width, height)
-    
     if output_path is None:
         base_name = os.path.splitext(os.path.basename(json_path))[0]
         output_path = f"{base_name}_output.pptx"
     try:
         prs.save(output_path)
-        print(f"Presentation saved as '{output_path}' with {len(slides_data)} slide(s)")
-        print(f"Slide dimensions: {slide_width}x{slide_height} pixels")
+        print(f"Presentation saved as '{output_path}' with {len(slides)} slide(s)")
+        print(f"Re-rendered {len(changed)} of {len(slides_data)} slide(s), reused {len(slides_data) - len(changed)}")
     except Exception as e:
         print(f"Error saving presentation: {e}")
+    image_cache.clear_prefetched()
+    resolve_style.clear()
 
 if __name__ == "__main__":
     create_pptx_from_json('slides_data.json', 'output.pptx')
\ No newline at end of file
@@ -0,0 +1,146 @@
+import copy
+import io
+
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+from pptx.parts.image import Image, ImagePart
+
+# Attributes in slide XML that point at one of the slide's relationships
+REL_ATTRS = (qn('r:embed'), qn('r:link'), qn('r:id'), qn('r:pict'))
+BLANK_LAYOUT_INDEX = 6
+
+def _rid_number(rId):
+    digits = rId[3:] if rId.startswith('rId') else ''
+    return int(digits) if digits.isdigit() else 0
+
+def _find_layout(prs, name):
+    """Layout of prs with the given name, else the blank layout"""
+    for layout in prs.slide_layouts:
+        if layout.name == name:
+            return layout
+    return prs.slide_layouts[BLANK_LAYOUT_INDEX]
+
+class PresentationMerger:
+    """Appends slides of other presentations to prs.
+
+    Copies each slide's shape tree and background and re-creates its image
+    and external relationships in prs. Images are looked up by SHA1 in a map
+    kept across calls, so media shared between slides is embedded once without
+    python-pptx rescanning the whole package for every picture. Other
+    relationship types are not produced by the generators and are skipped.
+    """
+
+    def __init__(self, prs):
+        self.prs = prs
+        self._layouts = {}  # source layout name -> layout of prs
+        self._package = prs.part.package
+        self._image_parts = {part.sha1: part for part in self._package.iter_parts() if isinstance(part, ImagePart)}
+
+    def _image_part(self, sha1, blob):
+        image_part = self._image_parts.get(sha1)
+        if image_part is None:
+            image_part = ImagePart.new(self._package, Image.from_blob(blob))
+            self._image_parts[sha1] = image_part
+        return image_part
+
+    def track_images(self, slide):
+        """Reuse the images of slide, added to prs without the merger, for slides merged later"""
+        for rel in slide.part.rels.values():
+            if not rel.is_external and rel.reltype == RT.IMAGE:
+                self._image_parts.setdefault(rel.target_part.sha1, rel.target_part)
+
+    def layout(self, name):
+        """Layout of prs with the given name, else the blank layout"""
+        layout = self._layouts.get(name)
+        if layout is None:
+            layout = self._layouts[name] = _find_layout(self.prs, name)
+        return layout
+
+    def add_slide(self, layout, cSld, rels):
+        """Append a slide on layout with the shapes and background of cSld, returns the new slide.
+
+        cSld is a p:cSld element the slide takes its children from. rels are
+        (rId, reltype, target) for the rIds used in it, target being the URL
+        of an external relationship or (sha1, blob) of an image.
+        """
+        slide = self.prs.slides.add_slide(layout)
+        rId_map = {}
+        for rId, reltype, target in sorted(rels, key=lambda rel: _rid_number(rel[0])):
+            if isinstance(target, str):
+                new_rId = slide.part.relate_to(target, reltype, is_external=True)
+            else:
+                new_rId = slide.part.relate_to(self._image_part(*target), RT.IMAGE)
+            if new_rId != rId:
+                rId_map[rId] = new_rId
+
+        slide_cSld = slide._element.cSld
+        if slide_cSld.bg is not None:
+            slide_cSld.remove(slide_cSld.bg)
+        slide_cSld.replace(slide_cSld.spTree, cSld.spTree)
+        if cSld.bg is not None:
+            slide_cSld.insert(0, cSld.bg)
+
+        # Slides rendered the same way get the same rIds, only rewrite when they moved
+        if rId_map:
+            for element in slide_cSld.iter():
+                for attr in REL_ATTRS:
+                    rId = element.get(attr)
+                    if rId is not None and rId in rId_map:
+                        element.set(attr, rId_map[rId])
+        return slide
+
+    def copy_slide(self, source_slide):
+        """Append a copy of source_slide, a slide of another presentation, returns the new slide"""
+        return self.add_slide(self.layout(source_slide.slide_layout.name), copy.deepcopy(source_slide._element.cSld),
+                              slide_relationships(source_slide))
+
+    def append(self, source):
+        """Append every slide of source (a Presentation, path or pptx bytes), returns the slide count"""
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        if not hasattr(source, 'slides'):
+            source = Presentation(source)
+        count = 0
+        for source_slide in source.slides:
+            self.copy_slide(source_slide)
+            count += 1
+        return count
+
+def slide_relationships(slide):
+    """(rId, reltype, target) of slide's image and external relationships, as PresentationMerger.add_slide takes them"""
+    rels = []
+    for rId, rel in slide.part.rels.items():
+        if rel.reltype == RT.SLIDE_LAYOUT:
+            continue
+        if rel.is_external:
+            rels.append((rId, rel.reltype, rel.target_ref))
+        elif rel.reltype == RT.IMAGE:
+            rels.append((rId, rel.reltype, (rel.target_part.sha1, rel.target_part.blob)))
+        else:
+            print(f"Skipping unsupported slide relationship: {rel.reltype}")
+    return rels
+
+def append_presentation(prs, source):
+    """Append every slide of source (a Presentation, path or pptx bytes) to prs, returns the slide count"""
+    return PresentationMerger(prs).append(source)
+
+def set_slide_order(prs, slides):
+    """Make slides, slides of prs, the slide list of prs in that order.
+
+    Slides left out are dropped from the presentation, and with them any
+    image only they used, since saving only writes parts still related.
+    """
+    slide_rIds = {rel.target_part: rId for rId, rel in prs.part.rels.items() if rel.reltype == RT.SLIDE}
+    sldIdLst = prs.slides._sldIdLst
+    sldIds = {sldId.rId: sldId for sldId in sldIdLst.sldId_lst}
+    for sldId in sldIds.values():
+        sldIdLst.remove(sldId)
+    kept = set()
+    for slide in slides:
+        rId = slide_rIds[slide.part]
+        sldIdLst.append(sldIds[rId])
+        kept.add(rId)
+    for rId in sldIds:
+        if rId not in kept:
+            prs.part.drop_rel(rId)
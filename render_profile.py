@@ -0,0 +1,233 @@
+"""Opt-in profiling of the render pipeline.
+
+A RenderProfiler swaps the named functions of a generator module, the
+image cache and Presentation.save for timing wrappers while it is active
+and puts the originals back afterwards, so rendering without a profiler
+runs the plain functions. Calls made on other threads, such as the image
+prefetch pool, pass through untimed.
+
+The report records, per handler: calls, inclusive and self wall time, and
+shapes added to the slide it was given. It also lists the slowest slides
+and the slowest top-level element handler (add_*_element) calls. The collapsed stacks
+(one "a;b;c microseconds" line per call path, self time) can be fed to
+flamegraph.pl or speedscope.
+"""
+import heapq
+import json
+import os
+import threading
+import time
+
+# Function of the generator modules that renders one slide; its calls become the per-slide records
+SLIDE_HANDLER = 'add_slide_from_data'
+IMAGE_CACHE_HOOKS = ('get_image', 'prefetch')
+DEFAULT_TOP_N = 20
+ELEMENT_TEXT_CHARS = 60
+
+def _shape_count(obj):
+    shapes = getattr(obj, 'shapes', None)
+    return len(shapes._spTree) if shapes is not None else None
+
+def _is_element_handler(name):
+    return name.startswith('add_') and name.endswith('_element')
+
+def _element_summary(element):
+    """Report fields of an element record (element_records.ElementRecord), named as in the extraction JSON"""
+    summary = {key: getattr(element, key) for key in ('type', 'x', 'y', 'width', 'height')}
+    if element.class_name:
+        summary['className'] = element.class_name
+    if element.text:
+        summary['text'] = element.text[:ELEMENT_TEXT_CHARS]
+    if element.table_info:
+        summary['tableInfo'] = {'rowCount': element.table_info.row_count,
+                                'columnCount': element.table_info.column_count}
+    if element.list_info:
+        summary['listInfo'] = {'type': 'ol' if element.list_info.ordered else 'ul'}
+    return summary
+
+class RenderProfiler:
+    """Context manager timing the instrumented handlers while active.
+
+    Only one profiler can be active at a time.
+    """
+
+    def __init__(self, top_n=DEFAULT_TOP_N):
+        self.top_n = top_n
+        self.handlers = {}  # name -> [calls, seconds, self seconds, shapes]
+        self.stacks = {}  # tuple of names -> self seconds
+        self.slides = []  # heap of (seconds, sequence, record)
+        self.elements = []  # heap of (seconds, sequence, record)
+        self.slide_count = 0
+        self.total_seconds = 0.0
+        self._frames = []  # [name, child seconds] of the calls in progress
+        self._patched = []  # (target, name, original)
+        self._thread = None
+        self._start = None
+        self._sequence = 0
+
+    def instrument(self, target, names):
+        """Wrap functions names of target, a module namespace dict or a class"""
+        for name in names:
+            if isinstance(target, dict):
+                original = target.get(name)
+            else:
+                original = target.__dict__.get(name)
+            if original is None or not callable(original):
+                continue
+            wrapper = self._wrap(name, original)
+            if isinstance(target, dict):
+                target[name] = wrapper
+            else:
+                setattr(target, name, wrapper)
+            self._patched.append((target, name, original))
+        return self
+
+    def restore(self):
+        for target, name, original in reversed(self._patched):
+            if isinstance(target, dict):
+                target[name] = original
+            else:
+                setattr(target, name, original)
+        self._patched.clear()
+
+    def _wrap(self, name, func):
+        profiler = self
+
+        def wrapper(*args, **kwargs):
+            if threading.get_ident() != profiler._thread:
+                return func(*args, **kwargs)
+            return profiler._call(name, func, args, kwargs)
+
+        wrapper.__name__ = getattr(func, '__name__', name)
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def _call(self, name, func, args, kwargs):
+        slide = args[0] if args else None
+        shapes_before = _shape_count(slide)
+        parent = self._frames[-1][0] if self._frames else None
+        frame = [name, 0.0]
+        self._frames.append(frame)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            stack = tuple(f[0] for f in self._frames)
+            self._frames.pop()
+            if self._frames:
+                self._frames[-1][1] += seconds
+            self._record(name, stack, seconds, frame[1])
+        if shapes_before is not None:
+            shapes = _shape_count(slide) - shapes_before
+        elif name == SLIDE_HANDLER:
+            shapes = _shape_count(result) or 0
+        else:
+            shapes = 0
+        self.handlers[name][3] += shapes
+        if name == SLIDE_HANDLER:
+            slide_data = args[1] if len(args) > 1 else {}
+            self._push(self.slides, {'index': self.slide_count, 'seconds': seconds, 'shapes': shapes,
+                                     'elements': len(slide_data.get('elements', []))})
+            self.slide_count += 1
+        elif parent == SLIDE_HANDLER and _is_element_handler(name) and len(args) > 1:
+            self._push(self.elements, dict(_element_summary(args[1]), slide=self.slide_count, handler=name,
+                                           seconds=seconds, shapes=shapes))
+        return result
+
+    def _record(self, name, stack, seconds, child_seconds):
+        stats = self.handlers.get(name)
+        if stats is None:
+            stats = self.handlers[name] = [0, 0.0, 0.0, 0]
+        stats[0] += 1
+        # Recursive calls are already inside the outer call's time
+        if name not in stack[:-1]:
+            stats[1] += seconds
+        stats[2] += seconds - child_seconds
+        self.stacks[stack] = self.stacks.get(stack, 0.0) + seconds - child_seconds
+
+    def _push(self, heap, record):
+        self._sequence += 1
+        entry = (record['seconds'], self._sequence, record)
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, entry)
+        elif entry[0] > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+
+    def __enter__(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("a RenderProfiler is already active")
+        from pptx.presentation import Presentation
+        import asset_cache
+        self.instrument(asset_cache.ImageCache, IMAGE_CACHE_HOOKS)
+        self.instrument(Presentation, ('save',))
+        self._thread = threading.get_ident()
+        self._start = time.perf_counter()
+        _active = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active
+        self.total_seconds = time.perf_counter() - self._start
+        _active = None
+        self.restore()
+        return False
+
+    def report(self):
+        """The profile as a JSON-serializable dict"""
+        handlers = {name: {'calls': calls, 'seconds': seconds, 'self_seconds': self_seconds, 'shapes': shapes}
+                    for name, (calls, seconds, self_seconds, shapes)
+                    in sorted(self.handlers.items(), key=lambda item: -item[1][2])}
+        slide_seconds = self.handlers.get(SLIDE_HANDLER, [0, 0.0])[1]
+        return {
+            'total_seconds': self.total_seconds,
+            'slides': self.slide_count,
+            'slide_seconds': slide_seconds,
+            'handlers': handlers,
+            'slowest_slides': [record for _, _, record in sorted(self.slides, reverse=True)],
+            'slowest_elements': [record for _, _, record in sorted(self.elements, reverse=True)],
+        }
+
+    def collapsed_stacks(self):
+        """Lines of "frame;frame;frame microseconds", self time per call path"""
+        return [f"{';'.join(stack)} {round(seconds * 1e6)}"
+                for stack, seconds in sorted(self.stacks.items()) if round(seconds * 1e6) > 0]
+
+    def write(self, report_path):
+        """Write the JSON report and the collapsed stacks, returns the stacks path"""
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        stacks_path = os.path.splitext(report_path)[0] + '.folded'
+        with open(stacks_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.collapsed_stacks()) + '\n')
+        return stacks_path
+
+    def summary(self, limit=5):
+        """A few lines for the console: total, top handlers by self time, slowest slides"""
+        report = self.report()
+        lines = [f"Profiled {self.slide_count} slide(s) in {self.total_seconds:.3f} s"]
+        for name, stats in list(report['handlers'].items())[:limit]:
+            lines.append(f"  {name}: {stats['calls']} call(s), {stats['self_seconds']:.3f} s self, "
+                         f"{stats['seconds']:.3f} s total, {stats['shapes']} shape(s)")
+        for record in report['slowest_slides'][:limit]:
+            lines.append(f"  slide {record['index'] + 1}: {record['seconds']:.3f} s, "
+                         f"{record['elements']} element(s), {record['shapes']} shape(s)")
+        return lines
+
+_active = None
+
+def write_profile(profiler, report_path):
+    """Print the profiler's summary and write its report and collapsed stacks"""
+    for line in profiler.summary():
+        print(line)
+    try:
+        stacks_path = profiler.write(report_path)
+        print(f"Render profile written to '{report_path}', collapsed stacks to '{stacks_path}'")
+    except OSError as e:
+        print(f"Error writing render profile: {e}")
+
+def active_profiler():
+    """The RenderProfiler currently timing the pipeline, or None"""
+    return _active
@@ -1,15 +1,45 @@
+import io
 import json
-import base64
-from pptx import Presentation
 from pptx.util import Pt, Inches
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE, MSO_CONNECTOR
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.dml import MSO_LINE
-import requests
-from PIL import Image
 import os
 import re
+import zipfile
+from asset_cache import DEFAULT_PREFETCH_WORKERS, collect_image_sources, get_image_cache, set_picture_name
+from element_records import decode_slide
+from image_ops import DownsamplePolicy
+import render_profile
+from slide_stream import SlideStream, SlideStreamError, expand_document
+import template_cache
+from style_resolver import StyleInterner
+import functools
+
+NUMBER_RE = re.compile(r'[\d.]+')
+INTEGER_RE = re.compile(r'\d+')
+BORDER_RE = re.compile(r'(\d*\.?\d*)px\s+(\w+)\s+(.+)')
+NAMED_COLORS = {
+    'black': RGBColor(0, 0, 0),
+    'white': RGBColor(255, 255, 255),
+    'red': RGBColor(255, 0, 0),
+    'green': RGBColor(0, 128, 0),
+    'blue': RGBColor(0, 0, 255),
+    'yellow': RGBColor(255, 255, 0),
+    'gray': RGBColor(128, 128, 128),
+    'grey': RGBColor(128, 128, 128),
+}
+ALIGNMENT_MAP = {
+    'left': PP_ALIGN.LEFT,
+    'center': PP_ALIGN.CENTER,
+    'right': PP_ALIGN.RIGHT,
+    'justify': PP_ALIGN.JUSTIFY
+}
+
+# Functions timed when create_pptx_from_json is called with profile set
+PROFILE_HOOKS = ('add_slide_from_data', 'add_separator_element', 'add_text_element', 'add_shape_element',
+                 'add_image_element')
 
 # Base slide sizes
 BASE_SIZES = {
@@ -24,7 +54,7 @@ def safe_int_conversion(value, default=0):
         return default
     try:
         if isinstance(value, str):
-            numeric_part = re.search(r'[\d.]+', value)
+            numeric_part = NUMBER_RE.search(value)
             if numeric_part:
                 return int(float(numeric_part.group()))
         return int(float(value))
@@ -36,7 +66,7 @@ def safe_float_conversion(value, default=0.0):
         return default
     try:
         if isinstance(value, str):
-            numeric_part = re.search(r'[\d.]+', value)
+            numeric_part = NUMBER_RE.search(value)
             if numeric_part:
                 return float(numeric_part.group())
         return float(value)
@@ -100,27 +130,37 @@ def calculate_optimal_slide_size(content_width, content_height, base_size='1080p
     print(f"Selected slide size: {size_name} ({final_width}x{final_height})")
     return final_width, final_height, size_name
 
-def center_content_on_slide(slides_data, slide_width, slide_height, content_width, content_height, padding=20):
-    """Center content on the slide, ensuring at least the specified padding on all sides."""
+def content_offset(slide_width, slide_height, content_width, content_height, padding=20):
+    """Offset that centers the content on the slide with at least padding on all sides."""
     offset_x = max(padding, (slide_width - content_width - padding * 2) // 2 + padding)
     offset_y = max(padding, (slide_height - content_height - padding * 2) // 2 + padding)
     
     if offset_x > padding or offset_y > padding:
         print(f"Centering content with offset: ({offset_x}, {offset_y})")
+    return offset_x, offset_y
+
+def shift_slide(slide_info, offset_x, offset_y):
+    for element in slide_info.get('elements', []):
+        element['x'] = element.get('x', 0) + offset_x
+        element['y'] = element.get('y', 0) + offset_y
+    return slide_info
+
+def center_content_on_slide(slides_data, slide_width, slide_height, content_width, content_height, padding=20):
+    """Center content on the slide, ensuring at least the specified padding on all sides."""
+    offset_x, offset_y = content_offset(slide_width, slide_height, content_width, content_height, padding)
     
     for slide_info in slides_data:
-        for element in slide_info.get('elements', []):
-            element['x'] = element.get('x', 0) + offset_x
-            element['y'] = element.get('y', 0) + offset_y
+        shift_slide(slide_info, offset_x, offset_y)
     
     return slides_data
 
+@functools.lru_cache(maxsize=4096)
 def parse_color(color_str):
     if not color_str or color_str in ['transparent', 'rgba(0, 0, 0, 0)']:
         return None
     
     if color_str.startswith('rgb'):
-        color_values = re.findall(r'\d+', color_str)
+        color_values = INTEGER_RE.findall(color_str)
         if len(color_values) >= 3:
             return RGBColor(int(color_values[0]), int(color_values[1]), int(color_values[2]))
     
@@ -131,18 +171,7 @@ def parse_color(color_str):
         elif len(color_str) == 3:
             return RGBColor(int(color_str[0]*2, 16), int(color_str[1]*2, 16), int(color_str[2]*2, 16))
     
-    named_colors = {
-        'black': RGBColor(0, 0, 0),
-        'white': RGBColor(255, 255, 255),
-        'red': RGBColor(255, 0, 0),
-        'green': RGBColor(0, 128, 0),
-        'blue': RGBColor(0, 0, 255),
-        'yellow': RGBColor(255, 255, 0),
-        'gray': RGBColor(128, 128, 128),
-        'grey': RGBColor(128, 128, 128),
-    }
-    
-    return named_colors.get(color_str.lower())
+    return NAMED_COLORS.get(color_str.lower())
 
 def parse_border(styles):
     if not styles.get('border') or styles['border'] == 'none':
@@ -164,7 +193,7 @@ def parse_border(styles):
                 border_color = parse_color(part)
 
         if not (border_width > 0 and border_style and border_color):
-            match = re.match(r'(\d*\.?\d*)px\s+(\w+)\s+(.+)', border_str)
+            match = BORDER_RE.match(border_str)
             if match:
                 border_width = safe_float_conversion(match.group(1))
                 border_style = match.group(2)
@@ -180,7 +209,7 @@ def parse_border_radius(radius_str, shape_width, shape_height):
         return 0
     
     try:
-        match = re.search(r'[\d.]+', radius_str)
+        match = NUMBER_RE.search(radius_str)
         if match:
             radius_px = float(match.group())
             min_dimension = min(shape_width, shape_height)
@@ -189,6 +218,50 @@ def parse_border_radius(radius_str, shape_width, shape_height):
     except (ValueError, TypeError):
         return 0
 
+class ShapeStyle:
+    """Styles of a single-slide element parsed once; interned by content through resolve_shape_style.
+
+    text_color is parsed on first use, so a bad color on a shape without
+    text doesn't stop the shape from rendering.
+    """
+    __slots__ = ('bg_color', 'border', 'padding', 'font_size_px', 'font_name', 'bold', 'italic',
+                 '_color', '_text_color', 'alignment', 'vertical_anchor', 'line_height')
+
+    def __init__(self, styles):
+        self.bg_color = parse_color(styles.get('backgroundColor'))
+        self.border = parse_border(styles)
+        # (top, right, bottom, left) in pixels
+        self.padding = tuple(safe_int_conversion(styles.get(key, '0').replace('px', ''))
+                             for key in ('paddingTop', 'paddingRight', 'paddingBottom', 'paddingLeft'))
+        self.font_size_px = safe_float_conversion(styles.get('fontSize', '12').replace('px', ''))
+        font_family = styles.get('fontFamily', 'Arial')
+        if font_family and ',' in font_family:
+            font_family = font_family.split(',')[0].strip()
+        self.font_name = font_family or None
+        font_weight = styles.get('fontWeight', 'normal')
+        self.bold = font_weight == 'bold' or safe_int_conversion(font_weight) >= 700
+        self.italic = styles.get('fontStyle') == 'italic'
+        self._color = styles.get('color', 'black')
+        self._text_color = None
+        self.alignment = ALIGNMENT_MAP.get(styles.get('textAlign', 'center'), PP_ALIGN.CENTER)
+        vertical_align = styles.get('verticalAlign', 'middle')
+        if vertical_align in ['middle', 'center']:
+            self.vertical_anchor = MSO_ANCHOR.MIDDLE
+        elif vertical_align == 'bottom':
+            self.vertical_anchor = MSO_ANCHOR.BOTTOM
+        else:
+            self.vertical_anchor = MSO_ANCHOR.TOP
+        self.line_height = styles.get('lineHeight', 'normal')
+
+    @property
+    def text_color(self):
+        if self._color is not None:
+            self._text_color = parse_color(self._color)
+            self._color = None
+        return self._text_color
+
+resolve_shape_style = StyleInterner(ShapeStyle)
+
 def pixels_to_emu(pixels):
     """Convert pixels to EMU (English Metric Units) - 1 pixel = 9525 EMU"""
     return int(pixels * 9525)
@@ -210,8 +283,8 @@ def constrain_to_bounds(x, y, width, height, slide_width, slide_height):
     return x, y, width, height
 
 def add_separator_element(slide, element, slide_width, slide_height, debug=False):
-    x, y, width = element['x'], element['y'], element['width']
-    styles = element.get('styles', {})
+    x, y, width = element.x, element.y, element.width
+    styles = element.styles
     
     border_width, border_style, border_color = parse_border(styles)
     if not (border_width and border_style and border_color):
@@ -249,20 +322,21 @@ def add_separator_element(slide, element, slide_width, slide_height, debug=False
         print(f"Failed to add separator element: {e}")
 
 def add_text_element(slide, element, slide_width, slide_height, debug=False):
-    x, y, width, height = element['x'], element['y'], element['width'], element['height']
-    text = element.get('text', '').strip()
+    x, y, width, height = element.x, element.y, element.width, element.height
+    text = element.text.strip()
     
     if not text:
         return
 
     x, y, width, height = constrain_to_bounds(x, y, width, height, slide_width, slide_height)
-    styles = element.get('styles', {})
+    try:
+        style = resolve_shape_style(element.styles)
+    except ValueError as e:
+        print(f"Failed to add text element: {e}")
+        return
     
     # Get padding values
-    padding_top = safe_int_conversion(styles.get('paddingTop', '0').replace('px', ''))
-    padding_right = safe_int_conversion(styles.get('paddingRight', '0').replace('px', ''))
-    padding_bottom = safe_int_conversion(styles.get('paddingBottom', '0').replace('px', ''))
-    padding_left = safe_int_conversion(styles.get('paddingLeft', '0').replace('px', ''))
+    padding_top, padding_right, padding_bottom, padding_left = style.padding
     
     # Adjust textbox position and size to account for padding
     textbox_x = x + padding_left
@@ -296,20 +370,13 @@ def add_text_element(slide, element, slide_width, slide_height, debug=False):
         text_frame.margin_bottom = 0
         
         # Set vertical alignment to center by default
-        vertical_align = styles.get('verticalAlign', 'middle')
-        line_height = styles.get('lineHeight', 'normal')
-        
-        if vertical_align in ['middle', 'center']:
-            text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
-        elif vertical_align == 'bottom':
-            text_frame.vertical_anchor = MSO_ANCHOR.BOTTOM
-        else:
-            text_frame.vertical_anchor = MSO_ANCHOR.TOP
+        line_height = style.line_height
+        text_frame.vertical_anchor = style.vertical_anchor
         
         paragraph = text_frame.paragraphs[0]
 
         # More accurate font sizing
-        font_size_px = safe_float_conversion(styles.get('fontSize', '12').replace('px', ''))
+        font_size_px = style.font_size_px
         if font_size_px > 0:
             font_size_pt = get_font_size_pt(font_size_px)
             paragraph.font.size = Pt(font_size_pt)
@@ -329,38 +396,26 @@ def add_text_element(slide, element, slide_width, slide_height, debug=False):
             except:
                 pass
         
-        font_family = styles.get('fontFamily', 'Arial')
-        if font_family:
-            if ',' in font_family:
-                font_family = font_family.split(',')[0].strip()
-            paragraph.font.name = font_family
+        if style.font_name:
+            paragraph.font.name = style.font_name
         
-        font_weight = styles.get('fontWeight', 'normal')
-        if font_weight == 'bold' or safe_int_conversion(font_weight) >= 700:
+        if style.bold:
             paragraph.font.bold = True
 
-        if styles.get('fontStyle') == 'italic':
+        if style.italic:
             paragraph.font.italic = True
 
-        text_color = parse_color(styles.get('color', 'black'))
-        if text_color:
-            paragraph.font.color.rgb = text_color
+        if style.text_color:
+            paragraph.font.color.rgb = style.text_color
         
         # Disable text shadow
         paragraph.font.shadow = False
         
         # Set horizontal alignment to center by default
-        text_align = styles.get('textAlign', 'center')
-        alignment_map = {
-            'left': PP_ALIGN.LEFT,
-            'center': PP_ALIGN.CENTER,
-            'right': PP_ALIGN.RIGHT,
-            'justify': PP_ALIGN.JUSTIFY
-        }
-        paragraph.alignment = alignment_map.get(text_align, PP_ALIGN.CENTER)
+        paragraph.alignment = style.alignment
         
         # Handle background color
-        bg_color = parse_color(styles.get('backgroundColor'))
+        bg_color = style.bg_color
         if bg_color:
             fill = textbox.fill
             fill.solid()
@@ -378,12 +433,17 @@ def add_text_element(slide, element, slide_width, slide_height, debug=False):
         print(f"Failed to add text element: {e}")
 
 def add_shape_element(slide, element, slide_width, slide_height, debug=False):
-    x, y, width, height = element['x'], element['y'], element['width'], element['height']
-    styles = element.get('styles', {})
-    text = element.get('text', '').strip()
+    x, y, width, height = element.x, element.y, element.width, element.height
+    styles = element.styles
+    try:
+        style = resolve_shape_style(styles)
+    except ValueError as e:
+        print(f"Failed to add shape element: {e}")
+        return
+    text = element.text.strip()
     
-    bg_color = parse_color(styles.get('backgroundColor'))
-    border_width, border_style, border_color = parse_border(styles)
+    bg_color = style.bg_color
+    border_width, border_style, border_color = style.border
     border_radius = parse_border_radius(styles.get('borderRadius', '0px'), width, height)
 
     if not bg_color and not border_width and not text:
@@ -438,19 +498,10 @@ def add_shape_element(slide, element, slide_width, slide_height, debug=False):
             text_frame.auto_size = None
             
             # Set vertical alignment to center by default
-            vertical_align = styles.get('verticalAlign', 'middle')
-            if vertical_align in ['middle', 'center']:
-                text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
-            elif vertical_align == 'bottom':
-                text_frame.vertical_anchor = MSO_ANCHOR.BOTTOM
-            else:
-                text_frame.vertical_anchor = MSO_ANCHOR.TOP
+            text_frame.vertical_anchor = style.vertical_anchor
 
             # Apply padding more accurately
-            padding_left = safe_int_conversion(styles.get('paddingLeft', '0').replace('px', ''))
-            padding_right = safe_int_conversion(styles.get('paddingRight', '0').replace('px', ''))
-            padding_top = safe_int_conversion(styles.get('paddingTop', '0').replace('px', ''))
-            padding_bottom = safe_int_conversion(styles.get('paddingBottom', '0').replace('px', ''))
+            padding_top, padding_right, padding_bottom, padding_left = style.padding
             
             text_frame.margin_left = pixels_to_emu(padding_left)
             text_frame.margin_right = pixels_to_emu(padding_right)
@@ -460,40 +511,26 @@ def add_shape_element(slide, element, slide_width, slide_height, debug=False):
             paragraph = text_frame.paragraphs[0]
             
             # More accurate font sizing
-            font_size_px = safe_float_conversion(styles.get('fontSize', '12').replace('px', ''))
-            if font_size_px > 0:
-                font_size_pt = get_font_size_pt(font_size_px)
-                paragraph.font.size = Pt(font_size_pt)
+            if style.font_size_px > 0:
+                paragraph.font.size = Pt(get_font_size_pt(style.font_size_px))
             
-            font_family = styles.get('fontFamily', 'Arial')
-            if font_family:
-                if ',' in font_family:
-                    font_family = font_family.split(',')[0].strip()
-                paragraph.font.name = font_family
+            if style.font_name:
+                paragraph.font.name = style.font_name
             
-            font_weight = styles.get('fontWeight', 'normal')
-            if font_weight == 'bold' or safe_int_conversion(font_weight) >= 700:
+            if style.bold:
                 paragraph.font.bold = True
 
-            if styles.get('fontStyle') == 'italic':
+            if style.italic:
                 paragraph.font.italic = True
 
-            text_color = parse_color(styles.get('color', 'black'))
-            if text_color:
-                paragraph.font.color.rgb = text_color
+            if style.text_color:
+                paragraph.font.color.rgb = style.text_color
             
             # Disable shadow for text in shape
             paragraph.font.shadow = False
             
             # Set horizontal alignment to center by default
-            text_align = styles.get('textAlign', 'center')
-            alignment_map = {
-                'left': PP_ALIGN.LEFT,
-                'center': PP_ALIGN.CENTER,
-                'right': PP_ALIGN.RIGHT,
-                'justify': PP_ALIGN.JUSTIFY
-            }
-            paragraph.alignment = alignment_map.get(text_align, PP_ALIGN.CENTER)
+            paragraph.alignment = style.alignment
         
         if debug:
             print(f"Added shape at ({x}, {y}) size ({width}x{height}), radius={border_radius}, text='{text[:50]}...'")
@@ -501,9 +538,9 @@ def add_shape_element(slide, element, slide_width, slide_height, debug=False):
     except Exception as e:
         print(f"Failed to add shape element: {e}")
 
-def add_image_element(slide, element, slide_width, slide_height, debug=False):
-    x, y, width, height = element['x'], element['y'], element['width'], element['height']
-    img_src = element.get('src', '')
+def add_image_element(slide, element, slide_width, slide_height, debug=False, image_policy=None):
+    x, y, width, height = element.x, element.y, element.width, element.height
+    img_src = element.src
     
     if not img_src:
         return
@@ -511,66 +548,93 @@ def add_image_element(slide, element, slide_width, slide_height, debug=False):
     x, y, width, height = constrain_to_bounds(x, y, width, height, slide_width, slide_height)
     
     try:
-        temp_path = None
-        if img_src.startswith('data:'):
-            header, data = img_src.split(',', 1)
-            img_data = base64.b64decode(data)
-            temp_path = 'temp_image.png'
-            with open(temp_path, 'wb') as f:
-                f.write(img_data)
-        elif img_src.startswith('http'):
-            response = requests.get(img_src, timeout=10)
-            if response.status_code == 200:
-                temp_path = 'temp_image.png'
-                with open(temp_path, 'wb') as f:
-                    f.write(response.content)
-            else:
-                print(f"Failed to download image: {img_src}, status: {response.status_code}")
-                return
-        else:
-            if os.path.exists(img_src):
-                temp_path = img_src
-            else:
-                print(f"Image file not found: {img_src}")
-                return
-
-        try:
-            with Image.open(temp_path) as img:
-                img.verify()
-        except Exception as e:
-            print(f"Invalid image file: {temp_path}, error: {e}")
-            if temp_path != img_src and os.path.exists(temp_path):
-                os.remove(temp_path)
+        # Verified bytes come from the shared cache, downloads and decodes happen once per asset
+        img_data, img_hash = get_image_cache().get_image(img_src)
+        if img_data is None:
             return
+        if image_policy is not None:
+            img_data, img_hash, _ = image_policy.apply(img_data, img_hash, width, height)
         
         picture = slide.shapes.add_picture(
-            temp_path,
+            io.BytesIO(img_data),
             pixels_to_emu(x), pixels_to_emu(y),
             pixels_to_emu(width), pixels_to_emu(height)
         )
+        set_picture_name(picture, img_src)
         
         # Disable shadow for the image
         picture.shadow.inherit = False
-
-        if temp_path != img_src and os.path.exists(temp_path):
-            os.remove(temp_path)
         
         if debug:
             print(f"Added image: {img_src} at ({x}, {y}) size ({width}x{height})")
     
     except Exception as e:
         print(f"Failed to add image element: {e}")
-        if temp_path and temp_path != img_src and os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except:
-                pass
 
-def create_pptx_from_json(json_path, output_path=None, debug=False, base_size='1080p', padding=20, center_content=True):
-    """Create PowerPoint presentation from JSON with HTML-like content fitting."""
+def add_slide_from_data(prs, slide_info, slide_width, slide_height, image_policy=None, layout=None, debug=False):
+    """Render one extracted slide dict as a new slide of prs, on layout (default: blank)"""
+    slide = prs.slides.add_slide(layout or template_cache.blank_layout())
+    elements = decode_slide(slide_info).elements
+
+    if debug:
+        print(f"\nProcessing slide {slide_info.get('slideId', 'Unknown')} with {len(elements)} elements")
+
+    elements_sorted = sorted(elements, key=lambda e: e.z_index)
+
+    for element in elements_sorted:
+        element_type = element.type
+        class_name = element.class_name
+
+        if debug:
+            print(f"Processing {element_type} at ({element.x}, {element.y}) size ({element.width}x{element.height})")
+
+        if element_type == 'img':
+            add_image_element(slide, element, slide_width, slide_height, debug, image_policy)
+
+        elif element_type == 'div':
+            styles = element.styles
+            has_background = styles.get('backgroundColor') and styles['backgroundColor'] != 'rgba(0, 0, 0, 0)'
+            has_border = styles.get('border') and styles['border'] != 'none'
+            has_border_radius = styles.get('borderRadius') and styles['borderRadius'] != '0px'
+
+            if 'separator' in class_name:
+                add_separator_element(slide, element, slide_width, slide_height, debug)
+            elif has_background or has_border or has_border_radius:
+                add_shape_element(slide, element, slide_width, slide_height, debug)
+            elif element.text:
+                add_text_element(slide, element, slide_width, slide_height, debug)
+
+        elif element_type in ['span', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'] and element.text:
+            add_text_element(slide, element, slide_width, slide_height, debug)
+    return slide
+
+def create_pptx_from_json(json_path, output_path=None, debug=False, base_size='1080p', padding=20, center_content=True,
+                          prefetch_workers=DEFAULT_PREFETCH_WORKERS, image_density=None, stream=False, template=None,
+                          profile=None):
+    """Create PowerPoint presentation from JSON with HTML-like content fitting.
+
+    image_density (image pixels per CSS pixel) enables resampling images down
+    to their displayed size before embedding. stream=True parses and renders
+    one slide at a time; without slide dimensions in the JSON that takes a
+    first pass over the file to measure the content. template is a
+    .pptx/.potx path to use instead of the default template. profile is a
+    path for a JSON render report (see render_profile), with the collapsed
+    stacks for flame graphs written next to it.
+    """
+    if profile:
+        with render_profile.RenderProfiler() as profiler:
+            profiler.instrument(globals(), PROFILE_HOOKS)
+            create_pptx_from_json(json_path, output_path, debug, base_size, padding, center_content,
+                                  prefetch_workers, image_density, stream, template)
+        render_profile.write_profile(profiler, profile)
+        return
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if stream:
+            slide_stream = SlideStream(json_path)
+            data = slide_stream.header()
+        else:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = expand_document(json.load(f))
     except Exception as e:
         print(f"Error reading JSON file: {e}")
         return
@@ -579,61 +643,69 @@ def create_pptx_from_json(json_path, output_path=None, debug=False, base_size='1
     if isinstance(data, dict) and 'slideWidth' in data and 'slideHeight' in data:
         slide_width = int(data['slideWidth'])
         slide_height = int(data['slideHeight'])
-        slides_data = data.get('slides', [])
+        slides_data = slide_stream if stream else data.get('slides', [])
         size_name = f"JSON Specified {slide_width}x{slide_height}"
         print(f"Using slide dimensions from JSON: {slide_width}x{slide_height}")
     else:
         # Fallback to old behavior if dimensions not provided
-        slides_data = data if isinstance(data, list) else [data]
-        content_width, content_height = analyze_content_bounds(slides_data)
+        if stream:
+            slides_data = slide_stream if slide_stream.is_array else [data]
+        else:
+            slides_data = data if isinstance(data, list) else [data]
+        try:
+            content_width, content_height = analyze_content_bounds(slides_data)
+        except (OSError, SlideStreamError) as e:
+            print(f"Error reading JSON file: {e}")
+            return
         slide_width, slide_height, size_name = calculate_optimal_slide_size(content_width, content_height, base_size, padding)
         
         if center_content:
-            slides_data = center_content_on_slide(slides_data, slide_width, slide_height, content_width, content_height, padding)
+            if stream:
+                offset_x, offset_y = content_offset(slide_width, slide_height, content_width, content_height, padding)
+                slides_data = (shift_slide(slide_info, offset_x, offset_y) for slide_info in slide_stream) \
+                    if slide_stream.is_array else [shift_slide(data, offset_x, offset_y)]
+            else:
+                slides_data = center_content_on_slide(slides_data, slide_width, slide_height, content_width, content_height, padding)
 
-    print(f"Loaded {len(slides_data)} slides from {json_path}")
+    if stream:
+        print(f"Streaming slides from {json_path}")
+    else:
+        print(f"Loaded {len(slides_data)} slides from {json_path}")
     
-    prs = Presentation()
-    prs.slide_width = pixels_to_emu(slide_width)
-    prs.slide_height = pixels_to_emu(slide_height)
+    image_cache = get_image_cache()
+    image_policy = DownsamplePolicy(image_density) if image_density else None
+    if prefetch_workers and not stream:
+        image_cache.prefetch(collect_image_sources(slides_data), max_workers=prefetch_workers)
+    
+    try:
+        prs = template_cache.new_presentation(pixels_to_emu(slide_width), pixels_to_emu(slide_height), template)
+        layout = template_cache.blank_layout(template)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        print(f"Error loading template: {e}")
+        image_cache.clear_prefetched()
+        return
     
     print(f"Creating {size_name} presentation")
     print(f"Slide dimensions: {slide_width}x{slide_height} pixels")
     
-    for slide_info in slides_data:
-        slide = prs.slides.add_slide(prs.slide_layouts[6])
-        elements = slide_info.get('elements', [])
-        
-        if debug:
-            print(f"\nProcessing slide {slide_info.get('slideId', 'Unknown')} with {len(elements)} elements")
-
-        elements_sorted = sorted(elements, key=lambda e: e.get('zIndex', 0))
-
-        for element in elements_sorted:
-            element_type = element.get('type', '').lower()
-            class_name = element.get('className', '')
-            
-            if debug:
-                print(f"Processing {element_type} at ({element['x']}, {element['y']}) size ({element['width']}x{element['height']})")
-
-            if element_type == 'img':
-                add_image_element(slide, element, slide_width, slide_height, debug)
-            
-            elif element_type == 'div':
-                styles = element.get('styles', {})
-                has_background = styles.get('backgroundColor') and styles['backgroundColor'] != 'rgba(0, 0, 0, 0)'
-                has_border = styles.get('border') and styles['border'] != 'none'
-                has_border_radius = styles.get('borderRadius') and styles['borderRadius'] != '0px'
-
-                if 'separator' in class_name:
-                    add_separator_element(slide, element, slide_width, slide_height, debug)
-                elif has_background or has_border or has_border_radius:
-                    add_shape_element(slide, element, slide_width, slide_height, debug)
-                elif element.get('text'):
-                    add_text_element(slide, element, slide_width, slide_height, debug)
-            
-            elif element_type in ['span', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'] and element.get('text'):
-                add_text_element(slide, element, slide_width, slide_height, debug)
+    slide_count = 0
+    try:
+        for slide_info in slides_data:
+            if stream and prefetch_workers:
+                image_cache.prefetch(collect_image_sources([slide_info]), max_workers=prefetch_workers)
+            add_slide_from_data(prs, slide_info, slide_width, slide_height, image_policy, layout, debug)
+            slide_count += 1
+            if stream:
+                # Drop per-slide references so the parsed slide can be freed
+                image_cache.clear_prefetched()
+                resolve_shape_style.clear()
+    except (OSError, SlideStreamError) as e:
+        print(f"Error reading JSON file: {e}")
+        image_cache.clear_prefetched()
+        resolve_shape_style.clear()
+        return
+    if stream:
+        print(f"Rendered {slide_count} slides from {json_path}")
     
     if output_path is None:
         base_name = os.path.splitext(os.path.basename(json_path))[0]
@@ -654,9 +726,13 @@ def create_pptx_from_json(json_path, output_path=None, debug=False, base_size='1
             print(f"✓ Extended height from {base_size} to fit content")
         else:
             print(f"✓ Content fits within {base_size} dimensions")
+        if image_policy is not None:
+            print(f"Downsampled {image_policy.images_resampled()} image(s), saved {image_policy.bytes_saved()} bytes")
             
     except Exception as e:
         print(f"Error saving presentation: {e}")
+    image_cache.clear_prefetched()
+    resolve_shape_style.clear()
 
 if __name__ == "__main__":
     create_pptx_from_json('slides_data.json', 'output_chart.pptx', debug=True, padding=50)
\ No newline at end of file
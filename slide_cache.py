@@ -0,0 +1,140 @@
+"""Persistent cache of rendered slides shared across decks and jobs.
+
+An entry maps a hash of a slide's extracted data, the content hashes of its
+images, the slide size, the render options and the renderer source to the
+slides it rendered to: each slide's p:cSld XML, its image and external
+relationships and the image bytes, packed in a small zip. Cache hits are
+grafted into the new presentation with PresentationMerger.add_slide
+instead of being rendered again. Entries live in a size-bounded
+DiskLRUCache, so several processes can share one directory.
+"""
+import hashlib
+import io
+import json
+import os
+import zipfile
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+
+from asset_cache import DEFAULT_CACHE_DIR, DiskLRUCache
+
+DEFAULT_SLIDE_CACHE_MAX_BYTES = int(os.environ.get('PPTGEN_SLIDE_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+# Modules whose source is part of every key, so changing the renderer invalidates the cache
+RENDERER_MODULES = ('multi_slide_generator', 'element_records', 'style_resolver', 'image_ops', 'template_cache',
+                    'pptx_merge', 'asset_cache')
+ENTRY_VERSION = 1
+
+_renderer_hash = None
+
+def renderer_hash():
+    """Hash of the renderer modules' source and the python-pptx version, computed once per process"""
+    global _renderer_hash
+    if _renderer_hash is None:
+        import importlib.util
+        import pptx
+        digest = hashlib.sha256(f"{ENTRY_VERSION}:{pptx.__version__}".encode('utf-8'))
+        for module in RENDERER_MODULES:
+            spec = importlib.util.find_spec(module)
+            if spec is not None and spec.origin:
+                with open(spec.origin, 'rb') as f:
+                    digest.update(f.read())
+        _renderer_hash = digest.hexdigest()
+    return _renderer_hash
+
+def template_key(template):
+    """Identity of a template file for cache keys, changes when the file does"""
+    if template is None:
+        return None
+    try:
+        st = os.stat(template)
+    except OSError:
+        return os.path.abspath(template)
+    return f"{os.path.abspath(template)}:{st.st_mtime_ns}:{st.st_size}"
+
+def pack_slides(slides):
+    """Entry bytes for slides, None if one of them uses a relationship an entry can't hold"""
+    output = io.BytesIO()
+    index = []
+    media = set()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as entry:
+        for i, slide in enumerate(slides):
+            rels = []
+            for rId, rel in slide.part.rels.items():
+                if rel.reltype == RT.SLIDE_LAYOUT:
+                    continue
+                if rel.is_external:
+                    rels.append([rId, rel.reltype, rel.target_ref])
+                elif rel.reltype == RT.IMAGE:
+                    sha1 = rel.target_part.sha1
+                    rels.append([rId, rel.reltype, None, sha1])
+                    if sha1 not in media:
+                        media.add(sha1)
+                        entry.writestr(f'media/{sha1}', rel.target_part.blob, zipfile.ZIP_STORED)
+                else:
+                    return None
+            index.append(rels)
+            entry.writestr(f'slide{i}.xml', etree.tostring(slide._element.cSld))
+        entry.writestr('slides.json', json.dumps(index))
+    return output.getvalue()
+
+def unpack_slides(data):
+    """[(p:cSld element, rels)] of entry bytes, rels as PresentationMerger.add_slide takes them"""
+    slides = []
+    with zipfile.ZipFile(io.BytesIO(data)) as entry:
+        for i, rels in enumerate(json.loads(entry.read('slides.json'))):
+            targets = [(rId, reltype, url if url is not None else (extra[0], entry.read(f'media/{extra[0]}')))
+                       for rId, reltype, url, *extra in rels]
+            slides.append((parse_xml(entry.read(f'slide{i}.xml')), targets))
+    return slides
+
+class SlideCache:
+    """Rendered slides by slide_key; the generator counts hits and misses in its render_stats"""
+
+    def __init__(self, directory=None, max_bytes=None):
+        directory = directory or os.path.join(DEFAULT_CACHE_DIR, 'slides')
+        self.entries = DiskLRUCache(directory, max_bytes or DEFAULT_SLIDE_CACHE_MAX_BYTES)
+
+    def slide_key(self, slide_data, media_hashes, options):
+        """Key of slide_data rendered with options, a JSON-serializable list.
+
+        media_hashes are the content hashes of the slide's images, so a new
+        image behind the same URL or path makes a new key.
+        """
+        canonical = json.dumps([renderer_hash(), options, media_hashes, slide_data], sort_keys=True,
+                               separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """[(p:cSld element, rels)] cached under key, or None"""
+        data = self.entries.get(key)
+        if data is not None:
+            try:
+                slides = unpack_slides(data)
+            except (zipfile.BadZipFile, KeyError, ValueError) as e:
+                print(f"Ignoring damaged slide cache entry {key}: {e}")
+            else:
+                return slides
+        return None
+
+    def put(self, key, slides):
+        """Store rendered slides under key, returns False if they can't be cached"""
+        data = pack_slides(slides)
+        if data is None:
+            return False
+        try:
+            self.entries.put(key, data)
+        except OSError as e:
+            print(f"Could not write slide cache entry: {e}")
+            return False
+        return True
+
+_default_slide_cache = None
+
+def get_slide_cache():
+    """Process-wide SlideCache in the default cache directory"""
+    global _default_slide_cache
+    if _default_slide_cache is None:
+        _default_slide_cache = SlideCache()
+    return _default_slide_cache
@@ -0,0 +1,80 @@
+"""Render slides while they are being extracted, from a stream of NDJSON.
+
+extract_multi_slide.js writes one compact slide object per line when its
+output is "-" (stdout) or a .ndjson file. Piped into this script, each slide
+is rendered as soon as its line arrives, so generation overlaps extraction
+and no intermediate JSON file is written:
+
+    node extract_multi_slide.js input.html - | python slide_pipeline.py - output.pptx
+
+A recorded .ndjson file can be replayed at a fixed number of slides per
+second with --rate, to exercise the pipeline offline the way a live
+extractor would feed it.
+
+Usage: python slide_pipeline.py (slides.ndjson | -) output.pptx [--rate 2] [--image-density 2]
+       [--template t.potx] [--paginate-tables] [--slide-cache] [--render-workers 1]
+"""
+import argparse
+import contextlib
+import sys
+import time
+
+from asset_cache import DEFAULT_PREFETCH_WORKERS
+from slide_stream import iter_ndjson_slides
+
+def open_source(source):
+    """Context manager giving a text stream for source: a path, "-" for stdin, or an open file"""
+    if source == '-':
+        return contextlib.nullcontext(sys.stdin)
+    if isinstance(source, str):
+        return open(source, 'r', encoding='utf-8')
+    return contextlib.nullcontext(source)
+
+def replay(slides, rate):
+    """Yield slides no faster than rate per second, slide i not before i / rate seconds from the first"""
+    start = time.perf_counter()
+    for i, slide in enumerate(slides):
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        yield slide
+
+def render_ndjson(source, output_path, rate=None, prefetch_workers=DEFAULT_PREFETCH_WORKERS, image_density=None,
+                  render_workers=1, template=None, paginate_tables=False, cull_hidden=True, slide_cache=False):
+    """Render the NDJSON slides of source to output_path as they arrive.
+
+    source is a path, "-" for stdin or a text stream; with rate set, slides
+    are handed to the renderer at most rate per second (see replay). The
+    other options are those of multi_slide_generator.create_pptx_from_json.
+    """
+    import multi_slide_generator
+
+    with open_source(source) as f:
+        slides = iter_ndjson_slides(f)
+        if rate:
+            slides = replay(slides, rate)
+        multi_slide_generator.create_pptx_from_slides(slides, output_path, prefetch_workers, image_density,
+                                                      stream=True, render_workers=render_workers, template=template,
+                                                      paginate_tables=paginate_tables, cull_hidden=cull_hidden,
+                                                      slide_cache=slide_cache)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('source', help='NDJSON file of slides, - for stdin')
+    parser.add_argument('output', help='pptx file to write')
+    parser.add_argument('--rate', type=float, help='replay at most this many slides per second')
+    parser.add_argument('--prefetch-workers', type=int, default=DEFAULT_PREFETCH_WORKERS)
+    parser.add_argument('--image-density', type=float)
+    parser.add_argument('--render-workers', type=int, default=1)
+    parser.add_argument('--template', help='.pptx/.potx to build on')
+    parser.add_argument('--paginate-tables', action='store_true')
+    parser.add_argument('--no-cull', dest='cull_hidden', action='store_false',
+                        help='also draw background shapes hidden under opaque ones')
+    parser.add_argument('--slide-cache', action='store_true', help='reuse slides from the persistent slide cache')
+    args = parser.parse_args()
+
+    render_ndjson(args.source, args.output, args.rate, args.prefetch_workers, args.image_density, args.render_workers,
+                  args.template, args.paginate_tables, args.cull_hidden, args.slide_cache)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+import json
+import re
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+STRUCTURE_RE = re.compile(r'["\[\]{}]')
+STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+# Characters that can follow a complete value in valid JSON
+VALUE_END_CHARS = frozenset(' \t\n\r,]}:')
+
+_decoder = json.JSONDecoder()
+
+# Compact documents: {"format": COMPACT_FORMAT, "version": 1, "styles": [...], "document": ...}, where document
+# is the extraction JSON with every STYLE_KEYS dict replaced by its index in styles (see compact_json.py)
+COMPACT_FORMAT = 'pptgen-compact'
+COMPACT_VERSION = 1
+STYLE_KEYS = frozenset(['styles', 'slideStyles'])
+
+class SlideStreamError(ValueError):
+    """The slides file is not valid JSON or not an array/object of slides"""
+
+def is_compact(document):
+    return isinstance(document, dict) and document.get('format') == COMPACT_FORMAT
+
+def expand_styles(value, styles):
+    """Put the style dicts of styles back in place of their ids in value, in place; returns value.
+
+    Elements with the same style id share one dict.
+    """
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, child in node.items():
+                if key in STYLE_KEYS and isinstance(child, int):
+                    node[key] = styles[child]
+                elif isinstance(child, (dict, list)):
+                    stack.append(child)
+        elif isinstance(node, list):
+            stack.extend(child for child in node if isinstance(child, (dict, list)))
+    return value
+
+def expand_document(document):
+    """The extraction JSON held by a compact document, other documents unchanged"""
+    if not is_compact(document):
+        return document
+    if document.get('version') != COMPACT_VERSION:
+        raise SlideStreamError(f"Unsupported compact format version {document.get('version')!r}")
+    try:
+        return expand_styles(document['document'], document['styles'])
+    except (KeyError, IndexError, TypeError) as e:
+        raise SlideStreamError(f"Malformed compact document: {e!r}") from e
+
+class _Reader:
+    """Incremental JSON reader over a text file.
+
+    Only the unparsed tail of the file is buffered; values are decoded one at
+    a time with raw_decode, reading more (in growing chunks) whenever a value
+    runs past the end of the buffer.
+    """
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size):
+        """Append up to size characters to the buffer, False at end of file"""
+        if self.eof:
+            return False
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, '' at end of file"""
+        while True:
+            self.pos = WHITESPACE_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.chunk_size):
+                return ''
+
+    def expect(self, chars):
+        c = self.peek()
+        if not c or c not in chars:
+            raise SlideStreamError(f"Malformed JSON: expected one of {chars!r}, found {c or 'end of file'!r}")
+        self.pos += 1
+        return c
+
+    def value(self):
+        """Decode the next value"""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number cut by the end of the buffer ("12" of "12.5") also decodes,
+                # so only trust a value followed by a delimiter
+                if self.eof or (end < len(self.buf) and self.buf[end] in VALUE_END_CHARS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise SlideStreamError(f"Malformed JSON: {e}") from e
+            self._fill(size)
+            size *= 2
+
+    def skip(self):
+        """Step over the next value without building it"""
+        if self.peek() not in '[{"':
+            self.value()
+            return
+        depth = 0
+        size = self.chunk_size
+        while True:
+            match = STRUCTURE_RE.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self._fill(self.chunk_size):
+                    raise SlideStreamError("Malformed JSON: unexpected end of file")
+                continue
+            if match.group() == '"':
+                string = STRING_RE.match(self.buf, match.start())
+                if string is None:
+                    # The string runs past the buffer, read on from its opening quote
+                    self.pos = match.start()
+                    if not self._fill(size):
+                        raise SlideStreamError("Malformed JSON: unterminated string")
+                    size *= 2
+                    continue
+                self.pos = string.end()
+            else:
+                self.pos = match.end()
+                depth += 1 if match.group() in '[{' else -1
+            if depth == 0:
+                return
+
+    def items(self):
+        """Yield the values of the array at the current position"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+    def members(self):
+        """Yield the keys of the object at the current position.
+
+        The caller must consume each member's value (value() or skip())
+        before asking for the next key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+class SlideStream:
+    """Slides of an extracted JSON file, parsed one slide at a time.
+
+    Reads a top-level array of slides (multi-slide extraction) or an object
+    with a "slides" array (single-slide format), or a compact document
+    holding either, whose slides are expanded as they are read. Only the current slide and
+    one read chunk are held in memory, so peak memory follows the largest
+    slide rather than the whole document. Every iteration re-reads the file.
+    """
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._header = None
+        self.is_array = None
+
+    def _open(self):
+        return open(self.path, 'r', encoding='utf-8')
+
+    def header(self):
+        """Top-level members other than "slides" of an object document, {} for an array.
+
+        Scans the whole file, skipping over the slides without parsing them.
+        For a compact document these are the members of the document it holds.
+        """
+        if self._header is None:
+            header = {}
+            with self._open() as f:
+                for _ in self._walk(_Reader(f, self.chunk_size), header, False):
+                    pass
+            self._header = header
+        return self._header
+
+    def __iter__(self):
+        with self._open() as f:
+            yield from self._walk(_Reader(f, self.chunk_size), {}, True)
+
+    def _walk(self, reader, header, parse_slides, styles=None):
+        """Yield the slides of the document at the reader's position, or skip them unless parse_slides.
+
+        Without parse_slides the other members of an object document are
+        parsed into header. A compact document's style table must come
+        before its document, as compact_json.py writes it.
+        """
+        first = reader.peek()
+        if first == '[':
+            self.is_array = True
+            if parse_slides:
+                yield from self._items(reader, styles)
+            else:
+                reader.skip()
+            return
+        if first != '{':
+            raise SlideStreamError("Malformed JSON: expected an array or an object of slides")
+        self.is_array = False
+        envelope = {}
+        for key in reader.members():
+            if styles is None and key == 'document' and envelope.get('format') == COMPACT_FORMAT:
+                if envelope.get('version') != COMPACT_VERSION or not isinstance(envelope.get('styles'), list):
+                    raise SlideStreamError("Malformed compact document: unsupported version or no style table "
+                                           "before the document")
+                header.clear()
+                yield from self._walk(reader, header, parse_slides, envelope['styles'])
+            elif key == 'slides':
+                if parse_slides and reader.peek() == '[':
+                    yield from self._items(reader, styles)
+                else:
+                    reader.skip()
+            elif styles is None and key in ('format', 'version', 'styles'):
+                envelope[key] = header[key] = reader.value()
+            elif parse_slides:
+                reader.skip()
+            else:
+                value = reader.value()
+                header[key] = value if styles is None else self._expand(value, styles)
+
+    def _items(self, reader, styles):
+        for slide in reader.items():
+            yield slide if styles is None else self._expand(slide, styles)
+
+    @staticmethod
+    def _expand(value, styles):
+        try:
+            return expand_styles(value, styles)
+        except (IndexError, TypeError) as e:
+            raise SlideStreamError(f"Malformed compact document: {e!r}") from e
+
+def iter_ndjson_slides(f):
+    """Yield the slides of a text stream holding one JSON slide object per line.
+
+    Lines are read as they arrive, so f can be a pipe from a running
+    extractor. Blank lines are skipped; a line that is not a JSON object
+    raises SlideStreamError.
+    """
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            slide = json.loads(line)
+        except ValueError as e:
+            raise SlideStreamError(f"Malformed NDJSON on line {line_no}: {e}") from e
+        if not isinstance(slide, dict):
+            raise SlideStreamError(f"Malformed NDJSON on line {line_no}: expected a slide object")
+        yield slide
@@ -0,0 +1,239 @@
+import functools
+import math
+import re
+
+from pptx.dml.color import RGBColor
+from pptx.util import Pt
+
+NON_NUMERIC_RE = re.compile(r'[^\d.-]')
+NUMBER_RE = re.compile(r'[\d.]+')
+INTEGER_RE = re.compile(r'\d+')
+
+BORDER_SIDES = ('Top', 'Right', 'Bottom', 'Left')
+TRANSPARENT_COLORS = frozenset(['transparent', 'rgba(0, 0, 0, 0)', 'none', 'initial', 'inherit'])
+NAMED_COLORS = {
+    'black': RGBColor(0, 0, 0), 'white': RGBColor(255, 255, 255),
+    'red': RGBColor(255, 0, 0), 'green': RGBColor(0, 128, 0),
+    'blue': RGBColor(0, 0, 255), 'yellow': RGBColor(255, 255, 0),
+    'gray': RGBColor(128, 128, 128), 'grey': RGBColor(128, 128, 128),
+    'silver': RGBColor(192, 192, 192), 'maroon': RGBColor(128, 0, 0),
+    'olive': RGBColor(128, 128, 0), 'lime': RGBColor(0, 255, 0),
+    'aqua': RGBColor(0, 255, 255), 'teal': RGBColor(0, 128, 128),
+    'navy': RGBColor(0, 0, 128), 'fuchsia': RGBColor(255, 0, 255),
+    'purple': RGBColor(128, 0, 128)
+}
+# The interned records are dropped once this many distinct styles have been seen
+MAX_INTERNED_STYLES = 50_000
+
+def safe_float(value, default=0.0):
+    """Safely convert value to float with better error handling"""
+    try:
+        if isinstance(value, str):
+            # Remove units and extract numeric value
+            value = NON_NUMERIC_RE.sub('', value)
+        return float(value) if value else default
+    except (ValueError, TypeError):
+        return default
+
+def safe_int(value, default=0):
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return default
+
+def pixels_to_emu(pixels):
+    """Convert pixels to EMU with high precision"""
+    return int(round(pixels * 9525))
+
+@functools.lru_cache(maxsize=4096)
+def parse_color(color_str):
+    """Enhanced color parsing with better RGB extraction, memoized per CSS string"""
+    if not color_str or color_str in TRANSPARENT_COLORS:
+        return None
+
+    # Handle RGB/RGBA
+    if color_str.startswith(('rgb', 'rgba')):
+        parts = NUMBER_RE.findall(color_str)
+        if len(parts) >= 3:
+            r = min(255, max(0, int(float(parts[0]))))
+            g = min(255, max(0, int(float(parts[1]))))
+            b = min(255, max(0, int(float(parts[2]))))
+            return RGBColor(r, g, b)
+
+    # Handle hex colors
+    elif color_str.startswith('#'):
+        color_str = color_str.lstrip('#')
+        if len(color_str) == 6:
+            try:
+                return RGBColor(int(color_str[0:2], 16), int(color_str[2:4], 16), int(color_str[4:6], 16))
+            except ValueError:
+                pass
+        elif len(color_str) == 3:
+            try:
+                return RGBColor(int(color_str[0]*2, 16), int(color_str[1]*2, 16), int(color_str[2]*2, 16))
+            except ValueError:
+                pass
+
+    return NAMED_COLORS.get(color_str.lower())
+
+@functools.lru_cache(maxsize=1024)
+def parse_radius_spec(radius_str):
+    """Split a CSS border radius into ('ratio', r) for percentages or ('px', r), None for no radius"""
+    if not radius_str or radius_str == '0px':
+        return None
+    try:
+        if isinstance(radius_str, str):
+            if '%' in radius_str:
+                percent = safe_float(radius_str.replace('%', ''))
+                return ('ratio', min(percent / 100, 0.5))
+            match = NUMBER_RE.search(radius_str)
+            if not match:
+                return None
+            return ('px', float(match.group()))
+        return ('px', float(radius_str))
+    except (ValueError, TypeError):
+        return None
+
+def radius_ratio(spec, shape_width_px, shape_height_px):
+    """Border radius as a fraction of the shorter side, capped at 0.5"""
+    if spec is None:
+        return 0
+    kind, value = spec
+    if kind == 'ratio':
+        return value
+    min_dimension = min(shape_width_px, shape_height_px)
+    if min_dimension > 0:
+        return min(value / min_dimension, 0.5)
+    return 0
+
+class ShadowSpec:
+    """box-shadow converted to the values python-pptx's shadow format takes"""
+    __slots__ = ('blur', 'distance', 'angle', 'color', 'transparency')
+
+    def __init__(self, blur, distance, angle, color, transparency):
+        self.blur = blur
+        self.distance = distance
+        self.angle = angle
+        self.color = color
+        self.transparency = transparency
+
+@functools.lru_cache(maxsize=1024)
+def parse_shadow(box_shadow_str):
+    if box_shadow_str == 'none':
+        return None
+    parts = box_shadow_str.split()
+    if len(parts) < 3:
+        return None
+    offset_x_px = safe_float(parts[0])
+    offset_y_px = safe_float(parts[1])
+    blur_px = safe_float(parts[2])
+    spread_px = safe_float(parts[3]) if len(parts) > 3 else 0
+    color_str = parts[4] if len(parts) > 4 else parts[3]
+    if offset_x_px == 0 and offset_y_px == 0 and blur_px == 0 and spread_px == 0:
+        return None
+    color = parse_color(color_str)
+    alpha = 1.0
+    if 'rgba' in color_str:
+        color_parts = INTEGER_RE.findall(color_str)
+        if len(color_parts) == 4:
+            alpha = float(color_parts[3]) / 255
+    if not color:
+        return None
+    distance_px = math.sqrt(offset_x_px**2 + offset_y_px**2)
+    direction = math.degrees(math.atan2(offset_y_px, offset_x_px)) if distance_px > 0 else 0
+    return ShadowSpec(Pt(blur_px * 0.75), Pt(distance_px * 0.75), direction, color, 1 - alpha)
+
+class ResolvedStyle:
+    """One element's computed styles parsed once into the values the renderers need.
+
+    Records are interned by style content (see resolve_style), so treat them
+    and their border_info as read-only.
+    """
+    __slots__ = ('bg_color', 'padding_px', 'border_info', 'uniform_border', 'any_border',
+                 'radius_spec', 'box_shadow', 'has_shadow', 'shadow', '_margins')
+
+    def __init__(self, styles):
+        self.bg_color = parse_color(styles.get('backgroundColor'))
+        self.padding_px = tuple(
+            safe_float(styles[key]) if key in styles else None
+            for key in ('paddingLeft', 'paddingRight', 'paddingTop', 'paddingBottom'))
+        border_info = {}
+        for side in BORDER_SIDES:
+            width = safe_float(styles.get(f'border{side}Width', '0px'))
+            style = styles.get(f'border{side}Style', 'none')
+            color = parse_color(styles.get(f'border{side}Color', ''))
+            border_info[side.lower()] = {
+                'width': width,
+                'style': style,
+                'color': color,
+                'has_border': width > 0 and style not in ['none', 'hidden'] and color is not None
+            }
+        self.border_info = border_info
+        widths = [info['width'] for info in border_info.values()]
+        self.uniform_border = (
+            len(set(widths)) == 1 and widths[0] > 0 and
+            len(set(styles.get(f'border{side}Style', 'none') for side in BORDER_SIDES)) == 1 and
+            len(set(styles.get(f'border{side}Color', '') for side in BORDER_SIDES)) == 1)
+        self.any_border = any(info['has_border'] for info in border_info.values())
+        self.radius_spec = parse_radius_spec(styles.get('borderRadius', '0px'))
+        self.box_shadow = styles.get('boxShadow', 'none')
+        self.has_shadow = self.box_shadow != 'none'
+        self.shadow = parse_shadow(self.box_shadow) if self.has_shadow else None
+        self._margins = {}
+
+    def radius_ratio(self, width, height):
+        return radius_ratio(self.radius_spec, width, height)
+
+    def margins_emu(self, default_px=0):
+        """(left, right, top, bottom) text margins in EMU, default_px for missing padding"""
+        margins = self._margins.get(default_px)
+        if margins is None:
+            margins = tuple(pixels_to_emu(default_px if px is None else px) for px in self.padding_px)
+            self._margins[default_px] = margins
+        return margins
+
+def _content_key(styles):
+    try:
+        return tuple(sorted(styles.items()))
+    except TypeError:
+        return tuple(sorted((k, repr(v)) for k, v in styles.items()))
+
+class StyleInterner:
+    """Memoize a style record builder by style content.
+
+    Identical styles dicts share one record, and repeated calls with the same
+    dict object skip even the content hash. Both memos hold at most
+    max_entries and are dropped together when either is full. The per-object
+    memo assumes a styles dict is not edited after it was resolved; clear()
+    drops it, call it when a deck is done so the style dicts can be freed.
+    """
+
+    def __init__(self, build, max_entries=MAX_INTERNED_STYLES):
+        self.build = build
+        self.max_entries = max_entries
+        self._by_content = {}
+        self._by_id = {}  # id(styles) -> (styles, record), holding styles keeps the id valid
+
+    def __call__(self, styles):
+        hit = self._by_id.get(id(styles))
+        if hit is not None and hit[0] is styles:
+            return hit[1]
+        key = _content_key(styles)
+        record = self._by_content.get(key)
+        if record is None:
+            if len(self._by_content) >= self.max_entries:
+                self._by_content.clear()
+                self._by_id.clear()
+            record = self._by_content[key] = self.build(styles)
+        if len(self._by_id) >= self.max_entries:
+            self._by_id.clear()
+        self._by_id[id(styles)] = (styles, record)
+        return record
+
+    def clear(self):
+        self._by_id.clear()
+
+    def distinct_styles(self):
+        return len(self._by_content)
+
+resolve_style = StyleInterner(ResolvedStyle)
@@ -0,0 +1,115 @@
+import copy
+import io
+import os
+import threading
+import zipfile
+
+from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.parts.slide import SlideLayoutPart, SlideMasterPart
+
+# Main part content type of .potx templates, python-pptx only opens presentations
+POTX_MAIN_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.presentationml.template.main+xml'
+BLANK_LAYOUT_INDEX = 6
+THEME_CONTENT_TYPE = CT.OFC_THEME
+
+def _load_template(path):
+    """Parse a .pptx or .potx file (None for python-pptx's default template)"""
+    if path is None:
+        return Presentation()
+    with open(path, 'rb') as f:
+        data = f.read()
+    with zipfile.ZipFile(io.BytesIO(data)) as source:
+        content_types = source.read('[Content_Types].xml')
+        if POTX_MAIN_CONTENT_TYPE.encode() not in content_types:
+            return Presentation(io.BytesIO(data))
+        # Re-pack with the presentation content type so python-pptx accepts the template
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                blob = source.read(item.filename)
+                if item.filename == '[Content_Types].xml':
+                    blob = blob.replace(POTX_MAIN_CONTENT_TYPE.encode(), CT.PML_PRESENTATION_MAIN.encode())
+                target.writestr(item, blob)
+    return Presentation(output)
+
+def _find_blank_layout(prs):
+    """Layout named "Blank", else the default template's blank index, else the one with fewest placeholders"""
+    layouts = list(prs.slide_layouts)
+    for layout in layouts:
+        if layout.name.strip().lower() == 'blank':
+            return layout
+    if len(layouts) > BLANK_LAYOUT_INDEX:
+        return layouts[BLANK_LAYOUT_INDEX]
+    return min(layouts, key=lambda layout: len(layout.placeholders))
+
+class _ParsedTemplate:
+    """A parsed template and the parts its clones share"""
+
+    def __init__(self, prs):
+        self.prs = prs
+        self.shared_parts = [part for part in prs.part.package.iter_parts()
+                             if isinstance(part, (SlideMasterPart, SlideLayoutPart))
+                             or part.content_type == THEME_CONTENT_TYPE]
+        self.blank_layout = _find_blank_layout(prs)
+
+    def clone(self):
+        # Seeding the memo makes deepcopy reuse masters, layouts and themes instead of copying them
+        return copy.deepcopy(self.prs, {id(part): part for part in self.shared_parts})
+
+class TemplateCache:
+    """Parsed templates handed out as cheap in-memory clones.
+
+    A template is parsed once per file version (path, mtime, size). Each
+    clone deep-copies the presentation part, document properties and any
+    existing slides, but shares the slide masters, layouts and themes with
+    the cached template. Those shared parts must therefore be treated as
+    read-only. Adding slides only relates new slide parts to a layout, which
+    is safe. Parse templates before forking workers so they share the parsed
+    trees copy-on-write.
+    """
+
+    def __init__(self):
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def _key(self, path):
+        if path is None:
+            return None
+        st = os.stat(path)
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+    def get(self, path=None):
+        key = self._key(path)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is None:
+                template = self._templates[key] = _ParsedTemplate(_load_template(path))
+        return template
+
+    def new_presentation(self, slide_width=None, slide_height=None, template=None):
+        """Clone of template (path or None for the default) with the slide size in EMU set"""
+        prs = self.get(template).clone()
+        if slide_width is not None:
+            prs.slide_width = slide_width
+        if slide_height is not None:
+            prs.slide_height = slide_height
+        return prs
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+_default_template_cache = TemplateCache()
+
+def get_template_cache():
+    """Process-wide TemplateCache shared by both generators"""
+    return _default_template_cache
+
+def new_presentation(slide_width=None, slide_height=None, template=None):
+    """Presentation cloned from the cached template with the slide size in EMU set"""
+    return _default_template_cache.new_presentation(slide_width, slide_height, template)
+
+def blank_layout(template=None):
+    """Blank layout of the cached template, valid for every presentation cloned from it"""
+    return _default_template_cache.get(template).blank_layout